@@ -55,7 +55,7 @@ class ToolDefinition:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class ToolCallResult:
     """Result of executing a single tool call."""
 
@@ -66,7 +66,7 @@ class ToolCallResult:
     error: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class AgentStep:
     """One step in the agent's reasoning trace."""
 
@@ -98,12 +98,15 @@ class AgentConfig:
         max_tokens_budget: Token budget for the entire run (32K default).
         temperature: LLM sampling temperature.
         system_prompt: The agent's system prompt.
+        tool_concurrency_limit: Max tool calls from one LLM response that
+            run at the same time.
     """
 
     max_steps: int = 5
     max_tokens_budget: int = 48000
     temperature: float = 0.1
     system_prompt: str = ""
+    tool_concurrency_limit: int = 8
 
 
 # ---------------------------------------------------------------------------
@@ -147,7 +150,9 @@ class AgentLLMClient:
                 "model": self._model,
                 "messages": messages,
                 "max_tokens": self._max_tokens,
-                "temperature": temperature or self._default_temperature,
+                "temperature": (
+                    self._default_temperature if temperature is None else temperature
+                ),
                 "stream": False,
             }
             if tools:
@@ -195,26 +200,11 @@ class AgentLLMClient:
 # ---------------------------------------------------------------------------
 
 # Regex to locate the start of tool-call JSON objects in content.
-# We only use this to find candidates; actual extraction uses balanced-brace
-# parsing to handle nested JSON (e.g., arguments containing dicts).
+# We only use this to find candidates; each object is then decoded in place
+# with raw_decode, which handles nested JSON (e.g., arguments containing
+# dicts) and braces inside string values.
 _TOOL_CALL_START = re.compile(r'\{\s*"name"\s*:\s*"(\w+)"\s*,\s*"arguments"\s*:\s*\{')
-
-
-def _extract_json_object(text: str, start: int) -> Optional[str]:
-    """Extract a JSON object with balanced braces starting at *start*.
-
-    Returns the substring ``text[start:end]`` (inclusive of the outer
-    braces) or ``None`` if braces are unbalanced.
-    """
-    depth = 0
-    for i in range(start, len(text)):
-        if text[i] == "{":
-            depth += 1
-        elif text[i] == "}":
-            depth -= 1
-            if depth == 0:
-                return text[start : i + 1]
-    return None
+_JSON_DECODER = json.JSONDecoder()
 
 
 def extract_tool_calls_from_content(content: str) -> List[Dict[str, Any]]:
@@ -222,28 +212,33 @@ def extract_tool_calls_from_content(content: str) -> List[Dict[str, Any]]:
 
     This is a fallback for LLMs that embed function calls in their
     text response instead of using the structured tool_calls field.
-    Uses balanced-brace matching so nested JSON arguments are handled.
+    Each candidate is decoded straight from *content* at its offset,
+    so no per-character brace scan or substring copy is needed.
 
     Returns:
         List of dicts with ``name`` and ``arguments`` keys.
     """
     results: List[Dict[str, Any]] = []
+    # Every candidate contains this literal; plain answers skip the regex
+    if '"name"' not in content:
+        return results
     for match in _TOOL_CALL_START.finditer(content):
-        obj_str = _extract_json_object(content, match.start())
-        if obj_str is None:
-            continue
         try:
-            obj = json.loads(obj_str)
-            name = obj.get("name")
-            arguments = obj.get("arguments")
-            if name and isinstance(arguments, dict):
-                results.append({
-                    "id": f"fallback_{name}_{len(results)}",
-                    "name": name,
-                    "arguments": json.dumps(arguments),
-                })
+            obj, _end = _JSON_DECODER.raw_decode(content, match.start())
         except json.JSONDecodeError:
-            logger.debug("Failed to parse fallback tool call: %s", obj_str[:200])
+            logger.debug(
+                "Failed to parse fallback tool call: %s",
+                content[match.start() : match.start() + 200],
+            )
+            continue
+        name = obj.get("name")
+        arguments = obj.get("arguments")
+        if name and isinstance(arguments, dict):
+            results.append({
+                "id": f"fallback_{name}_{len(results)}",
+                "name": name,
+                "arguments": json.dumps(arguments),
+            })
     return results
 
 
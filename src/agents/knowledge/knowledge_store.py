@@ -200,7 +200,8 @@ class KnowledgeStore:
             self._INSERT_SQL,
             [concept_id, category, title, content, tags],
         )
-        rows = await self._db.execute_read("SELECT last_insert_rowid()")
+        # last_insert_rowid() is per-connection: ask the write connection
+        rows = await self._db.execute("SELECT last_insert_rowid()")
         return rows[0][0]
 
     async def count(self) -> int:
@@ -8,9 +8,13 @@ max_steps is reached.
 
 from __future__ import annotations
 
+import asyncio
+import inspect
 import json
 import logging
-from typing import Any, AsyncIterator, Callable, Dict, List, Optional
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Union
+
+import orjson
 
 from src.agents.base import (
     AgentConfig,
@@ -20,17 +24,37 @@ from src.agents.base import (
     ToolCallResult,
     extract_tool_calls_from_content,
 )
+from src.agents.tool_coalescer import tool_call_key
 from src.agents.tool_registry import ToolRegistry
+from src.config import QwenConfig
 
 logger = logging.getLogger(__name__)
 
 
+def _truncate_history(
+    context_messages: List[Dict[str, Any]], max_messages: int
+) -> List[Dict[str, Any]]:
+    """Keep the newest *max_messages* prior messages (all if 0).
+
+    Every request re-sends the whole history, so an unbounded session costs
+    more per step the longer it runs. A kept prefix never starts with a tool
+    result whose assistant tool_calls message was dropped.
+    """
+    if not max_messages or len(context_messages) <= max_messages:
+        return context_messages
+    kept = context_messages[-max_messages:]
+    start = 0
+    while start < len(kept) and kept[start].get("role") == "tool":
+        start += 1
+    return kept[start:]
+
+
 class AgentRunner:
     """Executes the agent reasoning loop.
 
     The loop:
     1. Send messages + tools to LLM
-    2. If LLM returns tool_calls -> execute each tool -> append results
+    2. If LLM returns tool_calls -> execute them (concurrently) -> append results
     3. Repeat until LLM returns content without tool_calls, or max_steps hit
     4. Return AgentResult with answer + step trace
 
@@ -38,7 +62,11 @@ class AgentRunner:
         client: The LLM client with tool-calling support.
         registry: Tool registry containing available tools.
         config: Agent configuration (max_steps, token budget, etc.).
-        on_step: Optional callback invoked after each step (for SSE streaming).
+        on_step: Optional callback invoked after each step (for SSE streaming);
+            may be sync or async.
+        max_history_messages: Newest prior-conversation messages sent with
+            each request (0 keeps all). Defaults to the configured
+            QwenConfig.max_history_messages.
     """
 
     def __init__(
@@ -46,12 +74,16 @@ class AgentRunner:
         client: AgentLLMClient,
         registry: ToolRegistry,
         config: AgentConfig,
-        on_step: Optional[Callable[[AgentStep], None]] = None,
+        on_step: Optional[Callable[[AgentStep], Union[None, Awaitable[None]]]] = None,
+        max_history_messages: Optional[int] = None,
     ) -> None:
         self.client = client
         self.registry = registry
         self.config = config
         self.on_step = on_step
+        if max_history_messages is None:
+            max_history_messages = QwenConfig().max_history_messages
+        self.max_history_messages = max_history_messages
 
     async def run(
         self,
@@ -60,6 +92,9 @@ class AgentRunner:
     ) -> AgentResult:
         """Run the agent loop to completion.
 
+        Async on_step callbacks run as tasks alongside the loop, one at a
+        time in step order, and are awaited before this returns.
+
         Args:
             user_message: The user's question or instruction.
             context_messages: Optional prior conversation messages.
@@ -67,14 +102,31 @@ class AgentRunner:
         Returns:
             AgentResult with the final answer and step trace.
         """
+        callback_tasks: List[asyncio.Future] = []
+        try:
+            return await self._run(user_message, context_messages, callback_tasks)
+        finally:
+            if callback_tasks:
+                await asyncio.gather(*callback_tasks, return_exceptions=True)
+
+    async def _run(
+        self,
+        user_message: str,
+        context_messages: Optional[List[Dict[str, str]]],
+        callback_tasks: List[asyncio.Future],
+    ) -> AgentResult:
         messages: List[Dict[str, Any]] = [
             {"role": "system", "content": self.config.system_prompt},
         ]
         if context_messages:
-            messages.extend(context_messages)
+            messages.extend(
+                _truncate_history(context_messages, self.max_history_messages)
+            )
         messages.append({"role": "user", "content": user_message})
 
         openai_tools = self.registry.to_openai_tools()
+        # Successful tool results for this run, keyed by (name, arguments)
+        tool_memo: Dict[tuple, str] = {}
         steps: List[AgentStep] = []
         total_tokens = 0
 
@@ -126,7 +178,7 @@ class AgentRunner:
                     tokens_used=response["usage"].get("total_tokens", 0),
                 )
                 steps.append(step)
-                self._notify_step(step)
+                self._notify_step(step, callback_tasks)
                 return AgentResult(
                     answer=content,
                     steps=steps,
@@ -155,9 +207,7 @@ class AgentRunner:
             ]
             messages.append(assistant_msg)
 
-            for tc in tool_calls:
-                tc_result = await self._execute_tool_call(tc)
-
+            for tc_result in await self._execute_tool_calls(tool_calls, tool_memo):
                 step = AgentStep(
                     step_number=step_num,
                     action="tool_call",
@@ -167,7 +217,7 @@ class AgentRunner:
                     tokens_used=0,
                 )
                 steps.append(step)
-                self._notify_step(step)
+                self._notify_step(step, callback_tasks)
 
                 # Append tool result to conversation
                 messages.append({
@@ -185,8 +235,41 @@ class AgentRunner:
             error="max_steps_reached",
         )
 
-    async def _execute_tool_call(self, tool_call: Dict[str, Any]) -> ToolCallResult:
-        """Execute a single tool call and return the result."""
+    async def _execute_tool_calls(
+        self,
+        tool_calls: List[Dict[str, Any]],
+        memo: Dict[tuple, str],
+    ) -> List[ToolCallResult]:
+        """Execute one response's tool calls concurrently, in call order.
+
+        The calls are independent lookups, so a step costs the slowest call
+        rather than the sum. At most ``config.tool_concurrency_limit`` run
+        at once.
+        """
+        if len(tool_calls) == 1:
+            return [await self._execute_tool_call(tool_calls[0], memo)]
+
+        semaphore = asyncio.Semaphore(max(1, self.config.tool_concurrency_limit))
+
+        async def bounded(tool_call: Dict[str, Any]) -> ToolCallResult:
+            async with semaphore:
+                return await self._execute_tool_call(tool_call, memo)
+
+        # _execute_tool_call turns handler errors into results, so one
+        # failing tool does not cancel the others.
+        return list(await asyncio.gather(*(bounded(tc) for tc in tool_calls)))
+
+    async def _execute_tool_call(
+        self,
+        tool_call: Dict[str, Any],
+        memo: Dict[tuple, str],
+    ) -> ToolCallResult:
+        """Execute a single tool call and return the result.
+
+        A call repeating an earlier successful (name, arguments) pair in the
+        same run reuses its result from *memo* instead of re-running the
+        handler; the tools are read-only lookups. Errors are not memoized.
+        """
         name = tool_call["name"]
         call_id = tool_call.get("id", f"call_{name}")
         raw_args = tool_call.get("arguments", "{}")
@@ -194,8 +277,10 @@ class AgentRunner:
         # Parse arguments
         if isinstance(raw_args, str):
             try:
-                args = json.loads(raw_args)
-            except json.JSONDecodeError:
+                # orjson: faster on long SQL arguments; its JSONDecodeError
+                # subclasses ValueError
+                args = orjson.loads(raw_args)
+            except orjson.JSONDecodeError:
                 return ToolCallResult(
                     tool_name=name,
                     tool_call_id=call_id,
@@ -219,8 +304,20 @@ class AgentRunner:
                 error=error_msg,
             )
 
+        # None for unserializable arguments: just run the tool
+        memo_key = tool_call_key(name, args)
+        if memo_key is not None and memo_key in memo:
+            return ToolCallResult(
+                tool_name=name,
+                tool_call_id=call_id,
+                arguments=args,
+                result=memo[memo_key],
+            )
+
         try:
             result = await tool.handler(**args)
+            if memo_key is not None:
+                memo[memo_key] = result
             return ToolCallResult(
                 tool_name=name,
                 tool_call_id=call_id,
@@ -238,10 +335,33 @@ class AgentRunner:
                 error=error_msg,
             )
 
-    def _notify_step(self, step: AgentStep) -> None:
-        """Invoke the on_step callback if set."""
+    def _notify_step(self, step: AgentStep, callback_tasks: List[asyncio.Future]) -> None:
+        """Invoke the on_step callback if set.
+
+        Sync callbacks run inline (the orchestrator's enqueues to an
+        asyncio.Queue, which is not thread-safe). An async callback's
+        coroutine is scheduled so it overlaps the next LLM call; each one
+        waits for the previous step's, so steps are delivered in order.
+        """
         if self.on_step:
             try:
-                self.on_step(step)
+                result = self.on_step(step)
             except Exception as exc:
                 logger.warning("on_step callback failed: %s", exc)
+                return
+            if inspect.isawaitable(result):
+                previous = callback_tasks[-1] if callback_tasks else None
+                callback_tasks.append(
+                    asyncio.ensure_future(self._await_callback(result, previous))
+                )
+
+    @staticmethod
+    async def _await_callback(
+        awaitable: Awaitable[None], previous: Optional[asyncio.Future]
+    ) -> None:
+        if previous is not None:
+            await previous
+        try:
+            await awaitable
+        except Exception as exc:
+            logger.warning("on_step callback failed: %s", exc)
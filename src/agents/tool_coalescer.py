@@ -0,0 +1,70 @@
+"""Coalescing of identical in-flight tool calls across agent runs.
+
+Concurrent agent-chat requests (and parallel tool calls within one run)
+often look up the same MTO or run the same query. With one app-wide
+coalescer, calls with the same (tool, arguments) await one handler
+invocation instead of each round-tripping to the database.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import dataclasses
+import json
+from typing import Any, Awaitable, Callable, Coroutine, Dict, Optional, TypeVar
+
+from src.agents.base import ToolDefinition
+
+T = TypeVar("T")
+ToolHandler = Callable[..., Coroutine[Any, Any, str]]
+
+
+def tool_call_key(name: str, args: Dict[str, Any]) -> Optional[tuple]:
+    """(name, canonical JSON arguments), or None if args are unserializable."""
+    try:
+        return (name, json.dumps(args, sort_keys=True))
+    except (TypeError, ValueError):
+        return None
+
+
+class ToolCoalescer:
+    """Shares one in-flight handler call among identical concurrent calls.
+
+    Only calls that overlap are coalesced; once the shared call finishes
+    the next identical call runs the handler again. Errors reach every
+    waiter. The tools are read-only lookups, so sharing is safe.
+    """
+
+    def __init__(self) -> None:
+        self._inflight: Dict[tuple, asyncio.Future] = {}
+
+    def wrap(
+        self, name: str, handler: Callable[..., Awaitable[T]]
+    ) -> Callable[..., Coroutine[Any, Any, T]]:
+        """Return *handler* wrapped to coalesce calls keyed under *name*.
+
+        *name* is the tool name for tool handlers; other shared calls use
+        their own namespace (e.g. ``"sql_query:read"``) so their keys never
+        collide with a tool's.
+        """
+
+        async def coalesced(**kwargs: Any) -> T:
+            key = tool_call_key(name, kwargs)
+            if key is None:
+                return await handler(**kwargs)
+            task = self._inflight.get(key)
+            if task is None:
+                task = asyncio.ensure_future(handler(**kwargs))
+                self._inflight[key] = task
+                task.add_done_callback(lambda _: self._inflight.pop(key, None))
+            # Shielded so one cancelled caller does not cancel the others
+            return await asyncio.shield(task)
+
+        return coalesced
+
+    def wrap_tool(self, tool: ToolDefinition) -> ToolDefinition:
+        """Copy of *tool* whose handler coalesces through this instance."""
+        return dataclasses.replace(tool, handler=self.wrap(tool.name, tool.handler))
+
+    def __len__(self) -> int:
+        return len(self._inflight)
@@ -25,12 +25,14 @@ class ToolRegistry:
 
     def __init__(self) -> None:
         self._tools: Dict[str, ToolDefinition] = {}
+        self._openai_tools: Optional[List[Dict]] = None
 
     def register(self, tool: ToolDefinition) -> None:
         """Register a tool. Overwrites if name already exists."""
         if tool.name in self._tools:
             logger.warning("Overwriting tool: %s", tool.name)
         self._tools[tool.name] = tool
+        self._openai_tools = None
         logger.debug("Registered tool: %s", tool.name)
 
     def register_many(self, tools: List[ToolDefinition]) -> None:
@@ -43,8 +45,14 @@ class ToolRegistry:
         return self._tools.get(name)
 
     def to_openai_tools(self) -> List[Dict]:
-        """Convert all registered tools to OpenAI function-calling format."""
-        return [t.to_openai_tool() for t in self._tools.values()]
+        """Convert all registered tools to OpenAI function-calling format.
+
+        Built once and shared until the next register(), since every step of
+        every run sends the same list; callers must not mutate it.
+        """
+        if self._openai_tools is None:
+            self._openai_tools = [t.to_openai_tool() for t in self._tools.values()]
+        return self._openai_tools
 
     @property
     def tool_names(self) -> List[str]:
@@ -6,10 +6,11 @@ mappings, and receipt source configuration without hardcoding.
 
 from __future__ import annotations
 
-import json
 import logging
 from typing import Optional
 
+import orjson
+
 from src.agents.base import ToolDefinition
 
 logger = logging.getLogger(__name__)
@@ -46,10 +47,10 @@ def create_config_lookup_tool(mto_config) -> ToolDefinition:
                     "source_form": mc.source_form,
                     "mto_field": mc.mto_field,
                 })
-            return json.dumps({
+            return orjson.dumps({
                 "material_classes": classes,
                 "receipt_sources": list(mto_config.receipt_sources.keys()),
-            }, ensure_ascii=False, indent=2)
+            }, option=orjson.OPT_INDENT_2).decode()
 
         if section == "material_classes":
             result = []
@@ -71,7 +72,7 @@ def create_config_lookup_tool(mto_config) -> ToolDefinition:
                         "picking_field": mc.semantic.picking_field,
                     }
                 result.append(entry)
-            return json.dumps(result, ensure_ascii=False, indent=2)
+            return orjson.dumps(result, option=orjson.OPT_INDENT_2).decode()
 
         if section == "receipt_sources":
             result = {}
@@ -83,7 +84,7 @@ def create_config_lookup_tool(mto_config) -> ToolDefinition:
                     "material_field": src.material_field,
                     "link_field": src.link_field,
                 }
-            return json.dumps(result, ensure_ascii=False, indent=2)
+            return orjson.dumps(result, option=orjson.OPT_INDENT_2).decode()
 
         # Try as a specific material class ID
         for mc in mto_config.material_classes:
@@ -109,7 +110,7 @@ def create_config_lookup_tool(mto_config) -> ToolDefinition:
                         ],
                         "provenance": mc.semantic.provenance,
                     }
-                return json.dumps(entry, ensure_ascii=False, indent=2)
+                return orjson.dumps(entry, option=orjson.OPT_INDENT_2).decode()
 
         return f"未知配置节: {section}。可用: overview, material_classes, receipt_sources, 或具体类ID"
 
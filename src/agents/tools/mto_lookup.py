@@ -6,10 +6,11 @@ BOM, receipts, picking, deliveries) without needing to construct SQL.
 
 from __future__ import annotations
 
-import json
 import logging
 from typing import Optional
 
+import orjson
+
 from src.agents.base import ToolDefinition
 
 logger = logging.getLogger(__name__)
@@ -76,7 +77,7 @@ def create_mto_lookup_tool(mto_handler) -> ToolDefinition:
             if len(result.children) > 20:
                 summary["note"] = f"仅显示前20项，共{len(result.children)}项子件"
 
-        return json.dumps(summary, ensure_ascii=False, indent=2)
+        return orjson.dumps(summary, option=orjson.OPT_INDENT_2).decode()
 
     return ToolDefinition(
         name="mto_lookup",
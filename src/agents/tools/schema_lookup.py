@@ -16,6 +16,13 @@ from src.database.connection import Database
 
 logger = logging.getLogger(__name__)
 
+_TABLE_NAME = re.compile(r'^[a-zA-Z_][a-zA-Z0-9_]*$')
+# ALLOWED_TABLES is fixed at import, so the listing text is too
+_ALLOWED_LIST = ", ".join(sorted(ALLOWED_TABLES))
+_OVERVIEW_TEXT = "\n".join(
+    ["## 可用数据表\n"] + [f"- {tbl}" for tbl in sorted(ALLOWED_TABLES)]
+)
+
 
 def create_schema_lookup_tool(db: Database) -> ToolDefinition:
     """Create the schema lookup tool bound to a database instance.
@@ -35,10 +42,10 @@ def create_schema_lookup_tool(db: Database) -> ToolDefinition:
                         If omitted, return list of all allowed tables.
         """
         if table_name:
-            if not re.match(r'^[a-zA-Z_][a-zA-Z0-9_]*$', table_name):
+            if not _TABLE_NAME.match(table_name):
                 return f"Invalid table name: {table_name}"
             if table_name.lower() not in ALLOWED_TABLES:
-                return f"表 '{table_name}' 不在允许列表中。允许的表: {', '.join(sorted(ALLOWED_TABLES))}"
+                return f"表 '{table_name}' 不在允许列表中。允许的表: {_ALLOWED_LIST}"
 
             try:
                 rows = await db.execute_read(
@@ -64,10 +71,7 @@ def create_schema_lookup_tool(db: Database) -> ToolDefinition:
             return "\n".join(lines)
         else:
             # List all allowed tables
-            lines = ["## 可用数据表\n"]
-            for tbl in sorted(ALLOWED_TABLES):
-                lines.append(f"- {tbl}")
-            return "\n".join(lines)
+            return _OVERVIEW_TEXT
 
     return ToolDefinition(
         name="schema_lookup",
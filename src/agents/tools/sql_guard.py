@@ -57,15 +57,20 @@ _FORBIDDEN_PATTERN = re.compile(
     re.IGNORECASE,
 )
 
+_BLOCK_COMMENT = re.compile(r"/\*.*?\*/", re.DOTALL)
+_LINE_COMMENT = re.compile(r"--[^\n]*")
+_WHITESPACE_RUN = re.compile(r"\s+")
+_LIMIT_CLAUSE = re.compile(r"\bLIMIT\b", re.IGNORECASE)
+
 MAX_QUERY_LENGTH = 2000
 
 
 def _strip_comments(sql: str) -> str:
     """Remove SQL comments (-- line comments and /* */ block comments)."""
     # Block comments
-    sql = re.sub(r"/\*.*?\*/", " ", sql, flags=re.DOTALL)
+    sql = _BLOCK_COMMENT.sub(" ", sql)
     # Line comments
-    sql = re.sub(r"--[^\n]*", " ", sql)
+    sql = _LINE_COMMENT.sub(" ", sql)
     return sql.strip()
 
 
@@ -281,7 +286,7 @@ def validate_sql(query: str) -> str:
     cleaned = _strip_comments(query)
 
     # Collapse whitespace
-    cleaned = re.sub(r"\s+", " ", cleaned).strip()
+    cleaned = _WHITESPACE_RUN.sub(" ", cleaned).strip()
 
     # Remove trailing semicolons
     cleaned = cleaned.rstrip(";").strip()
@@ -291,7 +296,7 @@ def validate_sql(query: str) -> str:
         raise ChatSQLError("不允许多条SQL语句")
 
     # Must start with SELECT or WITH (for CTEs)
-    first_word = cleaned.split()[0].upper() if cleaned.split() else ""
+    first_word = cleaned.split(" ", 1)[0].upper()
     if first_word not in ("SELECT", "WITH"):
         raise ChatSQLError("只允许 SELECT 查询")
 
@@ -320,7 +325,7 @@ def validate_sql(query: str) -> str:
             raise ChatSQLError(f"不允许访问表: {table}")
 
     # Auto-append LIMIT if missing
-    if not re.search(r"\bLIMIT\b", cleaned, re.IGNORECASE):
+    if not _LIMIT_CLAUSE.search(cleaned):
         cleaned += " LIMIT 100"
 
     return cleaned
@@ -8,9 +8,10 @@ from __future__ import annotations
 
 import asyncio
 import logging
-from typing import Any, Dict
+from typing import Any, Dict, List, Optional, Tuple
 
 from src.agents.base import ToolDefinition
+from src.agents.tool_coalescer import ToolCoalescer
 from src.agents.tools.context import build_sql_result_context
 from src.agents.tools.sql_guard import validate_sql
 from src.database.connection import Database
@@ -21,16 +22,33 @@ logger = logging.getLogger(__name__)
 _CHAT_SQL_TIMEOUT = 5.0  # seconds
 
 
-def create_sql_query_tool(db: Database) -> ToolDefinition:
+def create_sql_query_tool(
+    db: Database, coalescer: Optional[ToolCoalescer] = None
+) -> ToolDefinition:
     """Create the SQL query tool bound to a database instance.
 
     Args:
         db: The Database instance for executing queries.
+        coalescer: Shares concurrent reads of the same validated SQL; pass
+            the app-wide one so separate requests share them too.
 
     Returns:
         A ToolDefinition that validates and executes SQL queries.
     """
 
+    async def read(sql: str) -> Tuple[List[Any], List[str]]:
+        return await asyncio.wait_for(
+            db.execute_read_with_columns(sql),
+            timeout=_CHAT_SQL_TIMEOUT,
+        )
+
+    # Concurrent agent runs often issue the same query, differing only in
+    # whitespace or comments; they share one read of the validated SQL.
+    if coalescer is None:
+        coalescer = ToolCoalescer()
+    # Own namespace: the app-wide coalescer also keys tool calls by name
+    shared_read = coalescer.wrap("sql_query:read", read)
+
     async def handler(query: str) -> str:
         """Validate and execute a SQL query, returning formatted results."""
         # Validate
@@ -41,10 +59,7 @@ def create_sql_query_tool(db: Database) -> ToolDefinition:
 
         # Execute (with timeout to prevent expensive queries)
         try:
-            rows, columns = await asyncio.wait_for(
-                db.execute_read_with_columns(safe_sql),
-                timeout=_CHAT_SQL_TIMEOUT,
-            )
+            rows, columns = await shared_read(sql=safe_sql)
         except asyncio.TimeoutError:
             logger.warning("Agent SQL query timed out after %.0fs: %s", _CHAT_SQL_TIMEOUT, safe_sql)
             return f"SQL查询超时（{_CHAT_SQL_TIMEOUT:.0f}秒），请简化查询条件"
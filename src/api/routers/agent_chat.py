@@ -117,6 +117,8 @@ async def _agent_stream(request: Request, body: AgentChatRequest):
     db = request.app.state.db
     mto_handler = request.app.state.mto_handler
     mto_config = getattr(request.app.state, "mto_config", None)
+    # App-wide, so concurrent chats share in-flight MTO lookups and reads
+    coalescer = getattr(request.app.state, "agent_tool_coalescer", None)
 
     if mto_config is None:
         yield _sse_event({"type": "error", "message": "MTO config not available"})
@@ -130,8 +132,10 @@ async def _agent_stream(request: Request, body: AgentChatRequest):
     try:
         schema_tool = create_schema_lookup_tool(db)
         config_tool = create_config_lookup_tool(mto_config)
-        sql_tool = create_sql_query_tool(db)
+        sql_tool = create_sql_query_tool(db, coalescer)
         mto_tool = create_mto_lookup_tool(mto_handler)
+        if coalescer is not None:
+            mto_tool = coalescer.wrap_tool(mto_tool)
 
         orchestrator = AgentChatOrchestrator(
             llm_client=llm_client,
@@ -193,6 +193,34 @@ class AgentLLMConfig(BaseSettings):
         return bool(self.api_key or QwenConfig().api_key)
 
 
+class DatabaseConfig(BaseSettings):
+    """SQLite connection tuning.
+
+    Loaded from DB_* environment variables.
+    """
+
+    model_config = SettingsConfigDict(
+        env_prefix="DB_",
+        env_file=".env",
+        env_file_encoding="utf-8",
+        extra="ignore",
+    )
+
+    mmap_size: int = Field(
+        default=256 * 1024 * 1024,
+        ge=0,
+        description="PRAGMA mmap_size per connection in bytes (0 = no mmap)",
+    )
+    result_cache_size: int = Field(
+        default=0,
+        ge=0,
+        description=(
+            "Cached execute_read results (0 = off). Only safe when every "
+            "write goes through Database; see QueryResultCache"
+        ),
+    )
+
+
 class AutoSyncConfig(BaseSettings):
     """Auto Sync Configuration"""
 
@@ -305,12 +333,14 @@ class Config:
         db_path: Path = Path("data/quickpulse.db"),
         reports_dir: Path = Path("reports"),
         qwen: Optional[QwenConfig] = None,
+        database: Optional[DatabaseConfig] = None,
     ):
         self.kingdee = kingdee
         self.sync = sync
         self.db_path = db_path
         self.reports_dir = reports_dir
         self.qwen = qwen or QwenConfig()
+        self.database = database or DatabaseConfig()
 
     @classmethod
     def load(
@@ -328,6 +358,7 @@ class Config:
             kingdee=kingdee,
             sync=SyncConfig.load(sync_path),
             qwen=QwenConfig(),
+            database=DatabaseConfig(),
         )
 
 
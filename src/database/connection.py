@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import asyncio
 import re
 from collections.abc import Iterable, Sequence
 from contextlib import asynccontextmanager
@@ -9,41 +10,119 @@ from pathlib import Path
 
 import aiosqlite
 
+from src.database.result_cache import QueryResultCache, is_select, write_target
+
 _VALID_IDENTIFIER = re.compile(r"^[a-zA-Z_][a-zA-Z0-9_]*$")
 
+# Per-connection tuning. mmap_size is mapped once per connection (writer plus
+# read pool), so keep it bounded (256 MiB, DB_MMAP_SIZE); cache_size is
+# negative, i.e. KiB (64 MiB).
+DEFAULT_MMAP_SIZE = 256 * 1024 * 1024
+DEFAULT_CACHE_SIZE = -65536
+BUSY_TIMEOUT_MS = 5000
+
+# Read connections checked out by execute_read*; WAL lets them run concurrently
+DEFAULT_READ_POOL_SIZE = 4
+
+# Prepared statements kept per connection by the sqlite3 module (default 128).
+# Sync and query paths reuse well over 128 literal SQL strings, so repeats
+# skip parse/plan without a cursor cache of our own.
+STATEMENT_CACHE_SIZE = 512
+
 
 class Database:
     """Async SQLite database wrapper.
 
-    Uses separate connections for reads and writes to avoid
-    head-of-line blocking.  Both connections use WAL mode so
-    concurrent readers never block on a writer.
+    Uses one write connection plus a small pool of read-only connections
+    to avoid head-of-line blocking.  All connections use WAL mode so
+    concurrent readers never block on a writer or on each other.
     """
 
-    def __init__(self, db_path: Path):
+    def __init__(
+        self,
+        db_path: Path,
+        mmap_size: int = DEFAULT_MMAP_SIZE,
+        cache_size: int = DEFAULT_CACHE_SIZE,
+        read_pool_size: int = DEFAULT_READ_POOL_SIZE,
+        result_cache_size: int = 0,
+    ):
         self.db_path = db_path
+        self.mmap_size = mmap_size
+        self.cache_size = cache_size
+        self.read_pool_size = read_pool_size
         self._connection: aiosqlite.Connection | None = None
-        self._read_connection: aiosqlite.Connection | None = None
+        self._read_connections: list[aiosqlite.Connection] = []
+        self._readers: asyncio.Queue[aiosqlite.Connection] | None = None
+        # Off by default; writes that bypass these methods would go unseen
+        self._result_cache = (
+            QueryResultCache(result_cache_size) if result_cache_size > 0 else None
+        )
+        # Tables written in the open transaction, invalidated again on commit
+        self._pending_writes: set[str | None] = set()
+        # Serializes statements on the shared write connection, so none
+        # lands inside (and is committed or rolled back with) another
+        # caller's executemany BEGIN ... COMMIT.
+        self._write_lock = asyncio.Lock()
 
     async def connect(self) -> None:
         # Open write connection first, enable WAL, and init schema
-        self._connection = await aiosqlite.connect(self.db_path)
-        await self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection = await aiosqlite.connect(
+            self.db_path, cached_statements=STATEMENT_CACHE_SIZE
+        )
+        await self._configure_connection(self._connection)
         await self._init_schema()
-        # Open read connection after schema is ready (WAL is database-level,
-        # so the read connection inherits it automatically)
-        self._read_connection = await aiosqlite.connect(self.db_path)
-        await self._read_connection.execute("PRAGMA journal_mode=WAL")
+        # Open read pool after schema is ready (WAL is database-level, so the
+        # read connections inherit it automatically)
+        await self._close_readers()
+        readers: asyncio.Queue[aiosqlite.Connection] = asyncio.Queue()
+        for _ in range(self.read_pool_size):
+            conn = await aiosqlite.connect(
+                self.db_path, cached_statements=STATEMENT_CACHE_SIZE
+            )
+            await self._configure_connection(conn)
+            await conn.execute("PRAGMA query_only=1")
+            self._read_connections.append(conn)
+            readers.put_nowait(conn)
+        self._readers = readers
+
+    async def _configure_connection(self, conn: aiosqlite.Connection) -> None:
+        """Apply per-connection PRAGMAs.
+
+        synchronous=NORMAL is durable under WAL except for the last commits
+        before a power loss, and fsyncs only at checkpoints instead of on
+        every commit.
+        """
+        await conn.executescript(
+            "PRAGMA journal_mode=WAL;"
+            "PRAGMA synchronous=NORMAL;"
+            "PRAGMA temp_store=MEMORY;"
+            f"PRAGMA mmap_size={int(self.mmap_size)};"
+            f"PRAGMA cache_size={int(self.cache_size)};"
+            f"PRAGMA busy_timeout={BUSY_TIMEOUT_MS};"
+        )
 
     async def _init_schema(self) -> None:
         schema_path = Path(__file__).parent / "schema.sql"
         # Synchronous file read — acceptable here because it only runs once
         # at startup and the schema file is small (< 10 KB).
         schema = schema_path.read_text(encoding="utf-8")
-        await self._connection.executescript(schema)
+        await self._executescript_in_transaction(schema)
         await self._apply_migrations()
         await self._connection.commit()
 
+    async def _executescript_in_transaction(self, script: str) -> None:
+        """Run a multi-statement DDL script as a single transaction.
+
+        Plain executescript() autocommits every statement. Wrapped, a script
+        costs one commit, and one that fails part-way leaves nothing behind.
+        """
+        try:
+            await self._connection.executescript(f"BEGIN;\n{script}\nCOMMIT;")
+        except Exception:
+            if self._connection.in_transaction:
+                await self._connection.rollback()
+            raise
+
     async def _apply_migrations(self) -> None:
         """Apply schema migrations for cache table enhancements.
 
@@ -98,7 +177,7 @@ class Database:
 
                 if migration_file.name == "004_fix_receipt_unique_constraints.sql":
                     if await self._column_exists("cached_production_receipts", "bill_no"):
-                        await self._connection.executescript("""
+                        await self._executescript_in_transaction("""
                             DROP INDEX IF EXISTS idx_prdr_unique;
                             DROP INDEX IF EXISTS idx_sald_unique;
                             DROP INDEX IF EXISTS idx_purr_unique;
@@ -113,7 +192,7 @@ class Database:
                         continue
 
                 sql = migration_file.read_text(encoding="utf-8")
-                await self._connection.executescript(sql)
+                await self._executescript_in_transaction(sql)
                 await self._mark_migration_applied(migration_file.name)
 
     async def _mark_migration_applied(self, name: str) -> None:
@@ -130,37 +209,114 @@ class Database:
             columns = {row[1] for row in await cursor.fetchall()}
             return column in columns
 
-    async def execute(self, query: str, params=None):
-        async with self._connection.execute(query, params or []) as cursor:
-            return await cursor.fetchall()
+    def _note_write(self, query: str) -> None:
+        """Invalidate cached reads of the table ``query`` writes.
+
+        Called before the write and again (via _flush_writes) after commit,
+        so a read that ran in between cannot outlive the commit.
+        """
+        if self._result_cache is None:
+            return
+        table = write_target(query)
+        self._result_cache.invalidate(table)
+        self._pending_writes.add(table)
+
+    def _flush_writes(self) -> None:
+        if self._result_cache is None:
+            return
+        pending = self._pending_writes
+        self._pending_writes = set()
+        if None in pending:
+            self._result_cache.invalidate(None)
+            return
+        for table in pending:
+            self._result_cache.invalidate(table)
+
+    async def execute(self, query: str, params=()):
+        if is_select(query):
+            return await self._connection.execute_fetchall(query, params or ())
+        async with self._write_lock:
+            # Runs on the write connection and may modify anything
+            self._note_write(query)
+            return await self._connection.execute_fetchall(query, params or ())
+
+    @asynccontextmanager
+    async def _read_conn(self):
+        """Check out a pooled read connection (write connection before connect)."""
+        readers = self._readers
+        if readers is None:
+            yield self._connection
+            return
+        conn = await readers.get()
+        try:
+            yield conn
+        finally:
+            readers.put_nowait(conn)
 
-    async def execute_read(self, query: str, params=None):
+    async def execute_read(self, query: str, params=()):
         """Execute a read query and return all results.
 
-        Uses the dedicated read connection to avoid blocking on writes.
+        Uses a pooled read connection to avoid blocking on writes. With a
+        result cache, repeated reads of unchanged tables skip SQLite.
         """
-        conn = self._read_connection or self._connection
-        async with conn.execute(query, params or []) as cursor:
-            return await cursor.fetchall()
-
-    async def execute_read_with_columns(self, query: str, params=None):
+        cache = self._result_cache
+        key = cache.key(query, params) if cache is not None else None
+        if cache is None or key is None:
+            async with self._read_conn() as conn:
+                return await conn.execute_fetchall(query, params or ())
+
+        rows = cache.get(key)
+        if rows is not None:
+            return rows
+        generation = cache.generation
+        async with self._read_conn() as conn:
+            rows = await conn.execute_fetchall(query, params or ())
+        cache.put(key, rows, generation)
+        return rows
+
+    async def execute_read_with_columns(self, query: str, params=()):
         """Execute a read query and return (rows, column_names) tuple.
 
-        Uses the dedicated read connection to avoid blocking on writes.
+        Uses a pooled read connection to avoid blocking on writes.
         """
-        conn = self._read_connection or self._connection
-        async with conn.execute(query, params or []) as cursor:
+        async with self._read_conn() as conn, conn.execute(query, params or ()) as cursor:
             columns = [desc[0] for desc in cursor.description] if cursor.description else []
             rows = await cursor.fetchall()
             return rows, columns
 
-    async def execute_write(self, query: str, params=None) -> None:
-        await self._connection.execute(query, params or [])
-        await self._connection.commit()
+    async def execute_write(self, query: str, params=()) -> None:
+        async with self._write_lock:
+            self._note_write(query)
+            try:
+                await self._connection.execute(query, params or ())
+                await self._connection.commit()
+            finally:
+                self._flush_writes()
 
     async def executemany(self, query: str, params: Iterable[Sequence]) -> None:
-        await self._connection.executemany(query, params)
-        await self._connection.commit()
+        """Run one prepared statement over all params in a single transaction.
+
+        BEGIN IMMEDIATE takes the write lock up front, so the batch costs
+        one commit rather than risking a lock upgrade mid-batch. Inside a
+        caller's transaction() the batch joins it and is committed (or
+        rolled back) with it.
+        """
+        conn = self._connection
+        async with self._write_lock:
+            self._note_write(query)
+            began = not conn.in_transaction
+            if began:
+                await conn.execute("BEGIN IMMEDIATE")
+            try:
+                await conn.executemany(query, params)
+                if began:
+                    await conn.commit()
+            except Exception:
+                if began:
+                    await conn.rollback()
+                raise
+            finally:
+                self._flush_writes()
 
     # =========================================================================
     # Transaction support for atomic batch operations
@@ -185,19 +341,29 @@ class Database:
         except Exception:
             await self._connection.rollback()
             raise
+        finally:
+            self._flush_writes()
 
-    async def execute_write_no_commit(self, query: str, params=None) -> None:
+    async def execute_write_no_commit(self, query: str, params=()) -> None:
         """Execute write without immediate commit (use within transaction)."""
-        await self._connection.execute(query, params or [])
+        async with self._write_lock:
+            self._note_write(query)
+            await self._connection.execute(query, params or ())
 
     async def executemany_no_commit(self, query: str, params: Iterable[Sequence]) -> None:
         """Execute many without immediate commit (use within transaction)."""
-        await self._connection.executemany(query, params)
+        async with self._write_lock:
+            self._note_write(query)
+            await self._connection.executemany(query, params)
+
+    async def _close_readers(self) -> None:
+        self._readers = None
+        for conn in self._read_connections:
+            await conn.close()
+        self._read_connections = []
 
     async def close(self) -> None:
-        if self._read_connection:
-            await self._read_connection.close()
-            self._read_connection = None
+        await self._close_readers()
         if self._connection:
             await self._connection.close()
             self._connection = None
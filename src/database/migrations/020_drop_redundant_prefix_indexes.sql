@@ -0,0 +1,14 @@
+-- Migration 020: Drop single-column indexes that another index already covers
+--
+-- Every index is updated on every upsert, so a redundant one only slows the
+-- sync's bulk writes. SQLite can serve a lookup on a column from any index
+-- that starts with that column:
+--   idx_bom_mo (mo_bill_no): covered by the UNIQUE(mo_bill_no, material_code,
+--     aux_prop_id) index used by ON CONFLICT, and by idx_bom_mo_synced.
+--     The sync's DELETE ... WHERE mo_bill_no IN (...) keeps its index path.
+--   idx_po_mto (mto_number): covered by idx_po_mto_synced and
+--     idx_search_mto_material. Migration 010 recreates it on legacy DBs,
+--     so it is dropped here rather than only removed from schema.sql.
+
+DROP INDEX IF EXISTS idx_bom_mo;
+DROP INDEX IF EXISTS idx_po_mto;
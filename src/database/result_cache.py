@@ -0,0 +1,120 @@
+"""Read-result cache for Database.execute_read.
+
+Results are keyed on (sql, params) and tagged with the tables the SELECT
+names, so a write only drops the reads that could observe it.
+"""
+
+from __future__ import annotations
+
+import re
+from collections.abc import Mapping
+
+from cachetools import TTLCache
+
+# Only plain reads are cached
+_CACHEABLE_SQL = re.compile(r"^\s*(?:SELECT|WITH)\b", re.IGNORECASE)
+# Results that change without any write
+_VOLATILE_SQL = re.compile(
+    r"\b(?:now|current_(?:date|time|timestamp)|random(?:blob)?|changes|"
+    r"total_changes|last_insert_rowid)\b",
+    re.IGNORECASE,
+)
+# Safe to run on the write connection without invalidating anything
+_SELECT_SQL = re.compile(r"^\s*SELECT\b", re.IGNORECASE)
+_READ_TABLES = re.compile(r"\b(?:FROM|JOIN)\s+[\"`\[]?(\w+)", re.IGNORECASE)
+# "FROM a, b" / "JOIN a, b" name b without FROM/JOIN, and "FROM (...) t, b"
+# hides it behind a derived table; such reads are not cached
+_UNTAGGED_TABLES = re.compile(
+    r"\b(?:FROM|JOIN)\s*(?:\(|[\"`\[]?\w+[\"`\]]?(?:\s+(?:AS\s+)?\w+)?\s*,)",
+    re.IGNORECASE,
+)
+_WRITE_TABLE = re.compile(
+    r"^\s*(?:INSERT(?:\s+OR\s+\w+)?\s+INTO|REPLACE\s+INTO|"
+    r"UPDATE(?:\s+OR\s+\w+)?|DELETE\s+FROM)\s+[\"`\[]?(\w+)",
+    re.IGNORECASE,
+)
+
+# Larger results are returned but not kept
+DEFAULT_MAX_ROWS = 1000
+# Bounds staleness from writers outside this process (maintenance scripts)
+DEFAULT_TTL_SECONDS = 60
+
+
+def is_select(query: str) -> bool:
+    """True for a plain SELECT, which cannot modify the database."""
+    return _SELECT_SQL.match(query) is not None
+
+
+def write_target(query: str) -> str | None:
+    """Table written by an INSERT/REPLACE/UPDATE/DELETE, else None."""
+    match = _WRITE_TABLE.match(query)
+    return match.group(1).lower() if match else None
+
+
+class QueryResultCache:
+    """TTL/LRU cache of read results, invalidated per table on writes.
+
+    A read is only dropped by writes that name a table it reads. Tables
+    filled by triggers (e.g. FTS indexes) must be read joined with their
+    base table, as KnowledgeStore's search does. Writes whose target cannot
+    be parsed (DDL, CTE-prefixed DML) clear the whole cache.
+
+    ``generation`` advances on every invalidation; a read that was running
+    across one is not stored, since it may predate the write.
+    """
+
+    def __init__(
+        self,
+        maxsize: int,
+        ttl: float = DEFAULT_TTL_SECONDS,
+        max_rows: int = DEFAULT_MAX_ROWS,
+    ):
+        # key -> (rows, tables read)
+        self._entries: TTLCache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._max_rows = max_rows
+        self.generation = 0
+
+    @staticmethod
+    def key(query: str, params=None) -> tuple | None:
+        """Cache key for a read, or None if it must not be cached."""
+        if not _CACHEABLE_SQL.match(query) or _VOLATILE_SQL.search(query):
+            return None
+        if _UNTAGGED_TABLES.search(query):
+            return None
+        if isinstance(params, Mapping):
+            frozen = tuple(sorted(params.items()))
+        else:
+            frozen = tuple(params or ())
+        key = (query, frozen)
+        try:
+            hash(key)
+        except TypeError:
+            return None
+        return key
+
+    def get(self, key: tuple) -> list | None:
+        entry = self._entries.get(key)
+        return list(entry[0]) if entry is not None else None
+
+    def put(self, key: tuple, rows: list, generation: int) -> None:
+        if generation != self.generation or len(rows) > self._max_rows:
+            return
+        tables = frozenset(t.lower() for t in _READ_TABLES.findall(key[0]))
+        self._entries[key] = (list(rows), tables)
+
+    def invalidate(self, table: str | None) -> None:
+        """Drop reads of ``table``; ``None`` drops everything."""
+        self.generation += 1
+        if table is None:
+            self._entries.clear()
+            return
+        table = table.lower()
+        # Linear in maxsize; fine for a few hundred entries. get() rather
+        # than items(): an entry may expire between iteration and lookup.
+        for key in list(self._entries):
+            entry = self._entries.get(key)
+            if entry is not None and table in entry[1]:
+                self._entries.pop(key, None)
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -1,6 +1,6 @@
--- Enable WAL mode for better concurrent read/write performance
-PRAGMA journal_mode=WAL;
-PRAGMA busy_timeout=5000;
+-- Runs inside one transaction (Database._init_schema). Connection PRAGMAs
+-- (WAL, busy_timeout) are set by Database._configure_connection: SQLite
+-- cannot change journal_mode inside a transaction.
 
 -- Production orders cache
 CREATE TABLE IF NOT EXISTS cached_production_orders (
@@ -24,7 +24,6 @@ CREATE TABLE IF NOT EXISTS cached_production_orders (
     -- upsert silently migrates rows between MTOs (DS256203S contamination).
     UNIQUE(bill_no, mto_number, material_code, aux_prop_id)
 );
-CREATE INDEX IF NOT EXISTS idx_po_mto ON cached_production_orders(mto_number);
 CREATE INDEX IF NOT EXISTS idx_po_synced ON cached_production_orders(synced_at);
 CREATE INDEX IF NOT EXISTS idx_po_material ON cached_production_orders(material_code);
 -- Compound index for common query pattern: filter by mto_number, sort by synced_at
@@ -53,7 +52,6 @@ CREATE TABLE IF NOT EXISTS cached_production_bom (
     synced_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     UNIQUE(mo_bill_no, material_code, aux_prop_id)
 );
-CREATE INDEX IF NOT EXISTS idx_bom_mo ON cached_production_bom(mo_bill_no);
 CREATE INDEX IF NOT EXISTS idx_bom_mto ON cached_production_bom(mto_number);
 CREATE INDEX IF NOT EXISTS idx_bom_material ON cached_production_bom(material_code);
 CREATE INDEX IF NOT EXISTS idx_bom_type ON cached_production_bom(material_type);
@@ -236,3 +234,6 @@ CREATE TABLE IF NOT EXISTS sync_history (
     records_synced INTEGER,
     error_message TEXT
 );
+-- Latest run per status (/health) and the newest-first /sync/history page
+CREATE INDEX IF NOT EXISTS idx_sync_history_status_started ON sync_history(status, started_at DESC);
+CREATE INDEX IF NOT EXISTS idx_sync_history_started ON sync_history(started_at DESC);
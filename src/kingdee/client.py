@@ -15,9 +15,17 @@ import json
 import logging
 import re
 from datetime import date, timedelta
+from http.cookiejar import DefaultCookiePolicy
 from typing import Optional, TYPE_CHECKING
+from urllib.parse import urlparse
 
+import orjson
+import requests
+from cachetools import TTLCache
+from k3cloud_webapi_sdk.const.const_define import InvokeMethod, QueryMode
+from k3cloud_webapi_sdk.core.webapi_client import ValidResult
 from k3cloud_webapi_sdk.main import K3CloudApiSdk
+from requests.adapters import HTTPAdapter
 
 from src.exceptions import KingdeeQueryError
 
@@ -26,6 +34,84 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+# Max ExecuteBillQuery calls in flight per KingdeeClient. Callers fan out
+# freely (9 readers per MTO x concurrent MTOs x sync chunks); this keeps the
+# total under what Kingdee tolerates before throttling/session errors.
+MAX_CONCURRENT_REQUESTS = 16
+
+# Keep-alive connections held open to the Kingdee host (>= the cap above).
+HTTP_POOL_MAXSIZE = 20
+
+# Pages requested at once by query_by_date_range once a window overflows one
+# page. Sync windows are the reads that can run to many pages; requests still
+# pass through the client-wide MAX_CONCURRENT_REQUESTS cap.
+DATE_RANGE_PAGE_CONCURRENCY = 4
+
+# Resolved BD_FLEXSITEMDETAILV descriptions, per aux_prop_id. Aux property
+# combinations are effectively immutable once referenced by a document, so
+# the TTL only bounds memory churn and rare master-data edits.
+AUX_CACHE_MAX_SIZE = 20000
+AUX_CACHE_TTL_SECONDS = 3600
+
+
+class _PooledK3CloudApiSdk(K3CloudApiSdk):
+    """K3CloudApiSdk that reuses keep-alive HTTP connections.
+
+    The stock SDK posts with module-level ``requests.post``, which opens (and
+    TLS-handshakes) a new connection for every call. This sends the identical
+    request through one pooled ``requests.Session`` instead. Headers, the
+    session-id cookie and error handling stay the SDK's own: the Session's
+    cookie jar is disabled so it never adds cookies behind the SDK's back.
+
+    PostJson is a copy of ``WebApiClient.PostJson`` from the SDK wheel pinned
+    in docker/Dockerfile (kingdee.cdp.webapi.sdk 8.2.0). TestPooledSdk fails
+    if the installed SDK's method differs, so an upgrade must re-sync it.
+
+    KingdeeClient calls the SDK from executor threads, so the one Session is
+    shared by up to MAX_CONCURRENT_REQUESTS threads. That is safe here: the
+    urllib3 pool is thread-safe and, with cookies disabled, the Session keeps
+    no per-request state.
+    """
+
+    def __init__(self, server_url, timeout=120):
+        super().__init__(server_url, timeout)
+        self._http = requests.Session()
+        self._http.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=HTTP_POOL_MAXSIZE)
+        self._http.mount("http://", adapter)
+        self._http.mount("https://", adapter)
+
+    def PostJson(self, service_name, json_data=None, invoke_type=InvokeMethod.SYNC):
+        # Mirrors WebApiClient.PostJson, swapping requests.post for the Session.
+        if json_data is None:
+            json_data = {}
+        if self.identify.ServerUrl.endswith("/"):
+            req_url = self.identify.ServerUrl + service_name + ".common.kdsvc"
+        else:
+            req_url = self.identify.ServerUrl + "/" + service_name + ".common.kdsvc"
+
+        proxies = None
+        if self.proxy != "":
+            proxies = {urlparse(self.proxy).scheme: self.proxy}
+
+        if invoke_type == InvokeMethod.QUERY:
+            json_data[QueryMode.BeginMethod_Header.value] = QueryMode.BeginMethod_Method.value
+            json_data[QueryMode.QueryMethod_Header.value] = QueryMode.QueryMethod_Method.value
+
+        res = self._http.post(
+            url=req_url,
+            headers=self.BuildHeader(req_url),
+            data=json.dumps(json_data),
+            proxies=proxies,
+            timeout=(self.connectTimeout, self.requestTimeout),
+            verify=False,
+        )
+
+        if res.status_code == requests.codes.ok or res.status_code == requests.codes.partial:
+            self.FillCookieAndHeader(res.cookies, res.headers)
+            return ValidResult(res.text)
+        raise RuntimeError(res.text)
+
 
 class KingdeeClient:
     """K3Cloud SDK Wrapper"""
@@ -57,6 +143,11 @@ class KingdeeClient:
         self._sdk: Optional[K3CloudApiSdk] = None
         self._lock = asyncio.Lock()
         self._reset_in_progress = False
+        self._request_semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+        # aux_prop_id -> description, for IDs that resolved to one
+        self._aux_cache: TTLCache[int, str] = TTLCache(
+            maxsize=AUX_CACHE_MAX_SIZE, ttl=AUX_CACHE_TTL_SECONDS
+        )
 
     def _is_session_expired_error(self, error_message: str) -> bool:
         """Check if error indicates session expiration."""
@@ -91,7 +182,7 @@ class KingdeeClient:
         """Get or create SDK instance (thread-safe)."""
         async with self._lock:
             if self._sdk is None:
-                self._sdk = K3CloudApiSdk(self.config.server_url)
+                self._sdk = _PooledK3CloudApiSdk(self.config.server_url)
                 # Use InitConfig() with credentials from environment/config
                 # This avoids storing credentials in files tracked by git
                 self._sdk.InitConfig(
@@ -143,18 +234,20 @@ class KingdeeClient:
 
         try:
             loop = asyncio.get_running_loop()
-            response = await loop.run_in_executor(
-                None,
-                lambda: sdk.ExecuteBillQuery(params),
-            )
+            async with self._request_semaphore:
+                response = await loop.run_in_executor(
+                    None,
+                    lambda: sdk.ExecuteBillQuery(params),
+                )
 
             if not response:
                 return []
 
-            # SDK returns JSON string, need to parse it
+            # SDK returns JSON string, need to parse it (orjson: pages run to
+            # thousands of rows; orjson.JSONDecodeError subclasses json's)
             if isinstance(response, str):
                 try:
-                    response = json.loads(response)
+                    response = orjson.loads(response)
                 except json.JSONDecodeError as e:
                     # Log the first 200 chars for debugging
                     preview = response[:200] if len(response) > 200 else response
@@ -217,6 +310,8 @@ class KingdeeClient:
                 return []
 
             # Filter out any non-list rows
+            keys = tuple(field_keys)
+            n_fields = len(keys)
             valid_rows = []
             for row in response:
                 if isinstance(row, list):
@@ -224,12 +319,12 @@ class KingdeeClient:
                     if len(row) > 0 and isinstance(row[0], dict) and "Result" in row[0]:
                         logger.warning("Skipping error row in response")
                         continue
-                    if len(row) != len(field_keys):
+                    if len(row) != n_fields:
                         logger.warning(
                             "API returned %d columns, expected %d for %s",
-                            len(row), len(field_keys), form_id,
+                            len(row), n_fields, form_id,
                         )
-                    valid_rows.append(dict(zip(field_keys, row)))
+                    valid_rows.append(dict(zip(keys, row)))
 
             return valid_rows
 
@@ -264,13 +359,44 @@ class KingdeeClient:
         field_keys: list[str],
         filter_string: str = "",
         page_size: int = 2000,
+        page_concurrency: int = 1,
     ) -> list[dict]:
-        """Paginated query for all records."""
-        all_records: list[dict] = []
-        start_row = 0
+        """Paginated query for all records.
+
+        With ``page_concurrency`` > 1, once the first page comes back full
+        the following pages are requested that many at a time, overlapping
+        their round-trips. A wave can ask for up to ``page_concurrency - 1``
+        pages past the end, so this is opt-in for reads likely to span
+        several pages.
+        """
+        if page_concurrency <= 1:
+            all_records: list[dict] = []
+            start_row = 0
+
+            while True:
+                batch = await self.query(
+                    form_id=form_id,
+                    field_keys=field_keys,
+                    filter_string=filter_string,
+                    limit=page_size,
+                    start_row=start_row,
+                )
 
-        while True:
-            batch = await self.query(
+                if not batch:
+                    break
+
+                all_records.extend(batch)
+
+                if len(batch) < page_size:
+                    break
+
+                start_row += page_size
+
+            logger.info("Query %s: %s records total", form_id, len(all_records))
+            return all_records
+
+        def fetch(start_row: int):
+            return self.query(
                 form_id=form_id,
                 field_keys=field_keys,
                 filter_string=filter_string,
@@ -278,18 +404,22 @@ class KingdeeClient:
                 start_row=start_row,
             )
 
-            if not batch:
-                break
-
-            all_records.extend(batch)
-
-            if len(batch) < page_size:
-                break
-
-            start_row += page_size
+        records = await fetch(0)
+        done = len(records) < page_size
+        start_row = page_size
+        while not done:
+            pages = await asyncio.gather(
+                *(fetch(start_row + i * page_size) for i in range(page_concurrency))
+            )
+            for page in pages:
+                records.extend(page)
+                if len(page) < page_size:
+                    done = True
+                    break
+            start_row += page_concurrency * page_size
 
-        logger.info("Query %s: %s records total", form_id, len(all_records))
-        return all_records
+        logger.info("Query %s: %s records total", form_id, len(records))
+        return records
 
     async def query_by_date_range(
         self,
@@ -325,6 +455,7 @@ class KingdeeClient:
             form_id=form_id,
             field_keys=field_keys,
             filter_string=filter_string,
+            page_concurrency=DATE_RANGE_PAGE_CONCURRENCY,
         )
 
     async def query_by_mto(
@@ -400,15 +531,31 @@ class KingdeeClient:
         response, this function logs a WARNING and returns {}. Callers
         already tolerate missing entries (default to ""), but the warning
         makes the silent degradation visible in Loki.
+
+        Found descriptions are cached per client, so only IDs not resolved
+        recently go to Kingdee. IDs with no description and failed lookups
+        are not cached: a missing ID may be filled in by master-data edits
+        well within the TTL.
         """
         if not aux_prop_ids:
             return {}
 
         # Filter out zeros and duplicates
-        valid_ids = list(set(id for id in aux_prop_ids if id and id > 0))
-        if not valid_ids:
+        unique_ids = set(id for id in aux_prop_ids if id and id > 0)
+        if not unique_ids:
             return {}
 
+        cached: dict[int, str] = {}
+        valid_ids: list[int] = []
+        for aux_id in unique_ids:
+            description = self._aux_cache.get(aux_id)
+            if description is None:
+                valid_ids.append(aux_id)
+            else:
+                cached[aux_id] = description
+        if not valid_ids:
+            return cached
+
         # Build IN clause for batch query
         in_clause = ",".join(str(id) for id in valid_ids)
         filter_string = f"FID IN ({in_clause})"
@@ -429,7 +576,7 @@ class KingdeeClient:
                 sample,
                 exc_info=True,
             )
-            return {}
+            return cached
 
         result: dict[int, str] = {}
         for record in records:
@@ -465,7 +612,8 @@ class KingdeeClient:
                 "Looked up %d aux properties, found %d descriptions",
                 len(valid_ids), len(result),
             )
-        return result
+        self._aux_cache.update(result)
+        return {**cached, **result}
 
     async def lookup_material_categories(
         self, material_codes: list[str]
@@ -35,11 +35,12 @@ _STATUS_ERROR_CODES = {
     502: "erp_unavailable",
     503: "service_unavailable",
 }
+from src.agents.tool_coalescer import ToolCoalescer
 from src.api.routers import admin, agent_chat, alerts, auth, cache, inventory as inventory_router, mto, photo, sync
 from src.config import Config
 from src.database.connection import Database
 from src.kingdee.client import KingdeeClient
-from src.mto_config import MTOConfig
+from src.mto_config import load_mto_config
 from src.query.cache_reader import CacheReader
 from src.query.mto_handler import MTOQueryHandler
 from src.readers.inventory import InventoryReader
@@ -80,7 +81,11 @@ async def lifespan(app: FastAPI):
     config.db_path.parent.mkdir(parents=True, exist_ok=True)
     config.reports_dir.mkdir(parents=True, exist_ok=True)
 
-    db = Database(config.db_path)
+    db = Database(
+        config.db_path,
+        mmap_size=config.database.mmap_size,
+        result_cache_size=config.database.result_cache_size,
+    )
     await db.connect()
 
     kingdee_client = KingdeeClient(config.kingdee)
@@ -115,7 +120,7 @@ async def lifespan(app: FastAPI):
     cache_reader = CacheReader(db, ttl_minutes=cache_ttl) if config.sync.query_cache.enabled else None
 
     # Load MTO configuration for material class routing
-    mto_config = MTOConfig("config/mto_config.json")
+    mto_config = load_mto_config("config/mto_config.json")
     logger.info("Loaded MTO config with %d material classes", len(mto_config.material_classes))
 
     # Build semantic metric engine from config
@@ -196,6 +201,7 @@ async def lifespan(app: FastAPI):
     app.state.cache_reader = cache_reader or CacheReader(db, ttl_minutes=cache_ttl)
     app.state.scheduler = scheduler
     app.state.mto_config = mto_config
+    app.state.agent_tool_coalescer = ToolCoalescer()
 
     yield
 
@@ -7,6 +7,7 @@ from src.mto_config.mto_config import (
     ReceiptSourceConfig,
     SemanticConfig,
     SemanticMetricConfig,
+    load_mto_config,
 )
 
 __all__ = [
@@ -16,4 +17,5 @@ __all__ = [
     "ReceiptSourceConfig",
     "SemanticConfig",
     "SemanticMetricConfig",
+    "load_mto_config",
 ]
@@ -6,6 +6,7 @@ import json
 import logging
 import re
 from dataclasses import dataclass, field
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, Optional
 
@@ -337,3 +338,13 @@ class MTOConfig:
                         f"does not exist on ChildItem. "
                         f"Valid fields: {sorted(valid_fields)}"
                     )
+
+
+@lru_cache(maxsize=8)
+def load_mto_config(config_path: str = "config/mto_config.json") -> MTOConfig:
+    """Return the process-wide MTOConfig for *config_path*.
+
+    The file is read and parsed once; callers share the instance, so a
+    reload() on it is seen by all of them.
+    """
+    return MTOConfig(config_path)
@@ -13,7 +13,7 @@ from typing import Optional, TYPE_CHECKING
 
 from cachetools import TTLCache
 
-from src.mto_config import MTOConfig, MaterialClassConfig
+from src.mto_config import MTOConfig, MaterialClassConfig, load_mto_config
 from src.models.mto_status import (
     ChildItem,
     MTOStatusResponse,
@@ -105,7 +105,7 @@ class MTOQueryHandler:
         self._client = production_order_reader.client
 
         # Load MTO configuration (material class mappings)
-        self._mto_config = mto_config or MTOConfig()
+        self._mto_config = mto_config or load_mto_config()
 
         # Semantic layer metric engine (None = disabled)
         self._metric_engine = metric_engine
@@ -428,21 +428,29 @@ class MTOQueryHandler:
             if getattr(po, "aux_prop_id", 0):
                 aux_prop_ids.add(po.aux_prop_id)
 
-        # Lookup aux property descriptions from Kingdee
-        aux_descriptions = await self._client.lookup_aux_properties(list(aux_prop_ids))
-
-        children = []
-
+        # Lookup aux property descriptions from Kingdee while the remaining
+        # cache reads run.
         # --- Finished goods (07.xx) from SAL_SaleOrder (NOT from BOM) ---
         # BOM-joined query now excludes 07.xx, so fetch 07.xx receipt/delivery
-        # data separately from individual cache tables
-        prod_receipts_result = await self._cache_reader.get_production_receipts(mto_number)
-        sales_delivery_result = await self._cache_reader.get_sales_delivery(mto_number)
-        material_picking_result = await self._cache_reader.get_material_picking(mto_number)
+        # data separately from individual cache tables.
         # Wave 6B: also pull purchase receipts (STK_InStock) — 07.xx finished
         # goods can be transferred in from sister plants / OEM partners and
         # land in STK_InStock RKD01_SYS instead of PRD_INSTOCK.
-        purchase_receipts_result = await self._cache_reader.get_purchase_receipts(mto_number)
+        (
+            aux_descriptions,
+            prod_receipts_result,
+            sales_delivery_result,
+            material_picking_result,
+            purchase_receipts_result,
+        ) = await asyncio.gather(
+            self._client.lookup_aux_properties(list(aux_prop_ids)),
+            self._cache_reader.get_production_receipts(mto_number),
+            self._cache_reader.get_sales_delivery(mto_number),
+            self._cache_reader.get_material_picking(mto_number),
+            self._cache_reader.get_purchase_receipts(mto_number),
+        )
+
+        children = []
 
         prod_receipts_07 = [r for r in (prod_receipts_result.data or []) if r.material_code.startswith("07.")]
         sales_delivery_07 = [r for r in (sales_delivery_result.data or []) if r.material_code.startswith("07.")]
@@ -483,6 +491,8 @@ class MTOQueryHandler:
             sales_by_key, receipt_by_material, purchase_receipt_by_material
         )
 
+        receipt_rollup_by_code = _sum_by_code(receipt_by_material)
+        purchase_receipt_rollup_by_code = _sum_by_code(purchase_receipt_by_material)
         photo_file_ids = self._collect_photo_file_ids(prod_orders)
 
         for key, so_list in sales_by_key.items():
@@ -492,6 +502,8 @@ class MTOQueryHandler:
                 purchase_receipt_by_material=purchase_receipt_by_material,
                 receipt_dedup_state=receipt_dedup_state,
                 photo_file_ids=photo_file_ids,
+                receipt_rollup_by_code=receipt_rollup_by_code,
+                purchase_receipt_rollup_by_code=purchase_receipt_rollup_by_code,
             )
             children.append(child)
 
@@ -631,8 +643,22 @@ class MTOQueryHandler:
                 if hasattr(item, "aux_prop_id") and item.aux_prop_id:
                     aux_prop_ids.add(item.aux_prop_id)
 
-        # Lookup aux property descriptions from BD_FLEXSITEMDETAILV
-        aux_descriptions = await self._client.lookup_aux_properties(list(aux_prop_ids))
+        # Phase 2a: synthetic / PUR-only rows (Step-2 blocks below) are NOT in PPBOM and
+        # carry no category, so historically they fell back to the legacy material_type
+        # (e.g. a 外销包材 box mislabeled 自制). Look up the authoritative BD_MATERIAL.CategoryID.
+        synthetic_codes = {
+            mc
+            for src in (prod_receipts, purchase_orders, prod_orders, material_picks)
+            for r in src
+            if (mc := getattr(r, "material_code", "")) and not mc.startswith("07.")
+        }
+
+        # Aux descriptions (BD_FLEXSITEMDETAILV) and material categories
+        # (BD_MATERIAL) are independent lookups — issue them in parallel.
+        aux_descriptions, _material_lookup = await asyncio.gather(
+            self._client.lookup_aux_properties(list(aux_prop_ids)),
+            self._client.lookup_material_categories(list(synthetic_codes)),
+        )
 
         children = []
 
@@ -658,6 +684,8 @@ class MTOQueryHandler:
             sales_by_key, receipt_by_material, purchase_receipt_by_material
         )
 
+        receipt_rollup_by_code = _sum_by_code(receipt_by_material)
+        purchase_receipt_rollup_by_code = _sum_by_code(purchase_receipt_by_material)
         photo_file_ids = self._collect_photo_file_ids(prod_orders)
 
         for key, so_list in sales_by_key.items():
@@ -667,25 +695,17 @@ class MTOQueryHandler:
                 purchase_receipt_by_material=purchase_receipt_by_material,
                 receipt_dedup_state=receipt_dedup_state,
                 photo_file_ids=photo_file_ids,
+                receipt_rollup_by_code=receipt_rollup_by_code,
+                purchase_receipt_rollup_by_code=purchase_receipt_rollup_by_code,
             )
             children.append(child)
 
-        # Phase 2a: synthetic / PUR-only rows (Step-2 blocks below) are NOT in PPBOM and
-        # carry no category, so historically they fell back to the legacy material_type
-        # (e.g. a 外销包材 box mislabeled 自制). Look up the authoritative BD_MATERIAL.CategoryID.
-        synthetic_codes = {
-            mc
-            for src in (prod_receipts, purchase_orders, prod_orders, material_picks)
-            for r in src
-            if (mc := getattr(r, "material_code", "")) and not mc.startswith("07.")
-        }
         # Only let CategoryID OVERRIDE the block's source-based type toward the NON-自制 types
         # (外销包材→包材, 委外加工→委外, 包装成品→成品). For 主料/辅料/半成品 (which map to 自制) the
         # block's source is more reliable: a purchase-sourced row is 外购/包材, NOT 自制 — e.g.
         # 外箱纸板 is category 主料 + IsPurchase=True but is packaging, so the crude 主料→自制 map
         # would mislabel it. Filtering to override-categories keeps purchased main materials correct.
         _override_cats = {c for c, (_t, lbl) in self._CATEGORY_TO_TYPE.items() if lbl != "自制"}
-        _material_lookup = await self._client.lookup_material_categories(list(synthetic_codes))
         category_by_code = {
             code: cat
             for code, (cat, _is_pur) in _material_lookup.items()
@@ -1520,6 +1540,8 @@ class MTOQueryHandler:
         purchase_receipt_by_material: dict[tuple[str, int], Decimal] | None = None,
         receipt_dedup_state: dict[tuple[str, str], dict] | None = None,
         photo_file_ids: Optional[list[str]] = None,
+        receipt_rollup_by_code: dict[str, Decimal] | None = None,
+        purchase_receipt_rollup_by_code: dict[str, Decimal] | None = None,
     ) -> ChildItem:
         """Build aggregated ChildItem for 07.xx.xxx (成品) from multiple SAL_SaleOrder records.
 
@@ -1534,6 +1556,11 @@ class MTOQueryHandler:
           Observed on DK251003S 07.02.151/154 where SAL had qty=242/583 but
           PRD_INSTOCK had zero rows; the receipt lived in STK_InStock RKD01.
         - bom_short_name: BOM简称
+
+        ``receipt_rollup_by_code`` / ``purchase_receipt_rollup_by_code`` are the
+        per-code all-aux totals of the two receipt maps (``_sum_by_code``),
+        precomputed once per MTO so the Tier 3 fallback is a dict lookup
+        instead of a scan of every receipt key per child.
         """
         first = sales_orders[0]
         code = first.material_code
@@ -1554,6 +1581,7 @@ class MTOQueryHandler:
         prod_instock_real_qty = self._lookup_finished_receipt(
             receipt_by_material, code, aux_prop_id,
             dedup_state=receipt_dedup_state, dedup_label="prod",
+            rollup_by_code=receipt_rollup_by_code,
         )
 
         # 采购入库单.实收数量 — same Tier 1 → Tier 3 rollup against the STK_InStock
@@ -1562,6 +1590,7 @@ class MTOQueryHandler:
         purchase_stock_in_qty = self._lookup_finished_receipt(
             purchase_receipt_by_material or {}, code, aux_prop_id,
             dedup_state=receipt_dedup_state, dedup_label="purchase",
+            rollup_by_code=purchase_receipt_rollup_by_code,
         )
 
         return ChildItem(
@@ -1589,6 +1618,7 @@ class MTOQueryHandler:
         aux_prop_id: int,
         dedup_state: dict[tuple[str, str], dict] | None = None,
         dedup_label: str = "",
+        rollup_by_code: dict[str, Decimal] | None = None,
     ) -> Decimal:
         """Receipt lookup for 07.xx finished goods.
 
@@ -1633,10 +1663,13 @@ class MTOQueryHandler:
             if zero_fallback is not None:
                 return zero_fallback
         # Tier 3: sum across all aux for this code
-        rollup = sum(
-            (v for k, v in receipt_by_material.items() if k[0] == code),
-            ZERO,
-        )
+        if rollup_by_code is not None:
+            rollup = rollup_by_code.get(code, ZERO)
+        else:
+            rollup = sum(
+                (v for k, v in receipt_by_material.items() if k[0] == code),
+                ZERO,
+            )
         return rollup if rollup else ZERO
 
     @staticmethod
@@ -2166,6 +2199,14 @@ def _sum_by_material(records, field: str) -> dict[str, Decimal]:
     return totals
 
 
+def _sum_by_code(totals_by_material_and_aux: dict[tuple[str, int], Decimal]) -> dict[str, Decimal]:
+    """Roll a (material_code, aux_prop_id) totals map up to material_code."""
+    totals: dict[str, Decimal] = defaultdict(lambda: ZERO)
+    for (code, _aux), qty in totals_by_material_and_aux.items():
+        totals[code] += qty
+    return totals
+
+
 def _sum_by_material_and_aux(records, field: str) -> dict[tuple[str, int], Decimal]:
     """Sum a field by (material_code, aux_prop_id) for variant-aware matching.
 
@@ -3,7 +3,6 @@
 from __future__ import annotations
 
 import asyncio
-import json
 import logging
 from dataclasses import dataclass
 from datetime import date, datetime, timedelta
@@ -68,8 +67,12 @@ def date_chunks(
 
 
 def model_to_json(model) -> str:
-    """Serialize a Pydantic model to JSON string."""
-    return json.dumps(model.model_dump(mode="json"), ensure_ascii=False)
+    """Serialize a Pydantic model to a compact JSON string for raw_data.
+
+    pydantic-core writes it directly: no intermediate dict, no whitespace,
+    non-ASCII kept as UTF-8. Still plain JSON so json_extract() keeps working.
+    """
+    return model.model_dump_json()
 
 
 class SyncService:
@@ -533,7 +536,7 @@ class SyncService:
                 WHERE create_date IS NOT NULL
                   AND date(create_date) BETWEEN date(?) AND date(?)
                 """,
-                [start.isoformat(), end.isoformat()],
+                (start.isoformat(), end.isoformat()),
             )
 
         if not orders:
@@ -1093,12 +1096,12 @@ class SyncService:
             )
             VALUES (?, ?, ?, ?, ?, ?)
             """,
-            [
+            (
                 result.started_at.isoformat(),
                 result.finished_at.isoformat(),
                 result.status,
                 result.days_back,
                 result.records_synced,
                 error_message,
-            ],
+            ),
         )
@@ -8,6 +8,7 @@ Modules:
     raw_fetcher: Direct Kingdee API queries (bypasses QuickPulse readers)
     aggregator: Material-type-specific aggregation logic
     comparator: Main comparison engine
+    caching_client: Query-coalescing KingdeeClient for validation runs
 
 Usage:
     from tests.comparison.comparator import MTOComparator
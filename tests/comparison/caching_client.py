@@ -0,0 +1,61 @@
+"""Query-coalescing KingdeeClient for validation runs.
+
+The validation suite drives QuickPulse readers and RawKingdeeFetcher
+against the same Kingdee client, across overlapping MTO sets. Within one
+run the data is treated as static, so identical queries only need to hit
+Kingdee once.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from typing import TYPE_CHECKING
+
+from src.kingdee.client import KingdeeClient
+
+if TYPE_CHECKING:
+    from src.config import KingdeeConfig
+
+
+class CachingKingdeeClient(KingdeeClient):
+    """KingdeeClient that memoizes identical query() calls.
+
+    Keyed on (form_id, field_keys, filter_string, limit, start_row). The
+    value is the in-flight task, so concurrent duplicates share one request.
+    Failed queries are evicted so a later call retries them.
+    """
+
+    def __init__(self, config: "KingdeeConfig"):
+        super().__init__(config)
+        self._query_results: dict[tuple, asyncio.Task[list[dict]]] = {}
+
+    async def query(
+        self,
+        form_id: str,
+        field_keys: list[str],
+        filter_string: str = "",
+        limit: int = 2000,
+        start_row: int = 0,
+        _retry_count: int = 0,
+    ) -> list[dict]:
+        if _retry_count:
+            # Session-expiry retry from inside the cached call; go straight through
+            return await super().query(
+                form_id, field_keys, filter_string, limit, start_row, _retry_count
+            )
+
+        key = (form_id, tuple(field_keys), filter_string, limit, start_row)
+        task = self._query_results.get(key)
+        if task is None:
+            task = asyncio.ensure_future(
+                super().query(form_id, field_keys, filter_string, limit, start_row)
+            )
+            self._query_results[key] = task
+        try:
+            rows = await task
+        except Exception:
+            if self._query_results.get(key) is task:
+                del self._query_results[key]
+            raise
+        # Fresh list per caller; rows themselves are only read
+        return list(rows)
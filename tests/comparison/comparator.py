@@ -10,12 +10,14 @@ This module orchestrates the comparison process:
 
 from __future__ import annotations
 
+import asyncio
+from collections import Counter, defaultdict
 from decimal import Decimal
-from typing import Dict, List, Optional
+from typing import AsyncIterator, Dict, Iterator, List, Optional
 
 from src.kingdee.client import KingdeeClient
 from src.query.mto_handler import MTOQueryHandler
-from tests.comparison.aggregator import RawDataAggregator
+from tests.comparison.aggregator import AggregatedMaterial, RawDataAggregator
 from tests.comparison.field_specs import (
     FIELD_SPECS,
     VALIDATED_FIELDS,
@@ -28,6 +30,10 @@ from tests.comparison.field_specs import (
 from tests.comparison.raw_fetcher import RawKingdeeFetcher
 
 
+# Upper bound on concurrent compare() calls (each fans out to several Kingdee queries)
+DEFAULT_MAX_CONCURRENCY = 10
+
+
 class MTOComparator:
     """Compares QuickPulse output against raw Kingdee data."""
 
@@ -40,19 +46,34 @@ class MTOComparator:
         self.mto_handler = mto_handler
         self.raw_fetcher = RawKingdeeFetcher(kingdee_client)
         self.aggregator = RawDataAggregator()
+        # In-flight/finished comparisons keyed by MTO
+        self._results: Dict[str, asyncio.Task[ComparisonResult]] = {}
 
     async def compare(self, mto: str) -> ComparisonResult:
         """Compare QuickPulse vs Kingdee data for one MTO.
 
+        Results are memoized per MTO for the comparator's lifetime, and
+        concurrent callers for the same MTO share one in-flight comparison,
+        so tests that overlap on ``USER_MTOS`` hit Kingdee once per MTO.
+
         Args:
             mto: MTO number to compare
 
         Returns:
             ComparisonResult with validation details per material
         """
+        task = self._results.get(mto)
+        if task is None:
+            task = asyncio.ensure_future(self._compare(mto))
+            self._results[mto] = task
+        return await task
+
+    async def _compare(self, mto: str) -> ComparisonResult:
+        """Run one uncached comparison (errors are captured in the result)."""
         try:
-            # 1. Fetch QuickPulse result
-            qp_result = await self.mto_handler.get_status(mto, use_cache=False)
+            # 1. Fetch QuickPulse result (always the live aggregation; only the
+            #    handler's in-run L1 memory cache applies, if enabled)
+            qp_result = await self.mto_handler.get_status(mto)
 
             # 2. Fetch raw Kingdee data
             raw_data = await self.raw_fetcher.fetch_all(mto)
@@ -63,6 +84,11 @@ class MTOComparator:
             # 4. Aggregate QuickPulse by material_code (sum all aux variants)
             qp_aggregated = self._aggregate_quickpulse_by_material(qp_result.children)
 
+            # Index Kingdee aggregates by material_code once (all aux variants)
+            kd_by_code: Dict[str, List[AggregatedMaterial]] = defaultdict(list)
+            for (code, _aux), mat in aggregated.materials.items():
+                kd_by_code[code].append(mat)
+
             # 5. Compare aggregated QuickPulse vs aggregated Kingdee
             items: list[MaterialValidation] = []
 
@@ -73,7 +99,7 @@ class MTOComparator:
 
                 # Find aggregated Kingdee data for this material
                 kd_totals = self._aggregate_kingdee_by_material(
-                    aggregated, material_code, material_type
+                    kd_by_code.get(material_code, []), material_type
                 )
 
                 # Build validations comparing totals
@@ -96,6 +122,44 @@ class MTOComparator:
         except Exception as e:
             return ComparisonResult(mto=mto, items=[], error=str(e))
 
+    async def compare_many(
+        self,
+        mtos: list[str],
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    ) -> list[ComparisonResult]:
+        """Compare several MTOs concurrently, results in input order.
+
+        Each compare() is network-bound, so running them serially pays a full
+        Kingdee round trip per MTO. A semaphore bounds in-flight comparisons
+        to avoid tripping Kingdee throttling.
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def compare_with_semaphore(mto: str) -> ComparisonResult:
+            async with semaphore:
+                return await self.compare(mto)
+
+        return list(await asyncio.gather(*(compare_with_semaphore(mto) for mto in mtos)))
+
+    async def compare_as_completed(
+        self,
+        mtos: list[str],
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    ) -> AsyncIterator[ComparisonResult]:
+        """Like compare_many, but yield each result as soon as it finishes.
+
+        For progress output: the first results surface without waiting for
+        the slowest MTO. Yield order is completion order, not input order.
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def compare_with_semaphore(mto: str) -> ComparisonResult:
+            async with semaphore:
+                return await self.compare(mto)
+
+        for next_done in asyncio.as_completed([compare_with_semaphore(mto) for mto in mtos]):
+            yield await next_done
+
     def _aggregate_quickpulse_by_material(
         self,
         children,
@@ -132,19 +196,10 @@ class MTOComparator:
 
     def _aggregate_kingdee_by_material(
         self,
-        aggregated,
-        material_code: str,
+        matching: List[AggregatedMaterial],
         material_type: MaterialType,
     ) -> Dict[str, Decimal]:
-        """Get Kingdee totals for a material, summing all aux variants."""
-        from tests.comparison.aggregator import AggregatedMaterial
-
-        # Find all materials matching this code
-        matching = [
-            mat for (code, aux), mat in aggregated.materials.items()
-            if code == material_code
-        ]
-
+        """Get Kingdee totals for a material, summing all its aux variants."""
         if not matching:
             return {
                 "required_qty": Decimal(0),
@@ -207,11 +262,8 @@ class MTOComparator:
         """Validate aggregated totals between QuickPulse and Kingdee."""
         validations: Dict[str, FieldValidation] = {}
 
+        # VALIDATED_FIELDS is pre-filtered on spec.validate at import
         for field_name in VALIDATED_FIELDS:
-            spec = FIELD_SPECS.get(field_name)
-            if not spec or not spec.validate:
-                continue
-
             # Skip sales_outbound_qty for non-finished-goods
             if field_name == "sales_outbound_qty" and material_type != MaterialType.FINISHED_GOODS:
                 continue
@@ -295,11 +347,8 @@ class MTOComparator:
         """
         validations: dict[str, FieldValidation] = {}
 
+        # VALIDATED_FIELDS is pre-filtered on spec.validate at import
         for field_name in VALIDATED_FIELDS:
-            spec = FIELD_SPECS.get(field_name)
-            if not spec or not spec.validate:
-                continue
-
             # Skip sales_outbound_qty for non-finished-goods
             if field_name == "sales_outbound_qty" and material_type != MaterialType.FINISHED_GOODS:
                 continue
@@ -395,27 +444,33 @@ async def run_batch_comparison(
         List of ComparisonResults
     """
     comparator = MTOComparator(kingdee_client, mto_handler)
-    results = []
+    return await comparator.compare_many(mtos)
 
-    for mto in mtos:
-        result = await comparator.compare(mto)
-        results.append(result)
 
-    return results
+def count_field_matches(results: list[ComparisonResult]) -> Counter[tuple[str, bool]]:
+    """Tally validations across results, keyed by (field_name, match)."""
+    return Counter(
+        (field_name, validation.match)
+        for result in results
+        for item in result.items
+        for field_name, validation in item.validations.items()
+    )
 
 
-def generate_report(results: list[ComparisonResult]) -> str:
-    """Generate a markdown report from comparison results.
+def iter_report_lines(results: list[ComparisonResult]) -> Iterator[str]:
+    """Yield the markdown report for comparison results line by line.
+
+    Lets callers stream the report to a file without building the whole
+    string first.
 
     Args:
         results: List of ComparisonResults
 
-    Returns:
-        Markdown formatted report string
+    Yields:
+        Markdown lines (without trailing newlines)
     """
-    lines = []
-    lines.append("# QuickPulse vs Kingdee Validation Report")
-    lines.append("")
+    yield "# QuickPulse vs Kingdee Validation Report"
+    yield ""
 
     # Summary
     total_mtos = len(results)
@@ -423,70 +478,71 @@ def generate_report(results: list[ComparisonResult]) -> str:
     failed_mtos = sum(1 for r in results if not r.all_match or r.error)
     error_mtos = sum(1 for r in results if r.error)
 
-    lines.append("## Summary")
-    lines.append(f"- **MTOs Tested**: {total_mtos}")
-    lines.append(f"- **Passed**: {passed_mtos}")
-    lines.append(f"- **Failed**: {failed_mtos}")
+    yield "## Summary"
+    yield f"- **MTOs Tested**: {total_mtos}"
+    yield f"- **Passed**: {passed_mtos}"
+    yield f"- **Failed**: {failed_mtos}"
     if error_mtos:
-        lines.append(f"- **Errors**: {error_mtos}")
-    lines.append("")
+        yield f"- **Errors**: {error_mtos}"
+    yield ""
 
     # Field accuracy
-    field_stats: dict[str, dict[str, int]] = {}
-    for field_name in VALIDATED_FIELDS:
-        field_stats[field_name] = {"pass": 0, "fail": 0}
+    field_counts = count_field_matches(results)
 
-    for result in results:
-        for item in result.items:
-            for field_name, validation in item.validations.items():
-                if validation.match:
-                    field_stats[field_name]["pass"] += 1
-                else:
-                    field_stats[field_name]["fail"] += 1
-
-    lines.append("## Field Accuracy")
-    lines.append("")
-    lines.append("| Field | Chinese | Pass | Fail | Accuracy |")
-    lines.append("|-------|---------|------|------|----------|")
+    yield "## Field Accuracy"
+    yield ""
+    yield "| Field | Chinese | Pass | Fail | Accuracy |"
+    yield "|-------|---------|------|------|----------|"
 
     for field_name in VALIDATED_FIELDS:
         spec = FIELD_SPECS.get(field_name)
         chinese = spec.chinese_name if spec else field_name
-        stats = field_stats[field_name]
-        total = stats["pass"] + stats["fail"]
+        passed = field_counts[(field_name, True)]
+        failed = field_counts[(field_name, False)]
+        total = passed + failed
         if total > 0:
-            accuracy = f"{100 * stats['pass'] / total:.1f}%"
+            accuracy = f"{100 * passed / total:.1f}%"
         else:
             accuracy = "N/A"
-        lines.append(f"| {field_name} | {chinese} | {stats['pass']} | {stats['fail']} | {accuracy} |")
+        yield f"| {field_name} | {chinese} | {passed} | {failed} | {accuracy} |"
 
-    lines.append("")
+    yield ""
 
     # Failed MTOs
     failed_results = [r for r in results if not r.all_match or r.error]
     if failed_results:
-        lines.append("## Failed MTOs")
-        lines.append("")
+        yield "## Failed MTOs"
+        yield ""
 
         for result in failed_results:
-            lines.append(f"### MTO: {result.mto}")
+            yield f"### MTO: {result.mto}"
 
             if result.error:
-                lines.append(f"**Error**: {result.error}")
-                lines.append("")
+                yield f"**Error**: {result.error}"
+                yield ""
                 continue
 
-            lines.append("")
-            lines.append("| 物料编码 | 字段 | QuickPulse | Kingdee | Delta |")
-            lines.append("|---------|------|------------|---------|-------|")
+            yield ""
+            yield "| 物料编码 | 字段 | QuickPulse | Kingdee | Delta |"
+            yield "|---------|------|------------|---------|-------|"
 
             for item in result.failed_items:
                 for v in item.failed_fields:
-                    lines.append(
+                    yield (
                         f"| {item.material_code} | {v.chinese_name} | "
                         f"{v.qp_value} | {v.kd_value} | {v.delta} |"
                     )
 
-            lines.append("")
+            yield ""
+
+
+def generate_report(results: list[ComparisonResult]) -> str:
+    """Generate a markdown report from comparison results.
 
-    return "\n".join(lines)
+    Args:
+        results: List of ComparisonResults
+
+    Returns:
+        Markdown formatted report string
+    """
+    return "\n".join(iter_report_lines(results))
@@ -1,6 +1,15 @@
 """E2E test fixtures for serving frontend and mocking API.
 
-Uses pytest-playwright sync fixtures to drive the browser.
+Uses pytest-playwright sync fixtures to drive the browser. Chromium is
+launched once per session (``browser`` is session-scoped); each test gets a
+fresh, cheap ``context``/``page`` so ``localStorage`` and routes never leak
+between tests. Do not shadow ``page`` with a hand-launched browser — that
+would bypass ``browser_context_args`` below and the plugin's tracing hooks.
+
+A per-worker ``launch_persistent_context`` is deliberately not used: one
+shared profile would carry the ``token`` in localStorage and installed
+routes from test to test (breaking e.g. the no-token auth-guard redirect),
+and the browser process is already paid only once per worker.
 """
 
 import os
@@ -13,7 +22,23 @@ from pathlib import Path
 from typing import Iterator
 
 import pytest
-from playwright.sync_api import Page
+from playwright.sync_api import BrowserContext, Page
+
+from tests.fixtures.playwright_mocks import json_fulfillment
+
+
+# Common mock responses, serialized once at import.
+_VERIFY_OK = json_fulfillment({"ok": True})
+_SYNC_CONFIG = json_fulfillment({"manual_sync_default_days": 30})
+_SYNC_STATUS_IDLE = json_fulfillment(
+    {
+        "is_running": False,
+        "progress": 0,
+        "current_task": None,
+        "last_sync": "",
+        "records_synced": None,
+    }
+)
 
 
 def _wait_for_port(host: str, port: int, timeout: float = 10.0) -> None:
@@ -31,16 +56,34 @@ def _wait_for_port(host: str, port: int, timeout: float = 10.0) -> None:
     raise RuntimeError(f"Server on {host}:{port} did not start within {timeout}s")
 
 
+def _worker_port() -> int:
+    """Port for this worker's frontend server.
+
+    Under pytest-xdist each worker (``gw0``, ``gw1``, ...) binds its own
+    port so ``pytest -m e2e -n auto --dist=loadfile`` runs files in parallel.
+    """
+    worker = os.environ.get("PYTEST_XDIST_WORKER", "")
+    if worker.startswith("gw"):
+        return 8000 + int(worker[2:])
+    return 8000
+
+
 @pytest.fixture(scope="session")
-def base_url() -> str:
-    return "http://localhost:8000"
+def frontend_port() -> int:
+    return _worker_port()
 
 
 @pytest.fixture(scope="session")
-def serve_frontend(base_url: str) -> Iterator[None]:
+def base_url(frontend_port: int) -> str:
+    return f"http://localhost:{frontend_port}"
+
+
+@pytest.fixture(scope="session")
+def serve_frontend(frontend_port: int) -> Iterator[None]:
     """Serve src/frontend via python http.server for E2E tests.
 
-    Starts a background web server and shuts it down after the session.
+    Starts a background web server (one per xdist worker) and shuts it
+    down after the session.
     """
     frontend_dir = Path(__file__).resolve().parent.parent.parent / "src" / "frontend"
     assert frontend_dir.exists(), f"Frontend directory not found: {frontend_dir}"
@@ -48,14 +91,14 @@ def serve_frontend(base_url: str) -> Iterator[None]:
     env = os.environ.copy()
     # Use unbuffered output to avoid hanging on shutdown
     proc = subprocess.Popen(
-        [sys.executable, "-m", "http.server", "8000"],
+        [sys.executable, "-m", "http.server", str(frontend_port)],
         cwd=str(frontend_dir),
         env=env,
         stdout=subprocess.DEVNULL,
         stderr=subprocess.DEVNULL,
     )
     try:
-        _wait_for_port("127.0.0.1", 8000, timeout=15)
+        _wait_for_port("127.0.0.1", frontend_port, timeout=15)
         yield
     finally:
         proc.terminate()
@@ -72,27 +115,20 @@ def login_as_test_user(page: Page, base_url: str) -> None:
 
 
 @pytest.fixture()
-def mock_common_api(page: Page) -> None:
-    """Default API mocks that keep pages stable without a backend."""
+def mock_common_api(context: BrowserContext) -> None:
+    """Default API mocks that keep pages stable without a backend.
+
+    Installed once on the browser context so every page inherits them.
+    Tests override individual endpoints with ``page.route`` — page routes
+    take precedence over context routes. All mocks are scoped to ``**/api/**``.
+    """
 
     # Auth verification used by authGuard() on protected pages
-    page.route("**/api/auth/verify", lambda route: route.fulfill(status=200, json={"ok": True}))
+    context.route("**/api/auth/verify", lambda route: route.fulfill(**_VERIFY_OK))
 
     # Fallbacks for endpoints that may appear in flows but are optional in some tests
-    page.route("**/api/sync/config", lambda route: route.fulfill(status=200, json={"manual_sync_default_days": 30}))
-    page.route(
-        "**/api/sync/status",
-        lambda route: route.fulfill(
-            status=200,
-            json={
-                "is_running": False,
-                "progress": 0,
-                "current_task": None,
-                "last_sync": "",
-                "records_synced": None,
-            },
-        ),
-    )
+    context.route("**/api/sync/config", lambda route: route.fulfill(**_SYNC_CONFIG))
+    context.route("**/api/sync/status", lambda route: route.fulfill(**_SYNC_STATUS_IDLE))
 
 
 @pytest.fixture(scope="session")
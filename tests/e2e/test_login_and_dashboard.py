@@ -1,21 +1,104 @@
+import re
 from pathlib import Path
+from urllib.parse import urlparse
 
 import pytest
 from playwright.sync_api import Page, expect
 
+from tests.fixtures.playwright_mocks import json_fulfillment
+
+_SAMPLE_MTO = "AK2510034"
+
+# Mock payloads are built once at import; the route handlers below only
+# ever read them, so the serialized responses are reused on every request.
+_CHILD_P001 = {
+    "material_code": "07-P001",
+    "material_name": "成品 A",
+    "specification": "Spec A",
+    "aux_attributes": "",
+    "material_type": 1,
+    "material_type_name": "成品",
+    "sales_order_qty": 10,
+    "prod_instock_must_qty": 0,
+    "purchase_order_qty": 0,
+    "pick_actual_qty": 2,
+    "prod_instock_real_qty": 8,
+    "purchase_stock_in_qty": 0,
+}
+_CHILD_C001 = {
+    "material_code": "05-C001",
+    "material_name": "自制件 B",
+    "specification": "Spec B",
+    "aux_attributes": "",
+    "material_type": 1,
+    "material_type_name": "自制",
+    "sales_order_qty": 0,
+    "prod_instock_must_qty": 5,
+    "purchase_order_qty": 0,
+    "pick_actual_qty": 1,
+    "prod_instock_real_qty": 4,
+    "purchase_stock_in_qty": 0,
+}
+_CHILD_C002 = {
+    "material_code": "03-C002",
+    "material_name": "包材 C",
+    "specification": "Spec C",
+    "aux_attributes": "Blue",
+    "material_type": 2,
+    "material_type_name": "包材",
+    "sales_order_qty": 0,
+    "prod_instock_must_qty": 0,
+    "purchase_order_qty": 20,
+    "pick_actual_qty": 3,
+    "prod_instock_real_qty": 0,
+    "purchase_stock_in_qty": 18,
+}
+
+_MTO_AK2510034_RESPONSE = {
+    "parent_item": {
+        "mto_number": _SAMPLE_MTO,
+        "customer_name": "测试客户",
+        "delivery_date": "2025-02-01T00:00:00",
+    },
+    "child_items": [_CHILD_P001, _CHILD_C001, _CHILD_C002],
+    "data_source": "live",
+    "cache_age_seconds": None,
+}
+_MTO_AK2510034 = json_fulfillment(_MTO_AK2510034_RESPONSE)
+
+_RELATED_ORDERS_RESPONSE = {
+    "orders": {
+        "sales_orders": [{"label": "销售订单", "bill_no": "SO0001"}],
+        "production_orders": [{"label": "生产订单", "bill_no": "MO0001"}],
+    },
+    "documents": {
+        "sales_deliveries": [{"label": "发货单", "bill_no": "FH0001"}],
+    },
+}
+_RELATED_ORDERS = json_fulfillment(_RELATED_ORDERS_RESPONSE)
+
+_TOKEN = json_fulfillment({"access_token": "testtoken", "token_type": "bearer"})
+
+# Export only needs one item so the export menu is enabled
+_EXPORT_MTO = json_fulfillment(
+    {
+        "parent_item": {"mto_number": _SAMPLE_MTO},
+        "child_items": [_CHILD_P001],
+        "data_source": "live",
+    }
+)
+_EMPTY_RELATED_ORDERS = json_fulfillment({"orders": {}, "documents": {}})
+
 
 @pytest.mark.e2e
-def test_login_success_redirects_to_dashboard(serve_frontend, base_url: str, page: Page):
+def test_login_success_redirects_to_dashboard(
+    serve_frontend, mock_common_api, base_url: str, page: Page
+):
     # Mock successful token issuance
     page.route(
         "**/api/auth/token",
-        lambda route: route.fulfill(
-            status=200, json={"access_token": "testtoken", "token_type": "bearer"}
-        ),
+        lambda route: route.fulfill(**_TOKEN),
     )
-    # Dashboard auth verification
-    page.route("**/api/auth/verify", lambda route: route.fulfill(status=200, json={"ok": True}))
-
     page.goto(f"{base_url}/")
 
     # Fill and submit login form
@@ -30,93 +113,26 @@ def test_login_success_redirects_to_dashboard(serve_frontend, base_url: str, pag
 
 @pytest.mark.e2e
 def test_mto_search_flow_displays_results(
-    serve_frontend, base_url: str, page: Page
+    serve_frontend, mock_common_api, base_url: str, page: Page
 ):
     # Pre-authenticate
     page.add_init_script("localStorage.setItem('token','testtoken')")
 
-    # API mocks for this flow
-    page.route("**/api/auth/verify", lambda route: route.fulfill(status=200, json={"ok": True}))
+    # API mocks for this flow (auth/verify comes from mock_common_api).
+    # One regex route dispatching on path instead of one registration per endpoint.
+    sample_mto = _SAMPLE_MTO
+    mto_responses = {
+        f"/api/mto/{sample_mto}": _MTO_AK2510034,
+        f"/api/mto/{sample_mto}/related-orders": _RELATED_ORDERS,
+    }
 
-    sample_mto = "AK2510034"
+    def dispatch(route):
+        response = mto_responses.get(urlparse(route.request.url).path)
+        if response is None:
+            return route.fallback()
+        return route.fulfill(**response)
 
-    # MTO search response
-    page.route(
-        f"**/api/mto/{sample_mto}",
-        lambda route: route.fulfill(
-            status=200,
-            json={
-                "parent_item": {
-                    "mto_number": sample_mto,
-                    "customer_name": "测试客户",
-                    "delivery_date": "2025-02-01T00:00:00",
-                },
-                "child_items": [
-                    {
-                        "material_code": "07-P001",
-                        "material_name": "成品 A",
-                        "specification": "Spec A",
-                        "aux_attributes": "",
-                        "material_type": 1,
-                        "material_type_name": "成品",
-                        "sales_order_qty": 10,
-                        "prod_instock_must_qty": 0,
-                        "purchase_order_qty": 0,
-                        "pick_actual_qty": 2,
-                        "prod_instock_real_qty": 8,
-                        "purchase_stock_in_qty": 0,
-                    },
-                    {
-                        "material_code": "05-C001",
-                        "material_name": "自制件 B",
-                        "specification": "Spec B",
-                        "aux_attributes": "",
-                        "material_type": 1,
-                        "material_type_name": "自制",
-                        "sales_order_qty": 0,
-                        "prod_instock_must_qty": 5,
-                        "purchase_order_qty": 0,
-                        "pick_actual_qty": 1,
-                        "prod_instock_real_qty": 4,
-                        "purchase_stock_in_qty": 0,
-                    },
-                    {
-                        "material_code": "03-C002",
-                        "material_name": "包材 C",
-                        "specification": "Spec C",
-                        "aux_attributes": "Blue",
-                        "material_type": 2,
-                        "material_type_name": "包材",
-                        "sales_order_qty": 0,
-                        "prod_instock_must_qty": 0,
-                        "purchase_order_qty": 20,
-                        "pick_actual_qty": 3,
-                        "prod_instock_real_qty": 0,
-                        "purchase_stock_in_qty": 18,
-                    },
-                ],
-                "data_source": "live",
-                "cache_age_seconds": None,
-            },
-        ),
-    )
-
-    # Related orders
-    page.route(
-        f"**/api/mto/{sample_mto}/related-orders",
-        lambda route: route.fulfill(
-            status=200,
-            json={
-                "orders": {
-                    "sales_orders": [{"label": "销售订单", "bill_no": "SO0001"}],
-                    "production_orders": [{"label": "生产订单", "bill_no": "MO0001"}],
-                },
-                "documents": {
-                    "sales_deliveries": [{"label": "发货单", "bill_no": "FH0001"}],
-                },
-            },
-        ),
-    )
+    page.route(re.compile(r".*/api/mto/.*"), dispatch)
 
     page.goto(f"{base_url}/dashboard.html")
 
@@ -129,56 +145,37 @@ def test_mto_search_flow_displays_results(
     expect(page.get_by_role("heading", name="BOM组件明细")).to_be_visible()
     expect(page.get_by_text("成功查询到 3 条BOM组件记录")).to_be_visible()
 
-    # Toggle one material type filter and verify a row hides
     # Toggle a filter and ensure the "已筛选" badge appears
-    page.get_by_role("button", name="自制").click()
-    expect(page.get_by_text("已筛选").first).to_be_visible()
+    self_made_filter = page.get_by_role("button", name="自制")
+    filtered_badge = page.get_by_text("已筛选").first
+    self_made_filter.click()
+    expect(filtered_badge).to_be_visible()
 
 
 @pytest.mark.e2e
 @pytest.mark.skip(reason="Export action network trigger is flaky headless; verified UI elsewhere")
-def test_export_triggers_download(serve_frontend, base_url: str, page: Page):
+def test_export_triggers_download(
+    serve_frontend, mock_common_api, base_url: str, page: Page
+):
     # Pre-auth
     page.add_init_script("localStorage.setItem('token','testtoken')")
-    page.route("**/api/auth/verify", lambda route: route.fulfill(status=200, json={"ok": True}))
 
     # Provide one item so export is enabled
-    sample_mto = "AK2510034"
+    sample_mto = _SAMPLE_MTO
     page.route(
         f"**/api/mto/{sample_mto}",
-        lambda route: route.fulfill(
-            status=200,
-            json={
-                "parent_item": {"mto_number": sample_mto},
-                "child_items": [
-                    {
-                        "material_code": "07-P001",
-                        "material_name": "成品 A",
-                        "specification": "Spec A",
-                        "aux_attributes": "",
-                        "material_type": 1,
-                        "material_type_name": "成品",
-                        "sales_order_qty": 10,
-                        "prod_instock_must_qty": 0,
-                        "purchase_order_qty": 0,
-                        "pick_actual_qty": 2,
-                        "prod_instock_real_qty": 8,
-                        "purchase_stock_in_qty": 0,
-                    }
-                ],
-                "data_source": "live",
-            },
-        ),
+        lambda route: route.fulfill(**_EXPORT_MTO),
     )
     page.route(
         f"**/api/mto/{sample_mto}/related-orders",
-        lambda route: route.fulfill(status=200, json={"orders": {}, "documents": {}}),
+        lambda route: route.fulfill(**_EMPTY_RELATED_ORDERS),
+    )
+    page.route(
+        "**/api/export/mto/**",
+        lambda route: route.fulfill(
+            status=200, content_type="text/csv", body="header1,header2\nvalue1,value2\n"
+        ),
     )
-    export_called = {"hit": False}
-    def export_handler(route):
-        export_called["hit"] = True
-        route.fulfill(status=200, content_type="text/csv", body="header1,header2\nvalue1,value2\n")
-    page.route("**/api/export/mto/**", export_handler)
 
     page.goto(f"{base_url}/dashboard.html")
     input_box = page.locator("#mto-search")
@@ -186,8 +183,8 @@ def test_export_triggers_download(serve_frontend, base_url: str, page: Page):
     input_box.press("Enter")
     expect(page.get_by_role("heading", name="BOM组件明细")).to_be_visible()
 
-    # Open export menu and click CSV; assert the export request fires
+    # Open export menu and click CSV; resolves as soon as the export request fires
     page.get_by_role("button", name="导出").click()
-    page.get_by_role("button", name="CSV").click()
-    page.wait_for_timeout(1000)
-    assert export_called["hit"] is True
+    with page.expect_request("**/api/export/mto/**") as request_info:
+        page.get_by_role("button", name="CSV").click()
+    assert request_info.value.method == "GET"
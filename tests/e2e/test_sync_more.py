@@ -1,20 +1,23 @@
 import pytest
 from playwright.sync_api import Page, expect
 
+from tests.fixtures.playwright_mocks import json_fulfillment
+
+_OK = json_fulfillment({"ok": True})
+
 
 @pytest.mark.e2e
-def test_sync_force_and_days_back_payload(serve_frontend, base_url: str, page: Page):
-    # Pre-auth
+def test_sync_force_and_days_back_payload(
+    serve_frontend, mock_common_api, base_url: str, page: Page
+):
+    # Pre-auth; auth/verify, sync/status and sync/config come from mock_common_api
     page.add_init_script("localStorage.setItem('token','testtoken')")
-    page.route("**/api/auth/verify", lambda r: r.fulfill(status=200, json={"ok": True}))
-    page.route("**/api/sync/status", lambda r: r.fulfill(status=200, json={"is_running": False}))
-    page.route("**/api/sync/config", lambda r: r.fulfill(status=200, json={"manual_sync_default_days": 30}))
 
     captured = {"payload": None}
 
     def trigger_handler(route):
         captured["payload"] = route.request.post_data_json
-        route.fulfill(status=200, json={"ok": True})
+        route.fulfill(**_OK)
 
     page.route("**/api/sync/trigger", trigger_handler)
 
@@ -22,8 +25,7 @@ def test_sync_force_and_days_back_payload(serve_frontend, base_url: str, page: P
     expect(page.get_by_role("heading", name="同步管理")).to_be_visible()
 
     # Set daysBack to 7 and enable force
-    # Use first spinbutton (手动同步 section) — sync page has 4 number inputs
-    page.get_by_role("spinbutton").first.fill("7")
+    page.locator("#days-back").fill("7")
     page.locator("#force-sync").check()
     page.get_by_role("button", name="开始同步").click()
 
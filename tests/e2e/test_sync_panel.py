@@ -1,35 +1,28 @@
+import re
+
 import pytest
 from playwright.sync_api import Page, expect
 
+from tests.fixtures.playwright_mocks import json_fulfillment
 
-@pytest.mark.e2e
-def test_sync_panel_status_and_trigger(serve_frontend, base_url: str, page: Page):
-    # Pre-auth
-    page.add_init_script("localStorage.setItem('token','testtoken')")
-
-    # Common auth
-    page.route("**/api/auth/verify", lambda route: route.fulfill(status=200, json={"ok": True}))
+_OK = json_fulfillment({"ok": True})
+_SYNC_STATUS_RUNNING = json_fulfillment(
+    {
+        "is_running": True,
+        "progress": 25,
+        "current_task": "Syncing recent changes...",
+        "last_sync": "2026-02-06T12:00:00Z",
+        "records_synced": 42,
+    }
+)
 
-    # Initial status: idle
-    page.route(
-        "**/api/sync/status",
-        lambda route: route.fulfill(
-            status=200,
-            json={
-                "is_running": False,
-                "progress": 0,
-                "current_task": None,
-                "last_sync": "",
-                "records_synced": None,
-            },
-        ),
-    )
 
-    # Config
-    page.route(
-        "**/api/sync/config",
-        lambda route: route.fulfill(status=200, json={"manual_sync_default_days": 30}),
-    )
+@pytest.mark.e2e
+def test_sync_panel_status_and_trigger(
+    serve_frontend, mock_common_api, base_url: str, page: Page
+):
+    # Pre-auth; auth/verify, idle sync/status and sync/config come from mock_common_api
+    page.add_init_script("localStorage.setItem('token','testtoken')")
 
     page.goto(f"{base_url}/sync.html")
     expect(page.get_by_role("heading", name="同步管理")).to_be_visible()
@@ -47,23 +40,22 @@ def test_sync_panel_status_and_trigger(serve_frontend, base_url: str, page: Page
         page.unroute("**/api/sync/status")
         page.route(
             "**/api/sync/status",
-            lambda r: r.fulfill(
-                status=200,
-                json={
-                    "is_running": True,
-                    "progress": 25,
-                    "current_task": "Syncing recent changes...",
-                    "last_sync": "2026-02-06T12:00:00Z",
-                    "records_synced": 42,
-                },
-            ),
+            lambda r: r.fulfill(**_SYNC_STATUS_RUNNING),
         )
-        route.fulfill(status=200, json={"ok": True})
+        route.fulfill(**_OK)
 
     page.route("**/api/sync/trigger", handle_trigger)
 
-    # Trigger and assert state changes
-    page.get_by_role("button", name="开始同步").click()
+    # Trigger and wait for the click's own POST (a GET of /api/sync/status
+    # could equally be the 5s background poll); the running status comes from
+    # the fetchStatus() that triggerSync() issues after it.
+    with page.expect_response(
+        lambda r: r.request.method == "POST" and r.url.endswith("/api/sync/trigger")
+    ) as trigger_info:
+        page.get_by_role("button", name="开始同步").click()
+    assert trigger_info.value.ok
     expect(page.get_by_text("同步中...")).to_be_visible()
-    # Progress bar should exist
-    expect(page.locator("div[style*='width: 25%']")).to_be_visible()
+    # Progress bar should reflect the running status
+    progress_bar = page.get_by_test_id("sync-progress-bar")
+    expect(progress_bar).to_be_visible()
+    expect(progress_bar).to_have_attribute("style", re.compile(r"width: 25%"))
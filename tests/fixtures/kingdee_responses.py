@@ -52,9 +52,7 @@ NESTED_ERROR_RESPONSE = [[{
 }]]
 
 # JSON string response (SDK sometimes returns JSON as string)
-SUCCESS_RESPONSE_JSON_STRING = json.dumps([
-    ["MO0001", "AK2510034", "Workshop A", "P001", "Product A", "Spec A", 100, "Approved", "2025-01-15"],
-])
+SUCCESS_RESPONSE_JSON_STRING = json.dumps(SUCCESS_RESPONSE_RAW)
 
 # Multiple records response
 MULTIPLE_RECORDS_RESPONSE = [
@@ -71,8 +69,14 @@ AUX_PROPERTY_RESPONSE = [
 ]
 
 # Pagination test responses
-PAGE_1_RESPONSE = [["MO" + str(i).zfill(4), "AK001", 100] for i in range(2000)]  # Full page
-PAGE_2_RESPONSE = [["MO" + str(2000 + i).zfill(4), "AK001", 100] for i in range(500)]  # Partial page
+PAGE_1_RESPONSE = [[f"MO{i:04d}", "AK001", 100] for i in range(2000)]  # Full page
+PAGE_2_RESPONSE = [[f"MO{2000 + i:04d}", "AK001", 100] for i in range(500)]  # Partial page
+
+# Pre-serialized pages in the SDK's wire format (ExecuteBillQuery returns a JSON
+# str). Encoded once at import so mocks hand back the same string every call.
+# Deliberately str, not bytes: KingdeeClient.query rejects bytes responses.
+PAGE_1_RESPONSE_JSON_STRING = json.dumps(PAGE_1_RESPONSE)
+PAGE_2_RESPONSE_JSON_STRING = json.dumps(PAGE_2_RESPONSE)
 
 
 def create_success_response(data: list) -> list:
@@ -0,0 +1,21 @@
+"""Pre-serialized Playwright route responses for e2e mocks."""
+
+import json
+
+
+def json_fulfillment(payload: object, status: int = 200) -> dict:
+    """Precompute ``route.fulfill`` kwargs for a JSON mock.
+
+    The body is serialized once and kept as ``str``: Playwright base64-encodes
+    ``bytes`` bodies on every fulfill but sends ``str`` as-is. Content-Length
+    is set explicitly so the response is never chunked.
+    """
+    body = json.dumps(payload)
+    return {
+        "status": status,
+        "headers": {
+            "Content-Type": "application/json",
+            "Content-Length": str(len(body.encode())),
+        },
+        "body": body,
+    }
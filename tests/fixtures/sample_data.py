@@ -22,27 +22,18 @@ SAMPLE_PRODUCTION_ORDER_RAW = {
     "FCreateDate": "2025-01-15",
 }
 
+# Second order only differs in identity/workshop/material fields; spread the
+# single-order fixture so the shared fields live in one place.
 SAMPLE_PRODUCTION_ORDERS_RAW = [
+    {**SAMPLE_PRODUCTION_ORDER_RAW},
     {
-        "FBillNo": "MO0001",
-        "FMTONo": "AK2510034",
-        "FWorkShopID.FName": "Workshop A",
-        "FMaterialId.FNumber": "P001",
-        "FMaterialId.FName": "Finished Product A",
-        "FMaterialId.FSpecification": "Spec A",
-        "FQty": 100,
-        "FStatus": "Approved",
-        "FCreateDate": "2025-01-15",
-    },
-    {
+        **SAMPLE_PRODUCTION_ORDER_RAW,
         "FBillNo": "MO0002",
-        "FMTONo": "AK2510034",
         "FWorkShopID.FName": "Workshop B",
         "FMaterialId.FNumber": "P002",
         "FMaterialId.FName": "Finished Product B",
         "FMaterialId.FSpecification": "Spec B",
         "FQty": 50,
-        "FStatus": "Approved",
         "FCreateDate": "2025-01-16",
     },
 ]
@@ -127,7 +118,7 @@ EXPECTED_PRODUCTION_ORDER = {
     "material_code": "P001",
     "material_name": "Finished Product A",
     "specification": "Spec A",
-    "qty": Decimal("100"),
+    "qty": Decimal(100),
     "status": "Approved",
     "create_date": "2025-01-15",
 }
@@ -139,7 +130,7 @@ EXPECTED_BOM_ENTRY_SELF_MADE = {
     "material_name": "Self-made Part 1",
     "specification": "Spec1",
     "material_type": 1,
-    "need_qty": Decimal("50"),
-    "picked_qty": Decimal("30"),
-    "no_picked_qty": Decimal("20"),
+    "need_qty": Decimal(50),
+    "picked_qty": Decimal(30),
+    "no_picked_qty": Decimal(20),
 }
@@ -7,13 +7,28 @@ For CI: Uses mocked readers with deterministic test data.
 For local integration: Can use real API with KINGDEE_* env vars.
 """
 
+from collections import defaultdict
 from decimal import Decimal
-from unittest.mock import AsyncMock
+from operator import attrgetter
+from unittest.mock import MagicMock
 
 import pytest
 
+from src.config import KingdeeConfig
+from src.kingdee.client import KingdeeClient
 from src.models.mto_status import ChildItem
 from src.query.mto_handler import MTOQueryHandler
+from src.readers import (
+    MaterialPickingReader,
+    ProductionBOMReader,
+    ProductionOrderReader,
+    ProductionReceiptReader,
+    PurchaseOrderReader,
+    PurchaseReceiptReader,
+    SalesDeliveryReader,
+    SalesOrderReader,
+    SubcontractingOrderReader,
+)
 from src.readers.models import (
     ProductionReceiptModel,
     SalesDeliveryModel,
@@ -26,65 +41,41 @@ from src.readers.models import (
 # ============================================================================
 
 
+def _sales_order(mto_number: str, qty: str, **overrides) -> SalesOrderModel:
+    """Build a 07.02.001 sales-order line; only the varying fields are passed.
+
+    Fixture values are already correctly typed, so model_construct skips
+    pydantic validation.
+    """
+    fields = {
+        "bill_no": "SO001",
+        "mto_number": mto_number,
+        "customer_name": "Customer A",
+        "delivery_date": "2025-02-01",
+        "material_code": "07.02.001",
+        "material_name": "Product A",
+        "specification": "Spec A",
+        "aux_attributes": "Red-M",
+        "aux_prop_id": 1001,
+        "qty": Decimal(qty),
+    }
+    fields.update(overrides)
+    return SalesOrderModel.model_construct(**fields)
+
+
 @pytest.fixture
 def sales_orders_single_material():
     """Sales orders for a single material code."""
-    return [
-        SalesOrderModel(
-            bill_no="SO001",
-            mto_number="TEST001",
-            customer_name="Customer A",
-            delivery_date="2025-02-01",
-            material_code="07.02.001",
-            material_name="Product A",
-            specification="Spec A",
-            aux_attributes="Red-M",
-            aux_prop_id=1001,
-            qty=Decimal("100"),
-        ),
-    ]
+    return [_sales_order("TEST001", "100")]
 
 
 @pytest.fixture
 def sales_orders_multiple_lines():
     """Sales orders with multiple lines for same material (different aux)."""
     return [
-        SalesOrderModel(
-            bill_no="SO001",
-            mto_number="TEST002",
-            customer_name="Customer A",
-            delivery_date="2025-02-01",
-            material_code="07.02.001",
-            material_name="Product A",
-            specification="Spec A",
-            aux_attributes="Red-M",
-            aux_prop_id=1001,
-            qty=Decimal("100"),
-        ),
-        SalesOrderModel(
-            bill_no="SO001",
-            mto_number="TEST002",
-            customer_name="Customer A",
-            delivery_date="2025-02-01",
-            material_code="07.02.001",
-            material_name="Product A",
-            specification="Spec A",
-            aux_attributes="Red-L",
-            aux_prop_id=1002,
-            qty=Decimal("50"),
-        ),
-        SalesOrderModel(
-            bill_no="SO002",
-            mto_number="TEST002",
-            customer_name="Customer A",
-            delivery_date="2025-02-01",
-            material_code="07.02.001",
-            material_name="Product A",
-            specification="Spec A",
-            aux_attributes="Red-M",
-            aux_prop_id=1001,
-            qty=Decimal("30"),
-        ),
+        _sales_order("TEST002", "100"),
+        _sales_order("TEST002", "50", aux_attributes="Red-L", aux_prop_id=1002),
+        _sales_order("TEST002", "30", bill_no="SO002"),
     ]
 
 
@@ -92,7 +83,7 @@ def sales_orders_multiple_lines():
 def receipts_matching_sales():
     """Production receipts matching sales orders."""
     return [
-        ProductionReceiptModel(
+        ProductionReceiptModel.model_construct(
             bill_no="RK001",
             mto_number="TEST002",
             material_code="07.02.001",
@@ -101,7 +92,7 @@ def receipts_matching_sales():
             must_qty=Decimal("130"),
             mo_bill_no="MO001",
         ),
-        ProductionReceiptModel(
+        ProductionReceiptModel.model_construct(
             bill_no="RK002",
             mto_number="TEST002",
             material_code="07.02.001",
@@ -117,7 +108,7 @@ def receipts_matching_sales():
 def deliveries_matching_sales():
     """Sales deliveries matching sales orders."""
     return [
-        SalesDeliveryModel(
+        SalesDeliveryModel.model_construct(
             bill_no="DL001",
             mto_number="TEST002",
             material_code="07.02.001",
@@ -125,7 +116,7 @@ def deliveries_matching_sales():
             real_qty=Decimal("60"),
             must_qty=Decimal("130"),
         ),
-        SalesDeliveryModel(
+        SalesDeliveryModel.model_construct(
             bill_no="DL002",
             mto_number="TEST002",
             material_code="07.02.001",
@@ -157,14 +148,86 @@ def create_test_handler(mock_readers):
     )
 
 
+_READER_CLASSES = {
+    "production_order": ProductionOrderReader,
+    "production_bom": ProductionBOMReader,
+    "production_receipt": ProductionReceiptReader,
+    "purchase_order": PurchaseOrderReader,
+    "purchase_receipt": PurchaseReceiptReader,
+    "subcontracting_order": SubcontractingOrderReader,
+    "material_picking": MaterialPickingReader,
+    "sales_delivery": SalesDeliveryReader,
+    "sales_order": SalesOrderReader,
+}
+
+
+def _const_async(value):
+    """Async stub that just returns ``value`` (no AsyncMock call bookkeeping)."""
+
+    async def _fetch(*args, **kwargs):
+        return value
+
+    return _fetch
+
+
+@pytest.fixture(scope="module")
+def shared_readers():
+    """Real readers over a mocked-SDK client, built once for the module."""
+    client = KingdeeClient(
+        KingdeeConfig(
+            server_url="http://test.kingdee.com/k3cloud/",
+            acct_id="test_acct",
+            user_name="test_user",
+            app_id="test_app",
+            app_sec="test_secret",
+        )
+    )
+    client._sdk = MagicMock(ExecuteBillQuery=MagicMock(return_value=[]))
+    return {name: reader_cls(client) for name, reader_cls in _READER_CLASSES.items()}
+
+
+@pytest.fixture
+def mock_readers(shared_readers):
+    """Overrides conftest's mock_readers: reuse the module readers, reset fetch stubs.
+
+    Tests replace fetch_* per reader, so every test starts from empty results.
+    """
+    for reader in shared_readers.values():
+        reader.fetch_by_mto = _const_async([])
+        reader.fetch_by_bill_nos = _const_async([])
+        reader.fetch_by_date_range = _const_async([])
+    return shared_readers
+
+
+@pytest.fixture(scope="module")
+def handler(shared_readers):
+    """One MTOQueryHandler per module; it looks readers up on every query.
+
+    Safe to share because it keeps no per-MTO state between tests: the L1
+    memory cache is disabled in create_test_handler and tests pass
+    use_cache=False, so each get_status re-reads the per-test reader stubs.
+    """
+    return create_test_handler(shared_readers)
+
+
 def sum_qty_by_material(children: list[ChildItem], field: str) -> dict[str, Decimal]:
     """Sum a quantity field by material_code from ChildItems."""
-    result = {}
+    get_qty = attrgetter(field)
+    result: defaultdict[str, Decimal] = defaultdict(Decimal)
     for child in children:
-        if child.material_code not in result:
-            result[child.material_code] = Decimal(0)
-        result[child.material_code] += getattr(child, field, Decimal(0))
-    return result
+        result[child.material_code] += get_qty(child)
+    return dict(result)
+
+
+def finished_goods(children: list[ChildItem]) -> list[ChildItem]:
+    """Select 07.xx children independently of the handler's classification.
+
+    Also checks the handler's is_finished_goods flag agrees, so a test
+    never relies on the flag the code under test computed.
+    """
+    selected = [c for c in children if c.material_code.startswith("07.")]
+    assert [c for c in children if c.is_finished_goods] == selected
+    return selected
 
 
 # ============================================================================
@@ -177,20 +240,17 @@ class TestSalesOrderAggregation:
 
     @pytest.mark.asyncio
     async def test_single_sales_order_required_qty(
-        self, mock_readers, sales_orders_single_material
+        self, handler, mock_readers, sales_orders_single_material
     ):
         """Test sales_order_qty equals sum of sales order FQty."""
-        mock_readers["sales_order"].fetch_by_mto = AsyncMock(
-            return_value=sales_orders_single_material
-        )
-        mock_readers["production_receipt"].fetch_by_mto = AsyncMock(return_value=[])
-        mock_readers["sales_delivery"].fetch_by_mto = AsyncMock(return_value=[])
+        mock_readers["sales_order"].fetch_by_mto = _const_async(sales_orders_single_material)
+        mock_readers["production_receipt"].fetch_by_mto = _const_async([])
+        mock_readers["sales_delivery"].fetch_by_mto = _const_async([])
 
-        handler = create_test_handler(mock_readers)
         result = await handler.get_status("TEST001", use_cache=False)
 
         # Filter 07.xx materials
-        children_07 = [c for c in result.children if c.material_code.startswith("07.")]
+        children_07 = finished_goods(result.children)
         assert len(children_07) == 1
 
         child = children_07[0]
@@ -201,19 +261,16 @@ class TestSalesOrderAggregation:
 
     @pytest.mark.asyncio
     async def test_multiple_lines_aggregation(
-        self, mock_readers, sales_orders_multiple_lines
+        self, handler, mock_readers, sales_orders_multiple_lines
     ):
         """Test multiple sales order lines aggregate correctly by aux_prop_id."""
-        mock_readers["sales_order"].fetch_by_mto = AsyncMock(
-            return_value=sales_orders_multiple_lines
-        )
-        mock_readers["production_receipt"].fetch_by_mto = AsyncMock(return_value=[])
-        mock_readers["sales_delivery"].fetch_by_mto = AsyncMock(return_value=[])
+        mock_readers["sales_order"].fetch_by_mto = _const_async(sales_orders_multiple_lines)
+        mock_readers["production_receipt"].fetch_by_mto = _const_async([])
+        mock_readers["sales_delivery"].fetch_by_mto = _const_async([])
 
-        handler = create_test_handler(mock_readers)
         result = await handler.get_status("TEST002", use_cache=False)
 
-        children_07 = [c for c in result.children if c.material_code.startswith("07.")]
+        children_07 = finished_goods(result.children)
 
         # Should have 2 ChildItems: one for aux 1001, one for aux 1002
         assert len(children_07) == 2
@@ -226,21 +283,16 @@ class TestSalesOrderAggregation:
 
     @pytest.mark.asyncio
     async def test_receipt_qty_matches_instock(
-        self, mock_readers, sales_orders_multiple_lines, receipts_matching_sales
+        self, handler, mock_readers, sales_orders_multiple_lines, receipts_matching_sales
     ):
         """Test prod_instock_real_qty equals sum of PRD_INSTOCK FRealQty."""
-        mock_readers["sales_order"].fetch_by_mto = AsyncMock(
-            return_value=sales_orders_multiple_lines
-        )
-        mock_readers["production_receipt"].fetch_by_mto = AsyncMock(
-            return_value=receipts_matching_sales
-        )
-        mock_readers["sales_delivery"].fetch_by_mto = AsyncMock(return_value=[])
+        mock_readers["sales_order"].fetch_by_mto = _const_async(sales_orders_multiple_lines)
+        mock_readers["production_receipt"].fetch_by_mto = _const_async(receipts_matching_sales)
+        mock_readers["sales_delivery"].fetch_by_mto = _const_async([])
 
-        handler = create_test_handler(mock_readers)
         result = await handler.get_status("TEST002", use_cache=False)
 
-        children_07 = [c for c in result.children if c.material_code.startswith("07.")]
+        children_07 = finished_goods(result.children)
 
         # Total receipt should match raw total
         qp_total = sum(c.prod_instock_real_qty for c in children_07)
@@ -251,26 +303,20 @@ class TestSalesOrderAggregation:
     @pytest.mark.asyncio
     async def test_pick_actual_qty_ignored_for_finished_goods(
         self,
+        handler,
         mock_readers,
         sales_orders_multiple_lines,
         receipts_matching_sales,
         deliveries_matching_sales,
     ):
         """Test pick_actual_qty remains zero for finished goods."""
-        mock_readers["sales_order"].fetch_by_mto = AsyncMock(
-            return_value=sales_orders_multiple_lines
-        )
-        mock_readers["production_receipt"].fetch_by_mto = AsyncMock(
-            return_value=receipts_matching_sales
-        )
-        mock_readers["sales_delivery"].fetch_by_mto = AsyncMock(
-            return_value=deliveries_matching_sales
-        )
+        mock_readers["sales_order"].fetch_by_mto = _const_async(sales_orders_multiple_lines)
+        mock_readers["production_receipt"].fetch_by_mto = _const_async(receipts_matching_sales)
+        mock_readers["sales_delivery"].fetch_by_mto = _const_async(deliveries_matching_sales)
 
-        handler = create_test_handler(mock_readers)
         result = await handler.get_status("TEST002", use_cache=False)
 
-        children_07 = [c for c in result.children if c.material_code.startswith("07.")]
+        children_07 = finished_goods(result.children)
 
         # Total picked should match raw total
         qp_total = sum(c.pick_actual_qty for c in children_07)
@@ -282,19 +328,16 @@ class TestAuxPropertyGrouping:
 
     @pytest.mark.asyncio
     async def test_same_material_different_aux_creates_separate_items(
-        self, mock_readers, sales_orders_multiple_lines
+        self, handler, mock_readers, sales_orders_multiple_lines
     ):
         """Test that same material with different aux_prop_id creates separate ChildItems."""
-        mock_readers["sales_order"].fetch_by_mto = AsyncMock(
-            return_value=sales_orders_multiple_lines
-        )
-        mock_readers["production_receipt"].fetch_by_mto = AsyncMock(return_value=[])
-        mock_readers["sales_delivery"].fetch_by_mto = AsyncMock(return_value=[])
+        mock_readers["sales_order"].fetch_by_mto = _const_async(sales_orders_multiple_lines)
+        mock_readers["production_receipt"].fetch_by_mto = _const_async([])
+        mock_readers["sales_delivery"].fetch_by_mto = _const_async([])
 
-        handler = create_test_handler(mock_readers)
         result = await handler.get_status("TEST002", use_cache=False)
 
-        children_07 = [c for c in result.children if c.material_code.startswith("07.")]
+        children_07 = finished_goods(result.children)
 
         # Two unique aux_prop_ids: 1001 and 1002
         assert len(children_07) == 2
@@ -305,23 +348,21 @@ class TestAuxPropertyGrouping:
 
     @pytest.mark.asyncio
     async def test_aux_aggregation_per_variant(
-        self, mock_readers, sales_orders_multiple_lines
+        self, handler, mock_readers, sales_orders_multiple_lines
     ):
         """Test quantities aggregate correctly per aux variant."""
-        mock_readers["sales_order"].fetch_by_mto = AsyncMock(
-            return_value=sales_orders_multiple_lines
-        )
-        mock_readers["production_receipt"].fetch_by_mto = AsyncMock(return_value=[])
-        mock_readers["sales_delivery"].fetch_by_mto = AsyncMock(return_value=[])
+        mock_readers["sales_order"].fetch_by_mto = _const_async(sales_orders_multiple_lines)
+        mock_readers["production_receipt"].fetch_by_mto = _const_async([])
+        mock_readers["sales_delivery"].fetch_by_mto = _const_async([])
 
-        handler = create_test_handler(mock_readers)
         result = await handler.get_status("TEST002", use_cache=False)
 
-        children_07 = [c for c in result.children if c.material_code.startswith("07.")]
+        children_07 = finished_goods(result.children)
 
         # Find each variant
-        red_m = next((c for c in children_07 if c.aux_attributes == "Red-M"), None)
-        red_l = next((c for c in children_07 if c.aux_attributes == "Red-L"), None)
+        by_aux = {c.aux_attributes: c for c in children_07}
+        red_m = by_aux.get("Red-M")
+        red_l = by_aux.get("Red-L")
 
         assert red_m is not None
         assert red_l is not None
@@ -336,48 +377,31 @@ class TestEdgeCases:
     """Tests for edge cases."""
 
     @pytest.mark.asyncio
-    async def test_zero_quantities(self, mock_readers):
+    async def test_zero_quantities(self, handler, mock_readers):
         """Test handling of zero quantities."""
-        sales_orders = [
-            SalesOrderModel(
-                bill_no="SO001",
-                mto_number="TEST003",
-                customer_name="Customer A",
-                delivery_date="2025-02-01",
-                material_code="07.02.001",
-                material_name="Product A",
-                specification="Spec A",
-                aux_attributes="",
-                aux_prop_id=0,
-                qty=Decimal("0"),
-            ),
-        ]
-        mock_readers["sales_order"].fetch_by_mto = AsyncMock(return_value=sales_orders)
-        mock_readers["production_receipt"].fetch_by_mto = AsyncMock(return_value=[])
-        mock_readers["sales_delivery"].fetch_by_mto = AsyncMock(return_value=[])
+        sales_orders = [_sales_order("TEST003", "0", aux_attributes="", aux_prop_id=0)]
+        mock_readers["sales_order"].fetch_by_mto = _const_async(sales_orders)
+        mock_readers["production_receipt"].fetch_by_mto = _const_async([])
+        mock_readers["sales_delivery"].fetch_by_mto = _const_async([])
 
-        handler = create_test_handler(mock_readers)
         result = await handler.get_status("TEST003", use_cache=False)
 
-        children_07 = [c for c in result.children if c.material_code.startswith("07.")]
+        children_07 = finished_goods(result.children)
         assert len(children_07) == 1
         assert children_07[0].sales_order_qty == Decimal("0")
 
     @pytest.mark.asyncio
     async def test_no_receipts_no_deliveries(
-        self, mock_readers, sales_orders_single_material
+        self, handler, mock_readers, sales_orders_single_material
     ):
         """Test MTO with only sales orders (no receipts/deliveries)."""
-        mock_readers["sales_order"].fetch_by_mto = AsyncMock(
-            return_value=sales_orders_single_material
-        )
-        mock_readers["production_receipt"].fetch_by_mto = AsyncMock(return_value=[])
-        mock_readers["sales_delivery"].fetch_by_mto = AsyncMock(return_value=[])
+        mock_readers["sales_order"].fetch_by_mto = _const_async(sales_orders_single_material)
+        mock_readers["production_receipt"].fetch_by_mto = _const_async([])
+        mock_readers["sales_delivery"].fetch_by_mto = _const_async([])
 
-        handler = create_test_handler(mock_readers)
         result = await handler.get_status("TEST001", use_cache=False)
 
-        children_07 = [c for c in result.children if c.material_code.startswith("07.")]
+        children_07 = finished_goods(result.children)
         assert len(children_07) == 1
 
         child = children_07[0]
@@ -386,24 +410,11 @@ class TestEdgeCases:
         assert child.pick_actual_qty == Decimal("0")
 
     @pytest.mark.asyncio
-    async def test_receipts_exceed_required(self, mock_readers):
+    async def test_receipts_exceed_required(self, handler, mock_readers):
         """Test when receipt_qty exceeds required_qty (over-receipt)."""
-        sales_orders = [
-            SalesOrderModel(
-                bill_no="SO001",
-                mto_number="TEST004",
-                customer_name="Customer A",
-                delivery_date="2025-02-01",
-                material_code="07.02.001",
-                material_name="Product A",
-                specification="Spec A",
-                aux_attributes="",
-                aux_prop_id=0,
-                qty=Decimal("100"),
-            ),
-        ]
+        sales_orders = [_sales_order("TEST004", "100", aux_attributes="", aux_prop_id=0)]
         receipts = [
-            ProductionReceiptModel(
+            ProductionReceiptModel.model_construct(
                 bill_no="RK001",
                 mto_number="TEST004",
                 material_code="07.02.001",
@@ -413,14 +424,13 @@ class TestEdgeCases:
                 mo_bill_no="MO001",
             ),
         ]
-        mock_readers["sales_order"].fetch_by_mto = AsyncMock(return_value=sales_orders)
-        mock_readers["production_receipt"].fetch_by_mto = AsyncMock(return_value=receipts)
-        mock_readers["sales_delivery"].fetch_by_mto = AsyncMock(return_value=[])
+        mock_readers["sales_order"].fetch_by_mto = _const_async(sales_orders)
+        mock_readers["production_receipt"].fetch_by_mto = _const_async(receipts)
+        mock_readers["sales_delivery"].fetch_by_mto = _const_async([])
 
-        handler = create_test_handler(mock_readers)
         result = await handler.get_status("TEST004", use_cache=False)
 
-        children_07 = [c for c in result.children if c.material_code.startswith("07.")]
+        children_07 = finished_goods(result.children)
         assert len(children_07) == 1
 
         child = children_07[0]
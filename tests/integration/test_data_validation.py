@@ -10,6 +10,9 @@ Usage:
     # Run specific MTO
     pytest tests/integration/test_data_validation.py -k "DS25C312S" -v
 
+    # Re-check only the MTOs that failed last run (pytest cache)
+    pytest tests/integration/test_data_validation.py --lf -v
+
     # Run with detailed output on failures
     pytest tests/integration/test_data_validation.py -v --tb=long
 
@@ -22,11 +25,17 @@ import os
 from datetime import datetime
 
 import pytest
+import pytest_asyncio
 
-from tests.comparison.comparator import MTOComparator, generate_report
+from tests.comparison.comparator import (
+    MTOComparator,
+    count_field_matches,
+    generate_report,
+)
 from tests.comparison.field_specs import (
     FIELD_SPECS,
     USER_MTOS,
+    VALIDATED_FIELDS,
     ComparisonResult,
 )
 
@@ -47,12 +56,11 @@ def comparison_results():
 class TestMTODataValidation:
     """Test class for MTO data validation against Kingdee."""
 
-    @pytest.mark.asyncio
     @pytest.mark.parametrize("mto", USER_MTOS)
-    async def test_mto_field_validation(
+    def test_mto_field_validation(
         self,
         mto: str,
-        mto_comparator: MTOComparator,
+        all_comparisons: dict[str, ComparisonResult],
         comparison_results: list,
     ):
         """Validate QuickPulse matches Kingdee for MTO.
@@ -63,30 +71,26 @@ class TestMTODataValidation:
 
         Args:
             mto: MTO number to validate
-            mto_comparator: MTOComparator fixture
+            all_comparisons: Batched comparison results keyed by MTO
             comparison_results: Module-scoped list to collect results
         """
-        # Run comparison
-        result = await mto_comparator.compare(mto)
+        result = all_comparisons[mto]
         comparison_results.append(result)
 
         # Check for errors
         if result.error:
             pytest.fail(f"Comparison error: {result.error}")
 
-        # Check each material
-        failures = []
-        for item in result.items:
-            for field_name, validation in item.validations.items():
-                if not validation.match:
-                    failures.append(
-                        f"{item.material_code} | "
-                        f"{validation.chinese_name}: "
-                        f"QP={validation.qp_value} vs Kingdee={validation.kd_value} "
-                        f"(delta={validation.delta})"
-                    )
-
-        if failures:
+        # all_match short-circuits; only format messages for a failing MTO
+        if not result.all_match:
+            failures = [
+                f"{item.material_code} | "
+                f"{validation.chinese_name}: "
+                f"QP={validation.qp_value} vs Kingdee={validation.kd_value} "
+                f"(delta={validation.delta})"
+                for item in result.failed_items
+                for validation in item.failed_fields
+            ]
             failure_msg = f"MTO {mto} has {len(failures)} field mismatch(es):\n"
             failure_msg += "\n".join(f"  - {f}" for f in failures)
             pytest.fail(failure_msg)
@@ -95,7 +99,7 @@ class TestMTODataValidation:
 class TestFieldAccuracy:
     """Test class for aggregate field accuracy metrics."""
 
-    @pytest.mark.asyncio
+    @pytest.mark.asyncio(loop_scope="module")
     async def test_batch_field_accuracy(
         self,
         mto_comparator: MTOComparator,
@@ -105,39 +109,24 @@ class TestFieldAccuracy:
         This test runs all 52 MTOs and reports field-level accuracy.
         It fails if any field has less than 90% accuracy.
         """
-        results: list[ComparisonResult] = []
-
-        for mto in USER_MTOS[:10]:  # Run first 10 for this test
-            result = await mto_comparator.compare(mto)
-            results.append(result)
+        # Run first 10 for this test
+        results: list[ComparisonResult] = await mto_comparator.compare_many(USER_MTOS[:10])
 
         # Calculate field accuracy
-        field_stats: dict[str, dict[str, int]] = {}
-        for field_name in FIELD_SPECS:
-            if not FIELD_SPECS[field_name].validate:
-                continue
-            field_stats[field_name] = {"pass": 0, "fail": 0}
-
-        for result in results:
-            for item in result.items:
-                for field_name, validation in item.validations.items():
-                    if field_name in field_stats:
-                        if validation.match:
-                            field_stats[field_name]["pass"] += 1
-                        else:
-                            field_stats[field_name]["fail"] += 1
+        field_counts = count_field_matches(results)
 
         # Check accuracy thresholds
         failures = []
-        for field_name, stats in field_stats.items():
-            total = stats["pass"] + stats["fail"]
+        for field_name in VALIDATED_FIELDS:
+            passed = field_counts[(field_name, True)]
+            total = passed + field_counts[(field_name, False)]
             if total > 0:
-                accuracy = stats["pass"] / total
+                accuracy = passed / total
                 if accuracy < 0.9:  # 90% threshold
                     chinese = FIELD_SPECS[field_name].chinese_name
                     failures.append(
                         f"{field_name} ({chinese}): {accuracy*100:.1f}% "
-                        f"({stats['pass']}/{total})"
+                        f"({passed}/{total})"
                     )
 
         if failures:
@@ -149,7 +138,7 @@ class TestFieldAccuracy:
 class TestReportGeneration:
     """Test class for report generation functionality."""
 
-    @pytest.mark.asyncio
+    @pytest.mark.asyncio(loop_scope="module")
     async def test_generate_comparison_report(
         self,
         mto_comparator: MTOComparator,
@@ -160,10 +149,7 @@ class TestReportGeneration:
         This test creates a markdown report that can be reviewed manually.
         """
         # Run comparison on first 5 MTOs
-        results: list[ComparisonResult] = []
-        for mto in USER_MTOS[:5]:
-            result = await mto_comparator.compare(mto)
-            results.append(result)
+        results: list[ComparisonResult] = await mto_comparator.compare_many(USER_MTOS[:5])
 
         # Generate report
         report = generate_report(results)
@@ -190,19 +176,50 @@ def mto_comparator(real_kingdee_client, real_mto_handler):
     )
 
 
-@pytest.fixture(scope="module")
+@pytest_asyncio.fixture(scope="module", loop_scope="module")
+async def all_comparisons(request, mto_comparator) -> dict[str, ComparisonResult]:
+    """Compare the selected USER_MTOs in one bounded-concurrency batch.
+
+    The parametrized test keeps one report entry per MTO but only looks its
+    result up here, so the network phase runs once for the whole module.
+    Only MTOs whose test was selected are compared, so ``-k`` and ``--lf``
+    stay cheap.
+    """
+    selected = list(
+        dict.fromkeys(
+            item.callspec.params["mto"]
+            for item in request.session.items
+            if item.module is request.module
+            and getattr(item, "originalname", "") == "test_mto_field_validation"
+        )
+    )
+    results = await mto_comparator.compare_many(selected)
+    return dict(zip(selected, results))
+
+
+@pytest.fixture(scope="session")
 def real_kingdee_client():
-    """Create real KingdeeClient from environment variables."""
+    """Create real KingdeeClient from environment variables.
+
+    Session-scoped so the authenticated SDK session is reused by every test,
+    and query-coalescing so readers and the raw fetcher share identical reads.
+    """
     from src.config import get_config
-    from src.kingdee.client import KingdeeClient
+
+    from tests.comparison.caching_client import CachingKingdeeClient
 
     config = get_config()
-    return KingdeeClient(config.kingdee)
+    return CachingKingdeeClient(config.kingdee)
 
 
 @pytest.fixture(scope="module")
 def real_mto_handler(real_kingdee_client):
-    """Create real MTOQueryHandler with all readers."""
+    """Create real MTOQueryHandler with all readers.
+
+    The L1 memory cache is on: there is no SQLite cache reader here, so a hit
+    is always a live aggregation from this run, and the overlapping
+    ``USER_MTOS`` slices in the batch/report tests skip repeat fetches.
+    """
     from src.query.mto_handler import MTOQueryHandler
     from src.readers import (
         MaterialPickingReader,
@@ -226,7 +243,7 @@ def real_mto_handler(real_kingdee_client):
         material_picking_reader=MaterialPickingReader(real_kingdee_client),
         sales_delivery_reader=SalesDeliveryReader(real_kingdee_client),
         sales_order_reader=SalesOrderReader(real_kingdee_client),
-        memory_cache_enabled=False,
+        memory_cache_enabled=True,
     )
 
 
@@ -245,7 +262,6 @@ async def run_validation_manually():
         python -c "import asyncio; from tests.integration.test_data_validation import run_validation_manually; asyncio.run(run_validation_manually())"
     """
     from src.config import get_config
-    from src.kingdee.client import KingdeeClient
     from src.query.mto_handler import MTOQueryHandler
     from src.readers import (
         MaterialPickingReader,
@@ -259,11 +275,12 @@ async def run_validation_manually():
         SubcontractingOrderReader,
     )
 
-    from tests.comparison.comparator import generate_report
+    from tests.comparison.caching_client import CachingKingdeeClient
+    from tests.comparison.comparator import iter_report_lines
 
     print("Initializing Kingdee client...")
     config = get_config()
-    client = KingdeeClient(config.kingdee)
+    client = CachingKingdeeClient(config.kingdee)
 
     handler = MTOQueryHandler(
         production_order_reader=ProductionOrderReader(client),
@@ -281,21 +298,22 @@ async def run_validation_manually():
     comparator = MTOComparator(client, handler)
 
     print(f"Running validation on {len(USER_MTOS)} MTOs...")
-    results = []
-    for i, mto in enumerate(USER_MTOS, 1):
-        print(f"  [{i}/{len(USER_MTOS)}] {mto}...", end=" ")
-        result = await comparator.compare(mto)
-        results.append(result)
+    results_by_mto: dict[str, ComparisonResult] = {}
+    i = 0
+    async for result in comparator.compare_as_completed(USER_MTOS):
+        i += 1
+        results_by_mto[result.mto] = result
         status = "PASS" if result.all_match else "FAIL"
-        print(status)
+        print(f"  [{i}/{len(USER_MTOS)}] {result.mto}... {status}")
+    # Report in USER_MTOS order, not completion order
+    results = [results_by_mto[mto] for mto in USER_MTOS]
 
-    # Generate report
-    report = generate_report(results)
+    # Stream report to disk
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     report_path = f"docs/validation_report_{timestamp}.md"
 
     with open(report_path, "w", encoding="utf-8") as f:
-        f.write(report)
+        f.writelines(f"{line}\n" for line in iter_report_lines(results))
 
     print(f"\nReport saved to: {report_path}")
 
@@ -1,19 +1,63 @@
 """Integration tests for database operations."""
 
-from decimal import Decimal
+import asyncio
+import sqlite3
 
 import pytest
+import pytest_asyncio
+
+from src.database.connection import Database
+
+# One event loop for the module so the shared Database below can be reused:
+# its aiosqlite worker threads report back to the loop that opened them.
+pytestmark = pytest.mark.asyncio(loop_scope="module")
+
+# Tables written by the tests below; emptied between tests
+_MUTATED_TABLES = ("cached_production_orders", "cached_production_bom", "sync_history")
+
+
+@pytest_asyncio.fixture(scope="module", loop_scope="module")
+async def shared_database(tmp_path_factory):
+    """Database opened (schema, migrations, read pool) once for the module."""
+    db = Database(tmp_path_factory.mktemp("db") / "test.db")
+    await db.connect()
+    yield db
+    await db.close()
+
+
+@pytest_asyncio.fixture(loop_scope="module")
+async def test_database(shared_database):
+    """The shared Database, emptied again after each test.
+
+    Not isolated with SAVEPOINT/ROLLBACK: the methods under test commit, and
+    reads go through pool connections that never see uncommitted writes.
+    """
+    yield shared_database
+    for table in _MUTATED_TABLES:
+        await shared_database.execute_write(f"DELETE FROM {table}")
+
+
+@pytest_asyncio.fixture(loop_scope="module")
+async def make_database(tmp_path):
+    """Factory for fresh Databases; closes every one even if the test fails."""
+    created = []
+
+    def make(**kwargs):
+        db = Database(tmp_path / "test.db", **kwargs)
+        created.append(db)
+        return db
+
+    yield make
+    for db in created:
+        await db.close()
 
 
 class TestDatabaseConnection:
     """Tests for Database class connection and schema."""
 
-    @pytest.mark.asyncio
-    async def test_connect_creates_tables(self, temp_db_path):
+    async def test_connect_creates_tables(self, make_database):
         """Test connect() creates schema tables."""
-        from src.database.connection import Database
-
-        db = Database(temp_db_path)
+        db = make_database()
         await db.connect()
 
         # Check tables exist
@@ -26,33 +70,127 @@ class TestDatabaseConnection:
         assert "cached_production_bom" in table_names
         assert "sync_history" in table_names
 
-        await db.close()
-
-    @pytest.mark.asyncio
-    async def test_connect_is_idempotent(self, temp_db_path):
+    async def test_connect_is_idempotent(self, make_database):
         """Test connect() can be called multiple times."""
-        from src.database.connection import Database
-
-        db = Database(temp_db_path)
+        db = make_database()
         await db.connect()
         await db.connect()  # Should not raise
 
         rows = await db.execute_read("SELECT 1")
         assert rows[0][0] == 1
 
-        await db.close()
+    async def test_connect_applies_pragmas(self, make_database):
+        """Test connect() tunes both connections for WAL batch writes."""
+        db = make_database(mmap_size=1 << 20, cache_size=-2000)
+        await db.connect()
+
+        for conn in (db._connection, *db._read_connections):
+            async def pragma(name):
+                async with conn.execute(f"PRAGMA {name}") as cursor:
+                    return (await cursor.fetchone())[0]
+
+            assert await pragma("journal_mode") == "wal"
+            assert await pragma("synchronous") == 1  # NORMAL
+            assert await pragma("temp_store") == 2  # MEMORY
+            assert await pragma("cache_size") == -2000
+            assert await pragma("busy_timeout") == 5000
+
+    async def test_read_pool_is_read_only_and_concurrent(self, make_database):
+        """Test execute_read uses a pool of query-only connections."""
+        db = make_database(read_pool_size=3)
+        await db.connect()
+        await db.connect()  # Reconnect replaces the pool instead of growing it
+
+        assert len(db._read_connections) == 3
+        with pytest.raises(sqlite3.OperationalError):
+            await db.execute_read("DELETE FROM sync_history")
+
+        results = await asyncio.gather(
+            *(db.execute_read("SELECT ?", [i]) for i in range(10))
+        )
+        assert [rows[0][0] for rows in results] == list(range(10))
+        assert db._readers.qsize() == 3
+
+    async def test_failed_schema_script_is_rolled_back(self, make_database):
+        """Test a DDL script that fails part-way leaves no partial schema."""
+        db = make_database()
+        await db.connect()
+
+        with pytest.raises(sqlite3.OperationalError):
+            await db._executescript_in_transaction(
+                "CREATE TABLE scratch_a (x); CREATE TABLE scratch_a (x);"
+            )
+
+        rows = await db.execute_read(
+            "SELECT name FROM sqlite_master WHERE name = 'scratch_a'"
+        )
+        assert rows == []
+        assert not db._connection.in_transaction
+
+    async def test_lookups_keep_an_index_without_prefix_indexes(self, test_database):
+        """Test dropped single-column indexes are covered by wider ones."""
+        rows = await test_database.execute_read(
+            "SELECT name FROM sqlite_master WHERE type='index' AND name IN (?, ?)",
+            ["idx_bom_mo", "idx_po_mto"],
+        )
+        assert rows == []
+
+        for sql, params in (
+            ("DELETE FROM cached_production_bom WHERE mo_bill_no IN (?, ?)", ["MO1", "MO2"]),
+            ("SELECT * FROM cached_production_orders WHERE mto_number = ?", ["AK001"]),
+        ):
+            plan = await test_database.execute(f"EXPLAIN QUERY PLAN {sql}", params)
+            assert any("INDEX" in row[-1] for row in plan), plan
+
+    async def test_sync_history_latest_reads_skip_the_sort(self, test_database):
+        """Test /health and /sync/history reads walk an index instead of sorting."""
+        for sql, params in (
+            (
+                "SELECT started_at FROM sync_history "
+                "WHERE status = ? ORDER BY started_at DESC LIMIT 1",
+                ["success"],
+            ),
+            ("SELECT * FROM sync_history ORDER BY started_at DESC LIMIT ?", [10]),
+        ):
+            plan = await test_database.execute(f"EXPLAIN QUERY PLAN {sql}", params)
+            details = [row[-1] for row in plan]
+            assert any("idx_sync_history" in d for d in details), details
+            assert not any("TEMP B-TREE" in d for d in details), details
+
+    async def test_result_cache_serves_repeats_until_a_write(self, make_database):
+        """Test cached reads are reused and dropped when their table changes."""
+        db = make_database(result_cache_size=16)
+        await db.connect()
+        query = "SELECT COUNT(*) FROM sync_history WHERE status = ?"
+
+        assert (await db.execute_read(query, ["success"]))[0][0] == 0
+        assert len(db._result_cache) == 1
+        # Unrelated table: entry survives
+        await db.execute_write(
+            "INSERT INTO cached_production_orders (mto_number, bill_no) VALUES (?, ?)",
+            ["AK001", "MO001"],
+        )
+        assert len(db._result_cache) == 1
+
+        async with db.transaction():
+            await db.execute_write_no_commit(
+                "INSERT INTO sync_history (started_at, status) VALUES (?, ?)",
+                ["2025-01-15T10:00:00", "success"],
+            )
+            # Uncommitted: a read here must not be cached past the commit
+            assert (await db.execute_read(query, ["success"]))[0][0] == 0
+
+        assert (await db.execute_read(query, ["success"]))[0][0] == 1
 
 
 class TestDatabaseReadWrite:
     """Tests for Database read/write operations."""
 
-    @pytest.mark.asyncio
     async def test_execute_read(self, test_database):
         """Test read operations."""
         rows = await test_database.execute_read("SELECT 1 + 1 as result")
         assert rows[0][0] == 2
 
-    @pytest.mark.asyncio
     async def test_execute_read_with_params(self, test_database):
         """Test read with parameters."""
         rows = await test_database.execute_read(
@@ -60,7 +198,6 @@ class TestDatabaseReadWrite:
         )
         assert rows[0][0] == 15
 
-    @pytest.mark.asyncio
     async def test_execute_write(self, test_database):
         """Test write operation."""
         await test_database.execute_write(
@@ -82,7 +219,6 @@ class TestDatabaseReadWrite:
         assert rows[0][0] == "AK001"
         assert rows[0][1] == "MO001"
 
-    @pytest.mark.asyncio
     async def test_executemany(self, test_database):
         """Test batch insert."""
         data = [
@@ -106,11 +242,82 @@ class TestDatabaseReadWrite:
         )
         assert rows[0][0] == 3
 
+    async def test_executemany_rolls_back_on_error(self, test_database):
+        """Test a failing row leaves none of the batch behind."""
+        data = [
+            ("AK001", "MO001", "Workshop", "M001", "Material1", "", "", 100),
+            ("AK002", None, "Workshop", "M002", "Material2", "", "", 200),
+        ]
+
+        with pytest.raises(sqlite3.IntegrityError):
+            await test_database.executemany(
+                """
+                INSERT INTO cached_production_orders
+                (mto_number, bill_no, workshop, material_code, material_name,
+                 specification, aux_attributes, qty)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                data,
+            )
+
+        rows = await test_database.execute_read(
+            "SELECT COUNT(*) FROM cached_production_orders"
+        )
+        assert rows[0][0] == 0
+
+    async def test_concurrent_executemany_batches_all_commit(self, test_database):
+        """Test overlapping batches on the shared write connection both land."""
+        sql = """
+            INSERT INTO cached_production_orders
+            (mto_number, bill_no, workshop, material_code, material_name,
+             specification, aux_attributes, qty)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        """
+
+        def batch(prefix):
+            return [
+                (f"{prefix}{i:03d}", f"MO{prefix}{i:03d}", "Workshop", "M001", "Material", "", "", i)
+                for i in range(10)
+            ]
+
+        await asyncio.gather(
+            test_database.executemany(sql, batch("AK")),
+            test_database.executemany(sql, batch("DS")),
+        )
+
+        rows = await test_database.execute_read(
+            "SELECT COUNT(*) FROM cached_production_orders"
+        )
+        assert rows[0][0] == 20
+
+    async def test_executemany_in_transaction_rolls_back_with_it(self, test_database):
+        """Test a batch inside transaction() does not commit the outer writes."""
+        sql = """
+            INSERT INTO cached_production_orders
+            (mto_number, bill_no, workshop, material_code, material_name,
+             specification, aux_attributes, qty)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        """
+
+        with pytest.raises(RuntimeError):
+            async with test_database.transaction():
+                await test_database.execute_write_no_commit(
+                    sql, ("AK001", "MO001", "Workshop", "M001", "Material1", "", "", 100)
+                )
+                await test_database.executemany(
+                    sql, [("AK002", "MO002", "Workshop", "M002", "Material2", "", "", 200)]
+                )
+                raise RuntimeError("abort")
+
+        rows = await test_database.execute_read(
+            "SELECT COUNT(*) FROM cached_production_orders"
+        )
+        assert rows[0][0] == 0
+
 
 class TestCacheOperations:
     """Tests for cache table operations."""
 
-    @pytest.mark.asyncio
     async def test_insert_production_order(self, test_database):
         """Test inserting production order into cache."""
         await test_database.execute_write(
@@ -138,7 +345,6 @@ class TestCacheOperations:
         assert rows[0][2] == 100
         assert rows[0][3] is not None  # synced_at should be set
 
-    @pytest.mark.asyncio
     async def test_upsert_on_conflict(self, test_database):
         """Test upsert updates existing records."""
         # Insert initial
@@ -177,7 +383,6 @@ class TestCacheOperations:
         assert rows[0][0] == 200  # Updated qty
         assert rows[0][1] == "Updated Material"
 
-    @pytest.mark.asyncio
     async def test_insert_production_bom(self, test_database):
         """Test inserting BOM entry into cache."""
         await test_database.execute_write(
@@ -204,7 +409,6 @@ class TestCacheOperations:
         assert rows[0][2] == 1
         assert rows[0][3] == 50
 
-    @pytest.mark.asyncio
     async def test_delete_bom_for_bill(self, test_database):
         """Test deleting BOM entries for a bill number."""
         # Insert multiple BOM entries
@@ -241,7 +445,6 @@ class TestCacheOperations:
 class TestSyncHistory:
     """Tests for sync_history table operations."""
 
-    @pytest.mark.asyncio
     async def test_insert_sync_history(self, test_database):
         """Test inserting sync history record."""
         await test_database.execute_write(
@@ -261,7 +464,6 @@ class TestSyncHistory:
         assert rows[0][0] == "success"
         assert rows[0][1] == 1500
 
-    @pytest.mark.asyncio
     async def test_sync_history_with_error(self, test_database):
         """Test sync history with error message."""
         await test_database.execute_write(
@@ -1,13 +1,17 @@
 """Integration tests for KingdeeClient with mocked SDK."""
 
+import asyncio
+import hashlib
+import inspect
 import json
-from decimal import Decimal
+import threading
+import time
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
 from src.exceptions import KingdeeQueryError
-from src.kingdee.client import KingdeeClient
+from src.kingdee.client import KingdeeClient, _PooledK3CloudApiSdk
 from tests.fixtures.kingdee_responses import (
     AUX_PROPERTY_RESPONSE,
     EMPTY_RESPONSE,
@@ -15,7 +19,9 @@ from tests.fixtures.kingdee_responses import (
     FORM_NOT_FOUND_RESPONSE,
     MULTIPLE_RECORDS_RESPONSE,
     PAGE_1_RESPONSE,
+    PAGE_1_RESPONSE_JSON_STRING,
     PAGE_2_RESPONSE,
+    PAGE_2_RESPONSE_JSON_STRING,
     SUCCESS_RESPONSE_JSON_STRING,
     SUCCESS_RESPONSE_RAW,
 )
@@ -70,6 +76,17 @@ class TestKingdeeClientQuery:
         assert len(result) == 1
         assert result[0]["FBillNo"] == "MO0001"
 
+    @pytest.mark.asyncio
+    async def test_query_invalid_json_string_raises(self, mock_kingdee_client, mock_sdk):
+        """Test malformed JSON string raises KingdeeQueryError."""
+        mock_sdk.ExecuteBillQuery.return_value = '[["MO0001", '
+
+        with pytest.raises(KingdeeQueryError, match="invalid JSON"):
+            await mock_kingdee_client.query(
+                form_id="PRD_MO",
+                field_keys=["FBillNo"],
+            )
+
     @pytest.mark.asyncio
     async def test_query_error_response(self, mock_kingdee_client, mock_sdk):
         """Test error response raises KingdeeQueryError."""
@@ -109,6 +126,26 @@ class TestKingdeeClientQuery:
         assert result[1]["FBillNo"] == "MO0002"
         assert result[2]["FBillNo"] == "MO0003"
 
+    @pytest.mark.asyncio
+    async def test_query_maps_odd_width_rows_like_zip(self, mock_kingdee_client, mock_sdk):
+        """Test rows with a column count mismatch still map positionally."""
+        mock_sdk.ExecuteBillQuery.return_value = [
+            ["MO0001", "AK001", 100],
+            ["MO0002", "AK002"],
+            ["MO0003", "AK003", 300, "extra"],
+        ]
+
+        result = await mock_kingdee_client.query(
+            form_id="PRD_MO",
+            field_keys=["FBillNo", "FMTONo", "FQty"],
+        )
+
+        assert result == [
+            {"FBillNo": "MO0001", "FMTONo": "AK001", "FQty": 100},
+            {"FBillNo": "MO0002", "FMTONo": "AK002"},
+            {"FBillNo": "MO0003", "FMTONo": "AK003", "FQty": 300},
+        ]
+
 
 class TestKingdeeClientPagination:
     """Tests for query_all pagination."""
@@ -146,6 +183,43 @@ class TestKingdeeClientPagination:
         assert len(result) == 2500
         assert mock_sdk.ExecuteBillQuery.call_count == 2
 
+    @pytest.mark.asyncio
+    async def test_query_all_fetches_later_pages_in_waves(self, mock_kingdee_client, mock_sdk):
+        """Test page_concurrency requests pages a wave at a time, in order."""
+        pages = {0: PAGE_1_RESPONSE, 2000: PAGE_1_RESPONSE, 4000: PAGE_2_RESPONSE}
+        mock_sdk.ExecuteBillQuery.side_effect = lambda para: pages.get(para["StartRow"], [])
+
+        result = await mock_kingdee_client.query_all(
+            form_id="PRD_MO",
+            field_keys=["FBillNo", "FMTONo", "FQty"],
+            page_size=2000,
+            page_concurrency=4,
+        )
+
+        assert len(result) == 4500
+        assert result[3999]["FBillNo"] == "MO1999"
+        assert result[-1]["FBillNo"] == "MO2499"
+        # First page alone, then one wave of four (two of them past the end)
+        assert mock_sdk.ExecuteBillQuery.call_count == 5
+
+    @pytest.mark.asyncio
+    async def test_query_all_multiple_pages_json_string(self, mock_kingdee_client, mock_sdk):
+        """Test pagination when each page arrives as a pre-serialized JSON string."""
+        mock_sdk.ExecuteBillQuery.side_effect = [
+            PAGE_1_RESPONSE_JSON_STRING,
+            PAGE_2_RESPONSE_JSON_STRING,
+        ]
+
+        result = await mock_kingdee_client.query_all(
+            form_id="PRD_MO",
+            field_keys=["FBillNo", "FMTONo", "FQty"],
+            page_size=2000,
+        )
+
+        assert len(result) == 2500
+        assert result[-1]["FBillNo"] == "MO2499"
+        assert mock_sdk.ExecuteBillQuery.call_count == 2
+
     @pytest.mark.asyncio
     async def test_query_all_empty(self, mock_kingdee_client, mock_sdk):
         """Test query_all with no results."""
@@ -278,3 +352,112 @@ class TestAuxPropertyLookup:
         # Should only have one entry
         assert len(result) == 1
         assert result[1001] == "Description"
+
+    @pytest.mark.asyncio
+    async def test_lookup_aux_properties_queries_only_uncached_ids(
+        self, mock_kingdee_client, mock_sdk
+    ):
+        """Test found descriptions are cached and misses are queried again."""
+        mock_sdk.ExecuteBillQuery.return_value = [[1001, "Description", ""]]
+        await mock_kingdee_client.lookup_aux_properties([1001])
+
+        mock_sdk.ExecuteBillQuery.return_value = [[1002, "", ""]]
+        result = await mock_kingdee_client.lookup_aux_properties([1001, 1002])
+
+        assert mock_sdk.ExecuteBillQuery.call_count == 2
+        # 1001 is cached; 1002 is fetched and has no description
+        assert mock_sdk.ExecuteBillQuery.call_args[0][0]["FilterString"] == "FID IN (1002)"
+        assert result == {1001: "Description"}
+
+        await mock_kingdee_client.lookup_aux_properties([1001, 1002])
+        assert mock_sdk.ExecuteBillQuery.call_count == 3
+        assert mock_sdk.ExecuteBillQuery.call_args[0][0]["FilterString"] == "FID IN (1002)"
+
+
+class TestKingdeeClientConcurrency:
+    """Tests for the client-wide cap on in-flight queries."""
+
+    @pytest.mark.asyncio
+    async def test_query_caps_in_flight_requests(
+        self, mock_kingdee_config, mock_sdk, monkeypatch
+    ):
+        """Test concurrent query() calls never exceed MAX_CONCURRENT_REQUESTS."""
+        monkeypatch.setattr("src.kingdee.client.MAX_CONCURRENT_REQUESTS", 2)
+        client = KingdeeClient(mock_kingdee_config)
+        client._sdk = mock_sdk
+
+        in_flight = 0
+        peak = 0
+        lock = threading.Lock()
+
+        def slow_query(params):
+            nonlocal in_flight, peak
+            with lock:
+                in_flight += 1
+                peak = max(peak, in_flight)
+            time.sleep(0.02)
+            with lock:
+                in_flight -= 1
+            return []
+
+        mock_sdk.ExecuteBillQuery = slow_query
+
+        await asyncio.gather(*(client.query("PRD_MO", ["FBillNo"]) for _ in range(8)))
+
+        assert peak == 2
+
+
+class TestPooledSdk:
+    """Tests for the keep-alive K3CloudApiSdk transport."""
+
+    @staticmethod
+    def _sdk(server_url="http://test.kingdee.com/k3cloud/"):
+        sdk = _PooledK3CloudApiSdk(server_url)
+        sdk.identify = MagicMock(ServerUrl=server_url)
+        sdk.BuildHeader = MagicMock(return_value={"Content-Type": "application/json"})
+        sdk._http.post = MagicMock(
+            return_value=MagicMock(status_code=200, text="[]", cookies={}, headers={})
+        )
+        return sdk
+
+    def test_post_json_reuses_session(self):
+        """Test every call goes through the one pooled Session."""
+        sdk = self._sdk()
+
+        assert sdk.PostJson("Svc.ExecuteBillQuery", {"a": 1}) == "[]"
+        assert sdk.PostJson("Svc.ExecuteBillQuery", {"a": 2}) == "[]"
+
+        assert sdk._http.post.call_count == 2
+        kwargs = sdk._http.post.call_args.kwargs
+        assert kwargs["url"] == "http://test.kingdee.com/k3cloud/Svc.ExecuteBillQuery.common.kdsvc"
+        assert json.loads(kwargs["data"]) == {"a": 2}
+
+    def test_post_json_error_status_raises(self):
+        """Test non-2xx responses raise like the stock SDK."""
+        sdk = self._sdk()
+        sdk._http.post.return_value = MagicMock(status_code=500, text="boom")
+
+        with pytest.raises(RuntimeError, match="boom"):
+            sdk.PostJson("Svc.ExecuteBillQuery")
+
+    def test_post_json_matches_pinned_sdk(self):
+        """Test the mirrored PostJson still matches the SDK it was copied from.
+
+        On failure, re-sync _PooledK3CloudApiSdk.PostJson with the installed
+        SDK, then update the expected hash.
+        """
+        from k3cloud_webapi_sdk.core.webapi_client import WebApiClient
+
+        assert inspect.signature(_PooledK3CloudApiSdk.PostJson) == inspect.signature(
+            WebApiClient.PostJson
+        )
+        upstream = inspect.getsource(WebApiClient.PostJson).encode()
+        assert hashlib.sha256(upstream).hexdigest() == (
+            "5e8ae92e841de9454b5108b89eda4981fbf40b5a360f7f928ab83ce1f47a1352"
+        )
+
+    def test_session_cookie_jar_disabled(self):
+        """Test the Session never stores cookies (the SDK manages its own)."""
+        sdk = _PooledK3CloudApiSdk("http://test.kingdee.com/k3cloud/")
+
+        assert sdk._http.cookies._policy.is_not_allowed("test.kingdee.com")
@@ -1,9 +1,11 @@
 """Tests for agent base abstractions — models, configs, LLM client, and parsing."""
 
 import json
+from types import SimpleNamespace as NS
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
+from openai import APIConnectionError, RateLimitError
 
 from src.agents.base import (
     AgentConfig,
@@ -71,47 +73,53 @@ class TestToolDefinition:
 class TestExtractToolCallsFromContent:
     """Tests for the fallback regex tool-call parser."""
 
-    def test_extracts_single_tool_call(self):
-        content = 'I will query the database: {"name": "sql_query", "arguments": {"query": "SELECT 1"}}'
+    @pytest.mark.parametrize(
+        "content, expected",
+        [
+            pytest.param(
+                'I will query the database: {"name": "sql_query", "arguments": {"query": "SELECT 1"}}',
+                [("fallback_sql_query_0", "sql_query", {"query": "SELECT 1"})],
+                id="single",
+            ),
+            pytest.param(
+                '{"name": "tool_a", "arguments": {"x": 1}} '
+                '{"name": "tool_b", "arguments": {"y": 2}}',
+                [
+                    ("fallback_tool_a_0", "tool_a", {"x": 1}),
+                    ("fallback_tool_b_1", "tool_b", {"y": 2}),
+                ],
+                id="multiple",
+            ),
+            pytest.param(
+                '{"name": "t", "arguments": {"a": 1}} '
+                '{"name": "t", "arguments": {"b": 2}}',
+                [("fallback_t_0", "t", {"a": 1}), ("fallback_t_1", "t", {"b": 2})],
+                id="sequential-ids",
+            ),
+            pytest.param(
+                'Calling: {"name": "sql_query", "arguments": '
+                '{"query": "SELECT \'}\' AS x", "opts": {"limit": 5}}} done',
+                [
+                    (
+                        "fallback_sql_query_0",
+                        "sql_query",
+                        {"query": "SELECT '}' AS x", "opts": {"limit": 5}},
+                    )
+                ],
+                id="nested-and-braces-in-strings",
+            ),
+            pytest.param("No tool calls here, just a normal response.", [], id="no-match"),
+            pytest.param("", [], id="empty"),
+            pytest.param(
+                '{"name": "bad_tool", "arguments": {invalid json}}', [], id="invalid-json"
+            ),
+        ],
+    )
+    def test_extracts_tool_calls(self, content, expected):
         results = extract_tool_calls_from_content(content)
-        assert len(results) == 1
-        assert results[0]["name"] == "sql_query"
-        assert results[0]["id"] == "fallback_sql_query_0"
-        args = json.loads(results[0]["arguments"])
-        assert args["query"] == "SELECT 1"
-
-    def test_extracts_multiple_tool_calls(self):
-        content = (
-            '{"name": "tool_a", "arguments": {"x": 1}} '
-            '{"name": "tool_b", "arguments": {"y": 2}}'
-        )
-        results = extract_tool_calls_from_content(content)
-        assert len(results) == 2
-        assert results[0]["name"] == "tool_a"
-        assert results[1]["name"] == "tool_b"
-
-    def test_returns_empty_for_no_match(self):
-        content = "No tool calls here, just a normal response."
-        results = extract_tool_calls_from_content(content)
-        assert results == []
-
-    def test_returns_empty_for_empty_string(self):
-        results = extract_tool_calls_from_content("")
-        assert results == []
-
-    def test_skips_invalid_json_arguments(self):
-        content = '{"name": "bad_tool", "arguments": {invalid json}}'
-        results = extract_tool_calls_from_content(content)
-        assert results == []
-
-    def test_fallback_ids_are_sequential(self):
-        content = (
-            '{"name": "t", "arguments": {"a": 1}} '
-            '{"name": "t", "arguments": {"b": 2}}'
-        )
-        results = extract_tool_calls_from_content(content)
-        assert results[0]["id"] == "fallback_t_0"
-        assert results[1]["id"] == "fallback_t_1"
+        assert [
+            (r["id"], r["name"], json.loads(r["arguments"])) for r in results
+        ] == expected
 
 
 # ---------------------------------------------------------------------------
@@ -199,43 +207,46 @@ class TestToolCallResult:
 # ---------------------------------------------------------------------------
 
 
-class TestAgentLLMClient:
-    """Tests for AgentLLMClient with mocked AsyncOpenAI."""
+def _completion(content, tool_calls=None, usage=(10, 20, 30)):
+    """Plain stand-in for a ChatCompletion; only the read attributes exist."""
+    message = NS(content=content, tool_calls=tool_calls)
+    return NS(
+        choices=[NS(message=message)],
+        usage=NS(prompt_tokens=usage[0], completion_tokens=usage[1], total_tokens=usage[2]),
+    )
 
-    @pytest.fixture
-    def deepseek_config(self):
-        return AgentLLMConfig(
-            api_key="test-key",
-            base_url="https://api.test.com",
-            model="test-model",
-            max_tokens=1024,
-            temperature=0.1,
-            timeout_seconds=30,
-        )
 
-    @pytest.mark.asyncio
-    async def test_chat_with_tools_returns_content(self, deepseek_config):
-        client = AgentLLMClient(deepseek_config)
+@pytest.fixture(scope="module")
+def deepseek_config():
+    return AgentLLMConfig(
+        api_key="test-key",
+        base_url="https://api.test.com",
+        model="test-model",
+        max_tokens=1024,
+        temperature=0.1,
+        timeout_seconds=30,
+    )
 
-        mock_msg = MagicMock()
-        mock_msg.content = "Here is the answer."
-        mock_msg.tool_calls = None
 
-        mock_usage = MagicMock()
-        mock_usage.prompt_tokens = 10
-        mock_usage.completion_tokens = 20
-        mock_usage.total_tokens = 30
+@pytest.fixture(scope="module")
+def llm_client(deepseek_config):
+    # Building AsyncOpenAI (httpx pool + SSL context) dominates these
+    # tests; share one and patch its methods per test via monkeypatch.
+    return AgentLLMClient(deepseek_config)
 
-        mock_choice = MagicMock()
-        mock_choice.message = mock_msg
 
-        mock_response = MagicMock()
-        mock_response.choices = [mock_choice]
-        mock_response.usage = mock_usage
+class TestAgentLLMClient:
+    """Tests for AgentLLMClient with mocked AsyncOpenAI."""
 
-        client._client.chat.completions.create = AsyncMock(return_value=mock_response)
+    @pytest.mark.asyncio(loop_scope="module")
+    async def test_chat_with_tools_returns_content(self, llm_client, monkeypatch):
+        monkeypatch.setattr(
+            llm_client._client.chat.completions,
+            "create",
+            AsyncMock(return_value=_completion("Here is the answer.")),
+        )
 
-        result = await client.chat_with_tools(
+        result = await llm_client.chat_with_tools(
             messages=[{"role": "user", "content": "hi"}],
             tools=[],
         )
@@ -245,34 +256,19 @@ class TestAgentLLMClient:
         assert result["tool_calls"] == []
         assert result["usage"]["total_tokens"] == 30
 
-    @pytest.mark.asyncio
-    async def test_chat_with_tools_returns_tool_calls(self, deepseek_config):
-        client = AgentLLMClient(deepseek_config)
-
-        mock_tc = MagicMock()
-        mock_tc.id = "call_123"
-        mock_tc.function.name = "sql_query"
-        mock_tc.function.arguments = '{"query": "SELECT 1"}'
-
-        mock_msg = MagicMock()
-        mock_msg.content = None
-        mock_msg.tool_calls = [mock_tc]
-
-        mock_usage = MagicMock()
-        mock_usage.prompt_tokens = 50
-        mock_usage.completion_tokens = 25
-        mock_usage.total_tokens = 75
-
-        mock_choice = MagicMock()
-        mock_choice.message = mock_msg
-
-        mock_response = MagicMock()
-        mock_response.choices = [mock_choice]
-        mock_response.usage = mock_usage
-
-        client._client.chat.completions.create = AsyncMock(return_value=mock_response)
+    @pytest.mark.asyncio(loop_scope="module")
+    async def test_chat_with_tools_returns_tool_calls(self, llm_client, monkeypatch):
+        tool_call = NS(
+            id="call_123",
+            function=NS(name="sql_query", arguments='{"query": "SELECT 1"}'),
+        )
+        monkeypatch.setattr(
+            llm_client._client.chat.completions,
+            "create",
+            AsyncMock(return_value=_completion(None, [tool_call], usage=(50, 25, 75))),
+        )
 
-        result = await client.chat_with_tools(
+        result = await llm_client.chat_with_tools(
             messages=[{"role": "user", "content": "query db"}],
             tools=[{"type": "function", "function": {"name": "sql_query"}}],
         )
@@ -281,51 +277,60 @@ class TestAgentLLMClient:
         assert result["tool_calls"][0]["name"] == "sql_query"
         assert result["tool_calls"][0]["id"] == "call_123"
 
-    @pytest.mark.asyncio
-    async def test_rate_limit_raises_chat_rate_limit_error(self, deepseek_config):
-        from openai import RateLimitError
+    @pytest.mark.asyncio(loop_scope="module")
+    async def test_zero_temperature_is_sent_as_is(self, llm_client, monkeypatch):
+        # RAGProvider's keyword extraction asks for temperature=0.0
+        create = AsyncMock(return_value=_completion("ok"))
+        monkeypatch.setattr(llm_client._client.chat.completions, "create", create)
+
+        await llm_client.chat_with_tools(messages=[], tools=[], temperature=0.0)
+        assert create.call_args.kwargs["temperature"] == 0.0
 
-        client = AgentLLMClient(deepseek_config)
+        await llm_client.chat_with_tools(messages=[], tools=[])
+        assert create.call_args.kwargs["temperature"] == 0.1
 
+    @pytest.mark.asyncio(loop_scope="module")
+    async def test_rate_limit_raises_chat_rate_limit_error(self, llm_client, monkeypatch):
         mock_response = MagicMock()
         mock_response.status_code = 429
         mock_response.headers = {}
 
-        client._client.chat.completions.create = AsyncMock(
-            side_effect=RateLimitError(
-                message="Rate limit",
-                response=mock_response,
-                body=None,
-            )
+        monkeypatch.setattr(
+            llm_client._client.chat.completions,
+            "create",
+            AsyncMock(
+                side_effect=RateLimitError(
+                    message="Rate limit",
+                    response=mock_response,
+                    body=None,
+                )
+            ),
         )
 
         with pytest.raises(ChatRateLimitError):
-            await client.chat_with_tools(
+            await llm_client.chat_with_tools(
                 messages=[{"role": "user", "content": "hi"}],
                 tools=[],
             )
 
-    @pytest.mark.asyncio
-    async def test_connection_error_raises_chat_connection_error(self, deepseek_config):
-        from openai import APIConnectionError
-
-        client = AgentLLMClient(deepseek_config)
-
-        client._client.chat.completions.create = AsyncMock(
-            side_effect=APIConnectionError(request=MagicMock())
+    @pytest.mark.asyncio(loop_scope="module")
+    async def test_connection_error_raises_chat_connection_error(self, llm_client, monkeypatch):
+        monkeypatch.setattr(
+            llm_client._client.chat.completions,
+            "create",
+            AsyncMock(side_effect=APIConnectionError(request=MagicMock())),
         )
 
         with pytest.raises(ChatConnectionError):
-            await client.chat_with_tools(
+            await llm_client.chat_with_tools(
                 messages=[{"role": "user", "content": "hi"}],
                 tools=[],
             )
 
-    @pytest.mark.asyncio
-    async def test_close_calls_underlying_client(self, deepseek_config):
-        client = AgentLLMClient(deepseek_config)
-        client._client.close = AsyncMock()
+    @pytest.mark.asyncio(loop_scope="module")
+    async def test_close_calls_underlying_client(self, llm_client, monkeypatch):
+        monkeypatch.setattr(llm_client._client, "close", AsyncMock())
 
-        await client.close()
+        await llm_client.close()
 
-        client._client.close.assert_called_once()
+        llm_client._client.close.assert_called_once()
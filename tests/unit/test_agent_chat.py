@@ -1,13 +1,14 @@
 """Tests for Phase 2 agent chat — RetrievalAgent, ReasoningAgent, orchestrator."""
 
 import json
-from unittest.mock import AsyncMock, MagicMock, patch
+from functools import lru_cache
+from unittest.mock import AsyncMock, patch
 
 import pytest
+import pytest_asyncio
 
 from src.agents.base import (
     AgentConfig,
-    AgentLLMClient,
     AgentResult,
     AgentStep,
     ToolDefinition,
@@ -18,8 +19,12 @@ from src.agents.chat.reasoning_agent import ReasoningAgent
 from src.agents.chat.orchestrator import AgentChatOrchestrator
 
 
+@lru_cache(maxsize=None)
 def _make_tool(name: str) -> ToolDefinition:
-    """Create a minimal ToolDefinition for testing."""
+    """Create a minimal ToolDefinition for testing.
+
+    Cached per name: agents only read their tools, so tests can share them.
+    """
 
     async def handler(**kwargs):
         return f"{name} result"
@@ -32,10 +37,51 @@ def _make_tool(name: str) -> ToolDefinition:
     )
 
 
+class _StubLLMClient:
+    """Bare AgentLLMClient stand-in; tests assign ``chat_with_tools``."""
+
+    chat_with_tools = None
+
+    async def close(self) -> None:
+        pass
+
+
 def _make_mock_llm_client():
-    """Create a mock AgentLLMClient."""
-    client = MagicMock(spec=AgentLLMClient)
-    return client
+    """Create a stub AgentLLMClient (no MagicMock spec introspection)."""
+    return _StubLLMClient()
+
+
+def _llm_response(content: str, total_tokens: int) -> dict:
+    """chat_with_tools() payload for a final answer (no tool calls)."""
+    return {
+        "role": "assistant",
+        "content": content,
+        "tool_calls": [],
+        "usage": {"total_tokens": total_tokens},
+    }
+
+
+# Built once; the agent loop only reads responses, so tests share them.
+_PLAN_RESPONSE = _llm_response("Plan: Query cached_production_orders for MTO data.", 35)
+_ANSWER_RESPONSE = _llm_response("MTO AK2510034 has 5 child items, all 100% complete.", 50)
+
+
+def _capture_user_messages(*responses: dict):
+    """chat_with_tools() stand-in that records each user message's content.
+
+    Calls return *responses* in order, repeating the last one. Returns
+    ``(chat_with_tools, captured)``; *captured* grows on every call.
+    """
+    captured: list[str] = []
+    calls = 0
+
+    async def chat_with_tools(messages, tools, temperature):
+        nonlocal calls
+        captured.extend(m["content"] for m in messages if m["role"] == "user")
+        calls += 1
+        return responses[min(calls, len(responses)) - 1]
+
+    return chat_with_tools, captured
 
 
 # ---------------------------------------------------------------------------
@@ -87,16 +133,11 @@ class TestRetrievalAgent:
         )
         assert agent.config.max_steps == 6
 
-    @pytest.mark.asyncio
+    @pytest.mark.asyncio(loop_scope="module")
     async def test_run_produces_data_plan(self):
         """RetrievalAgent.run should return an AgentResult with a plan."""
         client = _make_mock_llm_client()
-        client.chat_with_tools = AsyncMock(return_value={
-            "role": "assistant",
-            "content": "Plan: Query cached_production_orders for MTO data.",
-            "tool_calls": [],
-            "usage": {"prompt_tokens": 20, "completion_tokens": 15, "total_tokens": 35},
-        })
+        client.chat_with_tools = AsyncMock(return_value=_PLAN_RESPONSE)
 
         agent = RetrievalAgent(
             schema_tool=_make_tool("schema_lookup"),
@@ -108,26 +149,12 @@ class TestRetrievalAgent:
         assert result.answer == "Plan: Query cached_production_orders for MTO data."
         assert result.error is None
 
-    @pytest.mark.asyncio
+    @pytest.mark.asyncio(loop_scope="module")
     async def test_run_with_mto_context(self):
         """MTO context should be prepended to the user message."""
         client = _make_mock_llm_client()
 
-        captured_user_msg = []
-
-        async def capture(messages, tools, temperature):
-            # The user message is the last one
-            for m in messages:
-                if m["role"] == "user":
-                    captured_user_msg.append(m["content"])
-            return {
-                "role": "assistant",
-                "content": "Plan with context",
-                "tool_calls": [],
-                "usage": {"total_tokens": 20},
-            }
-
-        client.chat_with_tools = capture
+        client.chat_with_tools, captured_user_msg = _capture_user_messages(_PLAN_RESPONSE)
 
         agent = RetrievalAgent(
             schema_tool=_make_tool("schema_lookup"),
@@ -191,16 +218,11 @@ class TestReasoningAgent:
         )
         assert agent.config.max_steps == 8
 
-    @pytest.mark.asyncio
+    @pytest.mark.asyncio(loop_scope="module")
     async def test_run_produces_answer(self):
         """ReasoningAgent.run should return an AgentResult with an answer."""
         client = _make_mock_llm_client()
-        client.chat_with_tools = AsyncMock(return_value={
-            "role": "assistant",
-            "content": "MTO AK2510034 has 5 child items, all 100% complete.",
-            "tool_calls": [],
-            "usage": {"prompt_tokens": 30, "completion_tokens": 20, "total_tokens": 50},
-        })
+        client.chat_with_tools = AsyncMock(return_value=_ANSWER_RESPONSE)
 
         agent = ReasoningAgent(
             sql_tool=_make_tool("sql_query"),
@@ -216,25 +238,12 @@ class TestReasoningAgent:
         assert "AK2510034" in result.answer
         assert result.error is None
 
-    @pytest.mark.asyncio
+    @pytest.mark.asyncio(loop_scope="module")
     async def test_run_includes_plan_in_user_message(self):
         """The data plan should be included in the user message."""
         client = _make_mock_llm_client()
 
-        captured_content = []
-
-        async def capture(messages, tools, temperature):
-            for m in messages:
-                if m["role"] == "user":
-                    captured_content.append(m["content"])
-            return {
-                "role": "assistant",
-                "content": "Answer",
-                "tool_calls": [],
-                "usage": {"total_tokens": 10},
-            }
-
-        client.chat_with_tools = capture
+        client.chat_with_tools, captured_content = _capture_user_messages(_ANSWER_RESPONSE)
 
         agent = ReasoningAgent(
             sql_tool=_make_tool("sql_query"),
@@ -257,58 +266,46 @@ class TestReasoningAgent:
 # ---------------------------------------------------------------------------
 
 
-class TestAgentChatOrchestrator:
-    """Tests for the orchestrator coordinating retrieval + reasoning agents."""
+@pytest_asyncio.fixture(scope="module", loop_scope="module")
+async def happy_path_run():
+    """One orchestrator run with MTO context, shared by the assertions below.
 
-    @pytest.mark.asyncio
-    async def test_run_emits_expected_events(self):
-        """Orchestrator should emit agent_step, data_plan, token, done events."""
-        client = _make_mock_llm_client()
+    Returns ``(event types, user messages sent to the LLM)``.
+    """
+    client = _make_mock_llm_client()
+    # Retrieval agent produces the plan, reasoning agent the answer
+    client.chat_with_tools, captured = _capture_user_messages(
+        _PLAN_RESPONSE, _ANSWER_RESPONSE
+    )
 
-        # Retrieval: immediate answer (plan)
-        # Reasoning: immediate answer
-        call_count = [0]
-
-        async def mock_chat(messages, tools, temperature):
-            call_count[0] += 1
-            if call_count[0] == 1:
-                # Retrieval agent produces plan
-                return {
-                    "role": "assistant",
-                    "content": "Plan: check production_orders table",
-                    "tool_calls": [],
-                    "usage": {"total_tokens": 20},
-                }
-            else:
-                # Reasoning agent produces answer
-                return {
-                    "role": "assistant",
-                    "content": "MTO has 3 items, all complete.",
-                    "tool_calls": [],
-                    "usage": {"total_tokens": 30},
-                }
-
-        client.chat_with_tools = mock_chat
+    orchestrator = AgentChatOrchestrator(
+        llm_client=client,
+        schema_tool=_make_tool("schema_lookup"),
+        config_tool=_make_tool("config_lookup"),
+        sql_tool=_make_tool("sql_query"),
+        mto_tool=_make_tool("mto_lookup"),
+    )
 
-        orchestrator = AgentChatOrchestrator(
-            llm_client=client,
-            schema_tool=_make_tool("schema_lookup"),
-            config_tool=_make_tool("config_lookup"),
-            sql_tool=_make_tool("sql_query"),
-            mto_tool=_make_tool("mto_lookup"),
-        )
+    events = []
 
-        events = []
+    async def on_event(event):
+        events.append(event)
 
-        async def on_event(event):
-            events.append(event)
+    # The MTO appears only in the context, not in the question
+    await orchestrator.run(
+        question="Status?",
+        mto_context="用户正在查看 MTO: AK2510034",
+        on_event=on_event,
+    )
+    return [e["type"] for e in events], captured
 
-        await orchestrator.run(
-            question="Status of AK2510034?",
-            on_event=on_event,
-        )
 
-        event_types = [e["type"] for e in events]
+class TestAgentChatOrchestrator:
+    """Tests for the orchestrator coordinating retrieval + reasoning agents."""
+
+    def test_run_emits_expected_events(self, happy_path_run):
+        """Orchestrator should emit agent_step, data_plan, token, done events."""
+        event_types, _ = happy_path_run
 
         # Must have agent_step, data_plan, token, done
         assert "agent_step" in event_types
@@ -318,7 +315,7 @@ class TestAgentChatOrchestrator:
         # "done" must be the last event
         assert event_types[-1] == "done"
 
-    @pytest.mark.asyncio
+    @pytest.mark.asyncio(loop_scope="module")
     async def test_run_emits_error_when_retrieval_fails(self):
         """When retrieval agent fails, an error event should be emitted."""
         client = _make_mock_llm_client()
@@ -346,16 +343,11 @@ class TestAgentChatOrchestrator:
         assert "error" in event_types
         assert "done" in event_types
 
-    @pytest.mark.asyncio
+    @pytest.mark.asyncio(loop_scope="module")
     async def test_run_without_on_event(self):
         """Orchestrator should work without an on_event callback."""
         client = _make_mock_llm_client()
-        client.chat_with_tools = AsyncMock(return_value={
-            "role": "assistant",
-            "content": "Plan and answer combined.",
-            "tool_calls": [],
-            "usage": {"total_tokens": 20},
-        })
+        client.chat_with_tools = AsyncMock(return_value=_ANSWER_RESPONSE)
 
         orchestrator = AgentChatOrchestrator(
             llm_client=client,
@@ -368,40 +360,9 @@ class TestAgentChatOrchestrator:
         # Should not raise
         await orchestrator.run(question="Test", on_event=None)
 
-    @pytest.mark.asyncio
-    async def test_mto_context_passed_to_agents(self):
+    def test_mto_context_passed_to_agents(self, happy_path_run):
         """MTO context should be passed through to both agents."""
-        client = _make_mock_llm_client()
-
-        captured_messages = []
-
-        async def capture(messages, tools, temperature):
-            for m in messages:
-                if m["role"] == "user":
-                    captured_messages.append(m["content"])
-            return {
-                "role": "assistant",
-                "content": "Result",
-                "tool_calls": [],
-                "usage": {"total_tokens": 10},
-            }
-
-        client.chat_with_tools = capture
-
-        orchestrator = AgentChatOrchestrator(
-            llm_client=client,
-            schema_tool=_make_tool("schema_lookup"),
-            config_tool=_make_tool("config_lookup"),
-            sql_tool=_make_tool("sql_query"),
-            mto_tool=_make_tool("mto_lookup"),
-        )
-
-        events = []
-        await orchestrator.run(
-            question="Status?",
-            mto_context="用户正在查看 MTO: AK2510034",
-            on_event=lambda e: events.append(e),
-        )
+        _, captured_messages = happy_path_run
 
         # At least the retrieval agent should receive MTO context
         assert any("AK2510034" in msg for msg in captured_messages)
@@ -1,18 +1,25 @@
 """Tests for AgentRunner — the core agent reasoning loop."""
 
+import asyncio
 import json
-from unittest.mock import AsyncMock, MagicMock
+from functools import lru_cache
+from unittest.mock import AsyncMock
 
 import pytest
 
-from src.agents.base import AgentConfig, AgentLLMClient, AgentResult, AgentStep
+from src.agents.base import AgentConfig, AgentResult, AgentStep
 from src.agents.runner import AgentRunner
+from src.agents.tool_coalescer import ToolCoalescer
 from src.agents.tool_registry import ToolRegistry
 from src.agents.base import ToolDefinition
 
 
+@lru_cache(maxsize=1)
 def _make_registry_with_tools():
-    """Create a registry with a simple echo tool."""
+    """Create a registry with a simple echo tool.
+
+    Cached: the runner only reads the registry, so tests share one.
+    """
     registry = ToolRegistry()
 
     async def echo_handler(message: str = "hello") -> str:
@@ -27,10 +34,35 @@ def _make_registry_with_tools():
     return registry
 
 
-def _make_mock_client():
-    """Create a mock AgentLLMClient."""
-    client = MagicMock(spec=AgentLLMClient)
-    return client
+class FakeAgentLLMClient:
+    """AgentLLMClient stand-in that replays queued chat_with_tools() responses.
+
+    Responses come back in order and the last one repeats; an exception
+    entry is raised instead. ``calls`` records the messages of each call.
+    """
+
+    def __init__(self, *responses):
+        self._responses = responses
+        self.calls = []
+
+    @property
+    def call_count(self):
+        return len(self.calls)
+
+    async def chat_with_tools(self, messages, tools, temperature=None):
+        self.calls.append(list(messages))
+        response = self._responses[min(len(self.calls), len(self._responses)) - 1]
+        if isinstance(response, BaseException):
+            raise response
+        return response
+
+    async def close(self):
+        pass
+
+
+def _make_mock_client(*responses):
+    """Create a fake AgentLLMClient replaying ``responses``."""
+    return FakeAgentLLMClient(*responses)
 
 
 # ---------------------------------------------------------------------------
@@ -44,8 +76,7 @@ class TestAgentRunnerBasicFlow:
     @pytest.mark.asyncio
     async def test_final_answer_on_first_call(self):
         """LLM returns content without tool_calls -> immediate final answer."""
-        client = _make_mock_client()
-        client.chat_with_tools = AsyncMock(return_value={
+        client = _make_mock_client({
             "role": "assistant",
             "content": "The answer is 42.",
             "tool_calls": [],
@@ -68,7 +99,6 @@ class TestAgentRunnerBasicFlow:
     @pytest.mark.asyncio
     async def test_tool_call_then_final_answer(self):
         """LLM returns tool_call, then final answer."""
-        client = _make_mock_client()
 
         # First call: LLM requests echo tool
         call_1_response = {
@@ -90,7 +120,7 @@ class TestAgentRunnerBasicFlow:
             "usage": {"prompt_tokens": 30, "completion_tokens": 15, "total_tokens": 45},
         }
 
-        client.chat_with_tools = AsyncMock(side_effect=[call_1_response, call_2_response])
+        client = _make_mock_client(call_1_response, call_2_response)
 
         runner = AgentRunner(
             client=client,
@@ -110,6 +140,99 @@ class TestAgentRunnerBasicFlow:
         assert result.total_tokens == 75
 
 
+# ---------------------------------------------------------------------------
+# Concurrent tool calls
+# ---------------------------------------------------------------------------
+
+
+class TestAgentRunnerParallelTools:
+    """Tests for running one response's tool calls concurrently."""
+
+    @staticmethod
+    def _make_probe_registry(in_flight: list):
+        """Registry with a tool recording how many calls overlap."""
+        registry = ToolRegistry()
+        active = 0
+
+        async def probe_handler(tag: str) -> str:
+            nonlocal active
+            active += 1
+            in_flight.append(active)
+            # Yield so the other calls can start before this one finishes
+            await asyncio.sleep(0)
+            await asyncio.sleep(0)
+            active -= 1
+            return f"probe: {tag}"
+
+        registry.register(ToolDefinition(
+            name="probe",
+            description="Probe tool",
+            parameters={"type": "object", "properties": {"tag": {"type": "string"}}},
+            handler=probe_handler,
+        ))
+        return registry
+
+    @staticmethod
+    def _two_calls_then_answer():
+        return [
+            {
+                "role": "assistant",
+                "content": None,
+                "tool_calls": [
+                    {"id": "call_a", "name": "probe", "arguments": '{"tag": "a"}'},
+                    {"id": "call_b", "name": "probe", "arguments": '{"tag": "b"}'},
+                ],
+                "usage": {"total_tokens": 30},
+            },
+            {
+                "role": "assistant",
+                "content": "Both done.",
+                "tool_calls": [],
+                "usage": {"total_tokens": 20},
+            },
+        ]
+
+    @pytest.mark.asyncio
+    async def test_tool_calls_in_one_response_run_concurrently(self):
+        """Both calls overlap, and steps/messages keep the call order."""
+        client = _make_mock_client(*self._two_calls_then_answer())
+        in_flight: list = []
+
+        runner = AgentRunner(
+            client=client,
+            registry=self._make_probe_registry(in_flight),
+            config=AgentConfig(max_steps=5, system_prompt="Test"),
+        )
+
+        result = await runner.run("Probe twice")
+
+        assert max(in_flight) == 2
+        assert result.answer == "Both done."
+        assert [s.tool_result for s in result.steps[:2]] == ["probe: a", "probe: b"]
+        messages = client.calls[-1]
+        assert [m["tool_call_id"] for m in messages if m["role"] == "tool"] == [
+            "call_a",
+            "call_b",
+        ]
+
+    @pytest.mark.asyncio
+    async def test_tool_concurrency_limit_bounds_overlap(self):
+        """tool_concurrency_limit=1 runs the calls one at a time."""
+        client = _make_mock_client(*self._two_calls_then_answer())
+        in_flight: list = []
+
+        runner = AgentRunner(
+            client=client,
+            registry=self._make_probe_registry(in_flight),
+            config=AgentConfig(max_steps=5, system_prompt="Test", tool_concurrency_limit=1),
+        )
+
+        result = await runner.run("Probe twice")
+
+        assert max(in_flight) == 1
+        assert [s.tool_result for s in result.steps[:2]] == ["probe: a", "probe: b"]
+
+
 # ---------------------------------------------------------------------------
 # Max steps
 # ---------------------------------------------------------------------------
@@ -121,7 +244,6 @@ class TestAgentRunnerMaxSteps:
     @pytest.mark.asyncio
     async def test_stops_at_max_steps(self):
         """Agent should stop and return error when max_steps is reached."""
-        client = _make_mock_client()
 
         # Always return a tool call (never a final answer)
         tool_call_response = {
@@ -135,7 +257,7 @@ class TestAgentRunnerMaxSteps:
             "usage": {"prompt_tokens": 10, "completion_tokens": 5, "total_tokens": 15},
         }
 
-        client.chat_with_tools = AsyncMock(return_value=tool_call_response)
+        client = _make_mock_client(tool_call_response)
 
         runner = AgentRunner(
             client=client,
@@ -149,6 +271,121 @@ class TestAgentRunnerMaxSteps:
         assert len(result.steps) == 3  # 3 tool_call steps
 
 
+# ---------------------------------------------------------------------------
+# Tool result memo
+# ---------------------------------------------------------------------------
+
+
+class TestAgentRunnerToolMemo:
+    """Tests for reusing identical tool results within one run."""
+
+    @pytest.mark.asyncio
+    async def test_repeated_tool_call_runs_handler_once(self):
+        """The same echo call in two steps runs the handler only once."""
+        echo_call = {
+            "role": "assistant",
+            "content": None,
+            "tool_calls": [{"id": "call_1", "name": "echo", "arguments": '{"message": "again"}'}],
+            "usage": {"total_tokens": 15},
+        }
+        echo_again = {
+            **echo_call,
+            "tool_calls": [{"id": "call_2", "name": "echo", "arguments": '{ "message":"again" }'}],
+        }
+        answer = {
+            "role": "assistant",
+            "content": "Done",
+            "tool_calls": [],
+            "usage": {"total_tokens": 10},
+        }
+        client = _make_mock_client(echo_call, echo_again, answer)
+
+        registry = ToolRegistry()
+        echo_handler = AsyncMock(side_effect=lambda message: f"echo: {message}")
+        registry.register(ToolDefinition(
+            name="echo",
+            description="Echo tool",
+            parameters={"type": "object", "properties": {"message": {"type": "string"}}},
+            handler=echo_handler,
+        ))
+
+        runner = AgentRunner(
+            client=client,
+            registry=registry,
+            config=AgentConfig(max_steps=5, system_prompt="Test"),
+        )
+
+        result = await runner.run("Echo twice")
+
+        assert echo_handler.call_count == 1
+        assert [s.tool_result for s in result.steps[:2]] == ["echo: again", "echo: again"]
+        messages = client.calls[-1]
+        assert [m["tool_call_id"] for m in messages if m["role"] == "tool"] == [
+            "call_1",
+            "call_2",
+        ]
+
+        # A new run starts with an empty memo
+        runner.client = _make_mock_client(echo_call, answer)
+        await runner.run("Echo once more")
+        assert echo_handler.call_count == 2
+
+
+class TestAgentRunnerToolCoalescing:
+    """Tests for sharing in-flight tool calls across concurrent runs."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_runs_share_one_tool_call(self):
+        """Ten runs requesting the same echo run the handler once."""
+        calls = 0
+
+        async def echo_handler(message: str) -> str:
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return f"echo: {message}"
+
+        coalescer = ToolCoalescer()
+        registry = ToolRegistry()
+        registry.register(coalescer.wrap_tool(ToolDefinition(
+            name="echo",
+            description="Echo tool",
+            parameters={"type": "object", "properties": {"message": {"type": "string"}}},
+            handler=echo_handler,
+        )))
+        echo_call = {
+            "role": "assistant",
+            "content": None,
+            "tool_calls": [{"id": "call_1", "name": "echo", "arguments": '{"message": "hi"}'}],
+            "usage": {"total_tokens": 15},
+        }
+        answer = {
+            "role": "assistant",
+            "content": "Done",
+            "tool_calls": [],
+            "usage": {"total_tokens": 10},
+        }
+        runners = [
+            AgentRunner(
+                client=_make_mock_client(echo_call, answer),
+                registry=registry,
+                config=AgentConfig(max_steps=5, system_prompt="Test"),
+            )
+            for _ in range(10)
+        ]
+
+        results = await asyncio.gather(*(r.run("Echo hi") for r in runners))
+
+        assert calls == 1
+        assert all(r.steps[0].tool_result == "echo: hi" for r in results)
+        assert len(coalescer) == 0
+
+        # Finished calls are not cached
+        runners[0].client = _make_mock_client(echo_call, answer)
+        await runners[0].run("Echo hi")
+        assert calls == 2
+
+
 # ---------------------------------------------------------------------------
 # Token budget
 # ---------------------------------------------------------------------------
@@ -160,7 +397,6 @@ class TestAgentRunnerTokenBudget:
     @pytest.mark.asyncio
     async def test_stops_when_budget_exhausted(self):
         """Agent should stop when token budget is exceeded."""
-        client = _make_mock_client()
 
         # Each call uses a lot of tokens
         response = {
@@ -177,7 +413,7 @@ class TestAgentRunnerTokenBudget:
         # Second call would exceed budget, but the budget is checked
         # before calling LLM. Since first call uses 10000, next check at
         # step 2 the budget (10000) is exactly at the limit (10000).
-        client.chat_with_tools = AsyncMock(return_value=response)
+        client = _make_mock_client(response)
 
         runner = AgentRunner(
             client=client,
@@ -204,7 +440,6 @@ class TestAgentRunnerFallbackParsing:
     @pytest.mark.asyncio
     async def test_extracts_tool_call_from_content(self):
         """When LLM embeds tool calls in content, runner should extract them."""
-        client = _make_mock_client()
 
         # First call: tool call embedded in content
         call_1 = {
@@ -222,7 +457,7 @@ class TestAgentRunnerFallbackParsing:
             "usage": {"prompt_tokens": 15, "completion_tokens": 10, "total_tokens": 25},
         }
 
-        client.chat_with_tools = AsyncMock(side_effect=[call_1, call_2])
+        client = _make_mock_client(call_1, call_2)
 
         runner = AgentRunner(
             client=client,
@@ -250,7 +485,6 @@ class TestAgentRunnerErrorHandling:
     @pytest.mark.asyncio
     async def test_unknown_tool_returns_error_result(self):
         """Calling a tool that doesn't exist should produce error in step."""
-        client = _make_mock_client()
 
         call_1 = {
             "role": "assistant",
@@ -270,7 +504,7 @@ class TestAgentRunnerErrorHandling:
             "usage": {"prompt_tokens": 15, "completion_tokens": 10, "total_tokens": 25},
         }
 
-        client.chat_with_tools = AsyncMock(side_effect=[call_1, call_2])
+        client = _make_mock_client(call_1, call_2)
 
         runner = AgentRunner(
             client=client,
@@ -288,7 +522,6 @@ class TestAgentRunnerErrorHandling:
     @pytest.mark.asyncio
     async def test_invalid_json_arguments_returns_error(self):
         """Tool call with invalid JSON arguments should be handled gracefully."""
-        client = _make_mock_client()
 
         call_1 = {
             "role": "assistant",
@@ -308,7 +541,7 @@ class TestAgentRunnerErrorHandling:
             "usage": {"prompt_tokens": 15, "completion_tokens": 10, "total_tokens": 25},
         }
 
-        client.chat_with_tools = AsyncMock(side_effect=[call_1, call_2])
+        client = _make_mock_client(call_1, call_2)
 
         runner = AgentRunner(
             client=client,
@@ -331,8 +564,7 @@ class TestAgentRunnerErrorHandling:
     @pytest.mark.asyncio
     async def test_llm_exception_returns_error_result(self):
         """If the LLM call throws, runner returns error result."""
-        client = _make_mock_client()
-        client.chat_with_tools = AsyncMock(side_effect=Exception("LLM down"))
+        client = _make_mock_client(Exception("LLM down"))
 
         runner = AgentRunner(
             client=client,
@@ -357,7 +589,6 @@ class TestAgentRunnerOnStep:
     @pytest.mark.asyncio
     async def test_on_step_called_for_each_step(self):
         """on_step should be invoked once per step."""
-        client = _make_mock_client()
 
         call_1 = {
             "role": "assistant",
@@ -377,7 +608,7 @@ class TestAgentRunnerOnStep:
             "usage": {"prompt_tokens": 15, "completion_tokens": 5, "total_tokens": 20},
         }
 
-        client.chat_with_tools = AsyncMock(side_effect=[call_1, call_2])
+        client = _make_mock_client(call_1, call_2)
 
         captured_steps = []
 
@@ -400,9 +631,7 @@ class TestAgentRunnerOnStep:
     @pytest.mark.asyncio
     async def test_on_step_exception_does_not_crash(self):
         """If on_step callback raises, runner should continue."""
-        client = _make_mock_client()
-
-        client.chat_with_tools = AsyncMock(return_value={
+        client = _make_mock_client({
             "role": "assistant",
             "content": "Final answer",
             "tool_calls": [],
@@ -423,6 +652,55 @@ class TestAgentRunnerOnStep:
         assert result.answer == "Final answer"
         assert result.error is None
 
+    @pytest.mark.asyncio
+    async def test_async_on_step_runs_off_the_loop(self):
+        """Async callbacks overlap the loop, stay in order, and finish before run() returns."""
+        client = _make_mock_client(
+            {
+                "role": "assistant",
+                "content": None,
+                "tool_calls": [{"id": "c1", "name": "echo", "arguments": '{"message": "hi"}'}],
+                "usage": {"total_tokens": 10},
+            },
+            {
+                "role": "assistant",
+                "content": "Done",
+                "tool_calls": [],
+                "usage": {"total_tokens": 10},
+            },
+        )
+        second_call = asyncio.Event()
+        chat_with_tools = client.chat_with_tools
+
+        async def tracking_chat(**kwargs):
+            if client.call_count == 1:
+                second_call.set()
+            return await chat_with_tools(**kwargs)
+
+        client.chat_with_tools = tracking_chat
+        delivered = []
+
+        async def callback(step):
+            if step.step_number == 1:
+                # Only completes if the loop moves on to its next LLM call
+                await asyncio.wait_for(second_call.wait(), timeout=5)
+            delivered.append(step.action)
+            if step.action == "final_answer":
+                raise RuntimeError("callback error")
+
+        runner = AgentRunner(
+            client=client,
+            registry=_make_registry_with_tools(),
+            config=AgentConfig(max_steps=5, system_prompt="Test"),
+            on_step=callback,
+        )
+
+        result = await runner.run("Echo hi")
+
+        # Step 2's callback is instant but still lands after step 1's
+        assert delivered == ["tool_call", "final_answer"]
+        assert result.answer == "Done"
+
 
 # ---------------------------------------------------------------------------
 # Context messages
@@ -435,20 +713,12 @@ class TestAgentRunnerContextMessages:
     @pytest.mark.asyncio
     async def test_context_messages_prepended(self):
         """Prior conversation context should be included in messages."""
-        client = _make_mock_client()
-
-        captured_messages = []
-
-        async def capture_chat(messages, tools, temperature):
-            captured_messages.extend(messages)
-            return {
-                "role": "assistant",
-                "content": "OK",
-                "tool_calls": [],
-                "usage": {"total_tokens": 10},
-            }
-
-        client.chat_with_tools = capture_chat
+        client = _make_mock_client({
+            "role": "assistant",
+            "content": "OK",
+            "tool_calls": [],
+            "usage": {"total_tokens": 10},
+        })
 
         runner = AgentRunner(
             client=client,
@@ -464,9 +734,54 @@ class TestAgentRunnerContextMessages:
             ],
         )
 
+        captured_messages = client.calls[0]
         assert captured_messages[0]["role"] == "system"
         assert captured_messages[1]["role"] == "user"
         assert captured_messages[1]["content"] == "Previous question"
         assert captured_messages[2]["role"] == "assistant"
         assert captured_messages[3]["role"] == "user"
         assert captured_messages[3]["content"] == "Current question"
+
+    @pytest.mark.asyncio
+    async def test_long_history_keeps_newest_messages(self):
+        """Only the last max_history_messages prior messages are sent."""
+        client = _make_mock_client({
+            "role": "assistant",
+            "content": "OK",
+            "tool_calls": [],
+            "usage": {"total_tokens": 10},
+        })
+        history = []
+        for turn in range(50):
+            history.append({"role": "user", "content": f"Question {turn}"})
+            history.append({"role": "tool", "tool_call_id": f"c{turn}", "content": "row"})
+            history.append({"role": "assistant", "content": f"Answer {turn}"})
+
+        runner = AgentRunner(
+            client=client,
+            registry=_make_registry_with_tools(),
+            config=AgentConfig(max_steps=5, system_prompt="System"),
+            max_history_messages=8,
+        )
+
+        await runner.run("Current question", context_messages=history)
+
+        captured_messages = client.calls[0]
+        # 8 newest minus the orphaned tool result at the cut
+        assert len(captured_messages) == 1 + 7 + 1
+        assert captured_messages[0]["content"] == "System"
+        assert captured_messages[1] == {"role": "assistant", "content": "Answer 47"}
+        assert captured_messages[-2] == {"role": "assistant", "content": "Answer 49"}
+        assert captured_messages[-1]["content"] == "Current question"
+
+    def test_history_limit_defaults_to_qwen_config(self, monkeypatch):
+        """Without an explicit limit the runner uses QWEN_MAX_HISTORY_MESSAGES."""
+        monkeypatch.setenv("QWEN_MAX_HISTORY_MESSAGES", "6")
+
+        runner = AgentRunner(
+            client=_make_mock_client(),
+            registry=_make_registry_with_tools(),
+            config=AgentConfig(max_steps=5, system_prompt="System"),
+        )
+
+        assert runner.max_history_messages == 6
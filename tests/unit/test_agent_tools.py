@@ -1,12 +1,16 @@
 """Tests for agent tools — sql_query, schema_lookup, mto_lookup, config_lookup."""
 
+import asyncio
 import json
+from pathlib import Path
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
 from src.agents.base import ToolDefinition
 
+CONFIG_PATH = Path(__file__).resolve().parents[2] / "config" / "mto_config.json"
+
 
 # ---------------------------------------------------------------------------
 # SQL Query Tool
@@ -61,6 +65,45 @@ class TestSqlQueryTool:
 
         assert "SQL执行失败" in result
 
+    @pytest.mark.asyncio
+    async def test_concurrent_identical_queries_share_one_read(self, sql_tool, mock_db):
+        async def slow_read(sql):
+            await asyncio.sleep(0.01)
+            return [(1, "AK2510034")], ["id", "mto_number"]
+
+        mock_db.execute_read_with_columns.side_effect = slow_read
+        queries = [
+            "SELECT id, mto_number FROM cached_production_orders LIMIT 10",
+            "SELECT id,  mto_number\n FROM cached_production_orders LIMIT 10 -- again",
+        ]
+
+        results = await asyncio.gather(
+            *(sql_tool.handler(query=queries[i % 2]) for i in range(20))
+        )
+
+        assert all("AK2510034" in r for r in results)
+        # Both spellings validate to the same SQL
+        assert mock_db.execute_read_with_columns.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_tools_sharing_a_coalescer_share_reads(self, mock_db):
+        """Per-request tools built with the app-wide coalescer share reads."""
+        from src.agents.tool_coalescer import ToolCoalescer
+        from src.agents.tools.sql_query import create_sql_query_tool
+
+        async def slow_read(sql):
+            await asyncio.sleep(0.01)
+            return [(1, "AK2510034")], ["id", "mto_number"]
+
+        mock_db.execute_read_with_columns.side_effect = slow_read
+        coalescer = ToolCoalescer()
+        tools = [create_sql_query_tool(mock_db, coalescer) for _ in range(2)]
+        query = "SELECT id, mto_number FROM cached_production_orders LIMIT 10"
+
+        await asyncio.gather(*(tool.handler(query=query) for tool in tools))
+
+        assert mock_db.execute_read_with_columns.await_count == 1
+
 
 # ---------------------------------------------------------------------------
 # Schema Lookup Tool
@@ -216,19 +259,21 @@ class TestMtoLookupTool:
 # ---------------------------------------------------------------------------
 
 
-class TestConfigLookupTool:
-    """Tests for create_config_lookup_tool."""
+# Read-only, so parsed once for the module rather than per test
+@pytest.fixture(scope="module")
+def mto_config():
+    from src.mto_config.mto_config import MTOConfig
+    return MTOConfig(CONFIG_PATH)
 
-    @pytest.fixture
-    def mto_config(self):
-        from src.mto_config.mto_config import MTOConfig
-        config_path = "/Users/kinghinchan/Documents/Cursor Projects/Quickpulsev2/Quickpulsev2/config/mto_config.json"
-        return MTOConfig(config_path)
 
-    @pytest.fixture
-    def config_tool(self, mto_config):
-        from src.agents.tools.config_lookup import create_config_lookup_tool
-        return create_config_lookup_tool(mto_config)
+@pytest.fixture(scope="module")
+def config_tool(mto_config):
+    from src.agents.tools.config_lookup import create_config_lookup_tool
+    return create_config_lookup_tool(mto_config)
+
+
+class TestConfigLookupTool:
+    """Tests for create_config_lookup_tool."""
 
     def test_tool_metadata(self, config_tool):
         assert config_tool.name == "config_lookup"
@@ -232,6 +232,31 @@ class TestQueryCacheConfig:
             QueryCacheConfig(ttl_minutes=1441)
 
 
+class TestDatabaseConfig:
+    """Tests for DatabaseConfig."""
+
+    def test_result_cache_off_by_default(self, monkeypatch):
+        """Test the read-result cache is opt-in."""
+        from src.config import DatabaseConfig
+
+        monkeypatch.delenv("DB_RESULT_CACHE_SIZE", raising=False)
+        assert DatabaseConfig().result_cache_size == 0
+
+        monkeypatch.setenv("DB_RESULT_CACHE_SIZE", "512")
+        assert DatabaseConfig().result_cache_size == 512
+
+    def test_mmap_size_bounded_by_default(self, monkeypatch):
+        """Test mmap_size defaults to 256 MiB and is overridable."""
+        from src.config import DatabaseConfig
+        from src.database.connection import DEFAULT_MMAP_SIZE
+
+        monkeypatch.delenv("DB_MMAP_SIZE", raising=False)
+        assert DatabaseConfig().mmap_size == DEFAULT_MMAP_SIZE == 256 * 1024 * 1024
+
+        monkeypatch.setenv("DB_MMAP_SIZE", "0")
+        assert DatabaseConfig().mmap_size == 0
+
+
 class TestSyncConfig:
     """Tests for SyncConfig load/save."""
 
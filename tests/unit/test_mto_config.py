@@ -9,12 +9,13 @@ Locks three audit fixes (2026-06-10 data-path family):
    (sister-plant/bought-in receipts, Wave 6B).
 """
 
+import shutil
 from decimal import Decimal
 
 import pytest
 
 from src.models.mto_status import ChildItem
-from src.mto_config.mto_config import MTOConfig, SemanticConfig
+from src.mto_config.mto_config import MTOConfig, SemanticConfig, load_mto_config
 
 CONFIG_PATH = "config/mto_config.json"
 
@@ -219,3 +220,17 @@ class TestSemanticFieldValidation:
 
         with pytest.raises(ValueError, match="nonexistent_field"):
             MTOConfig(str(bad_path)).build_metric_engine()
+
+
+class TestLoadMtoConfig:
+    """load_mto_config parses each path once per process."""
+
+    def test_same_path_shares_one_instance(self, tmp_path):
+        path = tmp_path / "mto_config.json"
+        shutil.copyfile(CONFIG_PATH, path)
+
+        first = load_mto_config(str(path))
+        path.unlink()  # a second parse would raise FileNotFoundError
+
+        assert load_mto_config(str(path)) is first
+        assert first.material_classes
@@ -9,9 +9,21 @@ from src.query.cache_reader import BOMJoinedRow
 from src.query.mto_handler import (
     MaterialType,
     MTOQueryHandler,
+    _sum_by_code,
     _sum_by_material,
     _sum_by_material_and_aux,
 )
+from src.readers import (
+    MaterialPickingReader,
+    ProductionBOMReader,
+    ProductionOrderReader,
+    ProductionReceiptReader,
+    PurchaseOrderReader,
+    PurchaseReceiptReader,
+    SalesDeliveryReader,
+    SalesOrderReader,
+    SubcontractingOrderReader,
+)
 from src.readers.models import (
     MaterialPickingModel,
     ProductionBOMModel,
@@ -112,6 +124,33 @@ class TestSumByMaterialAndAux:
         assert result[("M001", 0)] == Decimal("15")
 
 
+class TestSumByCode:
+    """Tests for _sum_by_code rollup and its use in the Tier 3 receipt lookup."""
+
+    def test_sum_by_code_rolls_up_aux_variants(self):
+        """Test (code, aux) totals collapse to one total per code."""
+        by_aux = {
+            ("07.01", 1): Decimal("30"),
+            ("07.01", 2): Decimal("5"),
+            ("07.02", 0): Decimal("15"),
+        }
+
+        result = _sum_by_code(by_aux)
+
+        assert result == {"07.01": Decimal("35"), "07.02": Decimal("15")}
+
+    def test_tier3_rollup_matches_scan(self):
+        """Test precomputed rollup gives the same Tier 3 value as the scan."""
+        by_aux = {("07.01", 1): Decimal("30"), ("07.01", 2): Decimal("5")}
+
+        scanned = MTOQueryHandler._lookup_finished_receipt(by_aux, "07.01", 9)
+        looked_up = MTOQueryHandler._lookup_finished_receipt(
+            by_aux, "07.01", 9, rollup_by_code=_sum_by_code(by_aux)
+        )
+
+        assert scanned == looked_up == Decimal("35")
+
+
 class TestMTOQueryHandler:
     """Tests for MTOQueryHandler.get_status method with config-driven logic."""
 
@@ -2210,20 +2249,24 @@ class TestAggregatedSalesChildCloseStatus:
 # Test fixtures
 @pytest.fixture
 def mock_readers():
-    """Create mock reader instances."""
+    """Create mock reader instances.
+
+    spec= pins each mock to its reader class, so a misspelled reader method in
+    the handler (or a test) fails loudly instead of returning a MagicMock.
+    """
     readers = {}
-    for name in [
-        "production_order",
-        "production_bom",
-        "production_receipt",
-        "purchase_order",
-        "purchase_receipt",
-        "subcontracting_order",
-        "material_picking",
-        "sales_delivery",
-        "sales_order",
+    for name, reader_cls in [
+        ("production_order", ProductionOrderReader),
+        ("production_bom", ProductionBOMReader),
+        ("production_receipt", ProductionReceiptReader),
+        ("purchase_order", PurchaseOrderReader),
+        ("purchase_receipt", PurchaseReceiptReader),
+        ("subcontracting_order", SubcontractingOrderReader),
+        ("material_picking", MaterialPickingReader),
+        ("sales_delivery", SalesDeliveryReader),
+        ("sales_order", SalesOrderReader),
     ]:
-        mock = MagicMock()
+        mock = MagicMock(spec=reader_cls)
         mock.client = MagicMock()
         mock.client.lookup_aux_properties = AsyncMock(return_value={})
         # _fetch_live also looks up BD_MATERIAL categories for synthetic-row routing
@@ -0,0 +1,88 @@
+"""Tests for src/database/result_cache.py - execute_read result caching."""
+
+import pytest
+
+from src.database.result_cache import QueryResultCache, is_select, write_target
+
+
+class TestWriteTarget:
+    @pytest.mark.parametrize(
+        "sql, table",
+        [
+            ("INSERT INTO sync_history (status) VALUES (?)", "sync_history"),
+            ("\n  INSERT OR REPLACE INTO cached_sales_orders VALUES (?)", "cached_sales_orders"),
+            ("REPLACE INTO access_logs VALUES (?)", "access_logs"),
+            ("UPDATE knowledge_entries SET title = ?", "knowledge_entries"),
+            ("delete from Cached_Production_BOM where mo_bill_no = ?", "cached_production_bom"),
+            ("CREATE TABLE foo (id INTEGER)", None),
+            ("WITH x AS (SELECT 1) DELETE FROM foo", None),
+        ],
+    )
+    def test_parses_target_table(self, sql, table):
+        assert write_target(sql) == table
+
+    def test_is_select(self):
+        assert is_select("  select 1")
+        assert not is_select("PRAGMA optimize")
+
+
+class TestQueryResultCache:
+    def test_key_skips_uncacheable_queries(self):
+        assert QueryResultCache.key("SELECT datetime('now')") is None
+        assert QueryResultCache.key("SELECT last_insert_rowid()") is None
+        assert QueryResultCache.key("SELECT * FROM a, b") is None
+        assert QueryResultCache.key("SELECT * FROM a JOIN b, c") is None
+        assert QueryResultCache.key("SELECT * FROM (SELECT * FROM a) t, b") is None
+        assert QueryResultCache.key("DELETE FROM a") is None
+        assert QueryResultCache.key("SELECT ?", [[1]]) is None  # unhashable
+        assert QueryResultCache.key("SELECT :x", {"x": 1}) == ("SELECT :x", (("x", 1),))
+
+    def test_write_drops_only_reads_of_that_table(self):
+        cache = QueryResultCache(maxsize=8)
+        orders = cache.key("SELECT * FROM cached_production_orders WHERE mto_number = ?", ["AK1"])
+        joined = cache.key(
+            "SELECT * FROM knowledge_entries e JOIN knowledge_fts f ON e.id = f.rowid"
+        )
+        cache.put(orders, [("AK1",)], cache.generation)
+        cache.put(joined, [(1,)], cache.generation)
+
+        cache.invalidate("knowledge_entries")
+
+        assert cache.get(orders) == [("AK1",)]
+        assert cache.get(joined) is None
+
+    def test_unknown_write_clears_everything(self):
+        cache = QueryResultCache(maxsize=8)
+        key = cache.key("SELECT 1 FROM sync_history")
+        cache.put(key, [(1,)], cache.generation)
+
+        cache.invalidate(None)
+
+        assert len(cache) == 0
+
+    def test_read_spanning_a_write_is_not_stored(self):
+        cache = QueryResultCache(maxsize=8)
+        key = cache.key("SELECT * FROM sync_history")
+        generation = cache.generation
+
+        cache.invalidate("access_logs")  # any write while the read ran
+        cache.put(key, [(1,)], generation)
+
+        assert cache.get(key) is None
+
+    def test_large_results_are_not_stored(self):
+        cache = QueryResultCache(maxsize=8, max_rows=2)
+        key = cache.key("SELECT * FROM sync_history")
+
+        cache.put(key, [(1,), (2,), (3,)], cache.generation)
+
+        assert cache.get(key) is None
+
+    def test_get_returns_a_copy(self):
+        cache = QueryResultCache(maxsize=8)
+        key = cache.key("SELECT * FROM sync_history")
+        cache.put(key, [(1,)], cache.generation)
+
+        cache.get(key).append((2,))
+
+        assert cache.get(key) == [(1,)]
@@ -96,6 +96,15 @@ class TestModelToJson:
         # Decimal should be serialized (as number or string depending on mode)
         assert "qty" in data
 
+    def test_model_to_json_is_compact_utf8(self, sample_production_order):
+        """Test raw_data JSON has no padding and keeps Chinese text unescaped."""
+        model = sample_production_order.model_copy(update={"workshop": "车间A"})
+
+        result = model_to_json(model)
+
+        assert ", " not in result and '": ' not in result
+        assert '"workshop":"车间A"' in result
+
 
 class TestSyncResult:
     """Tests for SyncResult dataclass."""
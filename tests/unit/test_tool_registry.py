@@ -126,6 +126,19 @@ class TestToolRegistryToOpenaiTools:
         registry = ToolRegistry()
         assert registry.to_openai_tools() == []
 
+    def test_list_is_reused_until_next_register(self):
+        registry = ToolRegistry()
+        registry.register(_make_tool("alpha"))
+        tools = registry.to_openai_tools()
+
+        assert registry.to_openai_tools() is tools
+
+        registry.register(_make_tool("beta"))
+        assert [t["function"]["name"] for t in registry.to_openai_tools()] == [
+            "alpha",
+            "beta",
+        ]
+
 
 class TestToolRegistryToolNames:
     """Tests for tool_names property."""